@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+演示基准测试套件
+对每个演示分阶段计时: 电路构建 (build)、转译 (transpile)、模拟 (simulate)、结果解析 (parse)、
+stabilizer 采样 (sample)、NumPy 快速路径 (fast_path)、直方图 / 电路图绘制 (figure_*)、完整演示流程 (flow，缓存全部清空) 与重复点击 (flow_repeat)；
+转译 / 模拟阶段使用模拟规划器为该电路选择的方法 (与应用一致)，方法名随结果一并记录。
+在演示允许的范围内扫描量子比特数和 shots，另测 main.py 的冷启动导入耗时。
+结果写入 JSON，可与保存的基线比较以发现性能回退。
+
+用法:
+    python benchmarks/bench_demos.py --output bench.json
+    python benchmarks/bench_demos.py --quick --demos grover qft
+    python benchmarks/bench_demos.py --output new.json --baseline bench.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+from startup_time import measure_import_times
+
+# Circuits larger than this are not drawn (the GUI skips them as well)
+MAX_DRAWN_QUBITS = 6
+
+
+def _bell_circuit(games, qubits):
+    from qiskit import QuantumCircuit
+    qc = QuantumCircuit(2, 2)
+    qc.h(0)
+    qc.cx(0, 1)
+    qc.measure([0, 1], [0, 1])
+    return qc
+
+
+def _ghz_circuit(games, qubits):
+    return games.create_ghz_circuit(qubits)
+
+
+def _superposition_circuit(games, qubits):
+    from qiskit import QuantumCircuit
+    qc = QuantumCircuit(qubits, qubits)
+    qc.h(range(qubits))
+    qc.measure(range(qubits), range(qubits))
+    return qc
+
+
+def _dj_circuit(games, qubits):
+    from quantum_logic import deutsch_jozsa
+    return deutsch_jozsa.build_dj_circuit(qubits, deutsch_jozsa.balanced_oracle(qubits, 2 ** qubits - 1))
+
+
+def _grover_circuit(games, qubits):
+    from quantum_logic import grover
+    return grover.build_grover_circuit(qubits, [0], grover.optimal_iterations(2 ** qubits, 1))
+
+
+def _qft_circuit(games, qubits):
+    from quantum_logic import qft
+    return qft.build_qft_demo_circuit(qubits, 1)
+
+
+# demo -> builder, what to sweep, result kind, run_* flow, its {sweep value: parameter} map
+# and any fixed extra arguments
+DEMOS = {
+    'coin': {'build': lambda games, qubits: games.create_coin_circuit(), 'sweep': 'shots',
+             'flow': 'run_coin_game', 'flow_args': {'shots': 'shots'}},
+    'entanglement': {'build': _bell_circuit, 'sweep': 'shots',
+                     'flow': 'run_entanglement_game', 'flow_args': {'shots': 'shots'}},
+    'ghz': {'build': _ghz_circuit, 'sweep': 'qubits', 'flow': 'run_entanglement_game',
+            'flow_args': {'qubits': 'num_qubits', 'shots': 'shots'}},
+    'interference': {'build': lambda games, qubits: games.create_interference_circuit('standard', draw_only=True),
+                     'sweep': 'shots', 'flow': 'run_interference_game', 'flow_args': {'shots': 'shots'}},
+    'teleportation': {'build': lambda games, qubits: games.quantum_teleportation_demo(draw_only=True),
+                      'sweep': 'shots', 'flow': 'run_teleportation_game', 'flow_args': {'shots': 'shots'}},
+    'superposition': {'build': _superposition_circuit, 'sweep': 'qubits', 'flow': 'run_superposition_demo',
+                      'flow_args': {'qubits': 'num_qubits', 'shots': 'shots'}},
+    'deutsch_jozsa': {'build': _dj_circuit, 'sweep': 'qubits', 'flow': 'run_deutsch_jozsa_demo',
+                      'flow_args': {'qubits': 'n', 'shots': 'shots'}},
+    'grover': {'build': _grover_circuit, 'sweep': 'qubits', 'max_qubits': 8, 'flow': 'run_grover_search_demo',
+               'flow_args': {'qubits': 'n', 'shots': 'shots'}},
+    'qft': {'build': _qft_circuit, 'sweep': 'qubits', 'kind': 'statevector', 'flow': 'run_qft_demo',
+            'flow_args': {'qubits': 'n'}, 'flow_kwargs': {'input_state': 1}},
+}
+
+
+def best_time_ms(func, repeat):
+    """Fastest of ``repeat`` calls in ms, and the value returned by the last call."""
+    best = float('inf')
+    value = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        value = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, value
+
+
+def time_stages(games, demo, qubits, shots, repeat):
+    """Planner method and per-stage timings (ms) for one demo configuration.
+
+    The transpile / simulate stages follow games.plan_simulation, like the app: NumPy fast
+    path, aer_simulator_stabilizer (one shot plus NumPy sampling for terminal measurements),
+    or Aer statevector / matrix_product_state.
+    """
+    from qiskit import transpile
+    from quantum_logic import fast_sim, stabilizer
+    from quantum_logic.caching import RenderCache
+    from quantum_logic.cli import HeadlessSession
+    from ui.rendering import rasterize_figure
+
+    spec = DEMOS[demo]
+    stages = {}
+    stages['build'], qc = best_time_ms(lambda: spec['build'](games, qubits), repeat)
+
+    seed = games.sampling_seed
+    if spec.get('kind') == 'statevector':
+        method = games.plan_simulation(qc, return_statevector=True).method
+        if method == 'numpy':
+            stages['fast_path'], _ = best_time_ms(lambda: fast_sim.simulate_statevector(qc), repeat)
+        else:
+            backend = games.statevector_sim
+            stages['transpile'], compiled = best_time_ms(lambda: transpile(qc, backend, optimization_level=1), repeat)
+            stages['simulate'], result = best_time_ms(lambda: backend.run(compiled, seed_simulator=seed).result(), repeat)
+            stages['parse'], _ = best_time_ms(lambda: result.get_statevector(0), repeat)
+    else:
+        method = games.plan_simulation(qc, shots).method
+        if method == 'numpy':
+            stages['fast_path'], counts = best_time_ms(lambda: fast_sim.run_counts(qc, shots, seed), repeat)
+        else:
+            # The backend run_batch uses for the planned method
+            backend = games._method_backend(method, games.simulator)
+            sampled = method == 'stabilizer' and fast_sim.has_only_terminal_measurements(qc)
+            if fast_sim.has_control_flow(qc):
+                compiled = qc  # the qasm_simulator target cannot transpile if_else
+            else:
+                stages['transpile'], compiled = best_time_ms(lambda: transpile(qc, backend), repeat)
+            stages['simulate'], result = best_time_ms(
+                lambda: backend.run(compiled, shots=1 if sampled else shots, seed_simulator=seed).result(), repeat)
+            stages['parse'], counts = best_time_ms(lambda: result.get_counts(0), repeat)
+            if sampled:
+                reference = next(iter(counts))
+                stages['sample'], counts = best_time_ms(
+                    lambda: stabilizer.sample_counts(qc, reference, shots, seed), repeat)
+        stages['figure_histogram'], _ = best_time_ms(lambda: rasterize_figure(games._plot_counts(counts)), repeat)
+
+    if qc.num_qubits <= MAX_DRAWN_QUBITS:
+        stages['figure_circuit'], _ = best_time_ms(lambda: RenderCache.render(qc), repeat)
+
+    # The whole click, with cold transpile, template, result and render caches
+    session = HeadlessSession(echo=False)
+    games.gui_output = session.write
+    games.gui_display_plots = session.display_plots
+    games.end_game = session.end_game
+    values = {'qubits': qubits, 'shots': shots}
+    kwargs = {parameter: values[option] for option, parameter in spec['flow_args'].items()}
+    kwargs.update(spec.get('flow_kwargs', {}))
+
+    def run_flow():
+        games.transpile_cache.clear()
+        games.templates.clear()
+        games.result_memo.clear()
+        games.render_cache.clear()
+        getattr(games, spec['flow'])(**kwargs)
+
+    stages['flow'], _ = best_time_ms(run_flow, repeat)
+    # The same click again: seeded results come from the memo
+    stages['flow_repeat'], _ = best_time_ms(lambda: getattr(games, spec['flow'])(**kwargs), repeat)
+    return method, stages
+
+
+def run_suite(demos, qubit_sweep, shot_sweep, repeat, progress=print):
+    from quantum_logic.caching import RenderCache
+    from quantum_logic.games import QuantumGames
+
+    games = QuantumGames()
+    # Never read or write the user's on-disk diagram cache while benchmarking
+    games.render_cache = RenderCache(persist=False)
+    games.warm_up()
+    results = []
+    for demo in demos:
+        spec = DEMOS[demo]
+        if spec['sweep'] == 'qubits':
+            configs = [(qubits, 1024) for qubits in qubit_sweep if qubits <= spec.get('max_qubits', qubit_sweep[-1])]
+        else:
+            configs = [(None, shots) for shots in shot_sweep]
+        for qubits, shots in configs:
+            method, stages = time_stages(games, demo, qubits or 1, shots, repeat)
+            results.append({'demo': demo, 'qubits': qubits, 'shots': shots, 'method': method, 'stages_ms': stages})
+            progress(f"{demo:<14} qubits={str(qubits):<4} shots={shots:<6} method={method:<12} "
+                     + ' '.join(f"{stage}={value:.1f}" for stage, value in stages.items()))
+    return results
+
+
+def metadata(repeat):
+    import numpy
+    import qiskit
+    import qiskit_aer
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'qiskit': qiskit.__version__,
+        'qiskit_aer': qiskit_aer.__version__,
+        'numpy': numpy.__version__,
+        'repeat': repeat,
+    }
+
+
+def flatten(report):
+    """{'demo|qubits|shots|method|stage': ms} for comparing two reports.
+
+    The planner method is part of the key: stages of a configuration that switched method
+    are reported as not measured rather than compared across engines.
+    """
+    flat = {f"cold_import|{module}": value for module, value in report.get('cold_import_ms', {}).items()}
+    for entry in report['results']:
+        for stage, value in entry['stages_ms'].items():
+            flat[f"{entry['demo']}|q={entry['qubits']}|shots={entry['shots']}|{entry.get('method')}|{stage}"] = value
+    return flat
+
+
+def compare(current, baseline, tolerance, min_delta_ms):
+    """Print regressions / improvements against ``baseline``; return the number of regressions."""
+    current_flat, baseline_flat = flatten(current), flatten(baseline)
+    regressions = 0
+    print(f"\n与基线比较 (容差 {tolerance:.0%}, 最小差值 {min_delta_ms} ms):")
+    for key in sorted(current_flat.keys() & baseline_flat.keys()):
+        new, old = current_flat[key], baseline_flat[key]
+        delta = new - old
+        if abs(delta) < min_delta_ms or abs(delta) <= tolerance * old:
+            continue
+        regressed = delta > 0
+        regressions += regressed
+        print(f"  {'回退' if regressed else '改进'} {key:<55} {old:>9.1f} -> {new:>9.1f} ms ({new / old if old else float('inf'):.2f}x)")
+    missing = sorted(baseline_flat.keys() - current_flat.keys())
+    if missing:
+        print(f"  基线中有 {len(missing)} 项本次未测量")
+    print(f"共 {regressions} 项性能回退。")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="分阶段测量各演示的耗时，并与基线比较")
+    parser.add_argument('--demos', nargs='+', choices=sorted(DEMOS), default=list(DEMOS))
+    parser.add_argument('--qubits', type=int, nargs='+', default=[2, 4, 8, 12], help="量子比特数扫描")
+    parser.add_argument('--shots', type=int, nargs='+', default=[100, 1024, 10000], help="shots 扫描")
+    parser.add_argument('--repeat', type=int, default=3, help="每个阶段重复次数，取最快的一次")
+    parser.add_argument('--quick', action='store_true', help="小规模扫描 (qubits 2 4, shots 1024, 重复 1 次)")
+    parser.add_argument('--output', help="结果 JSON 文件")
+    parser.add_argument('--baseline', help="用于比较的基线 JSON 文件")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="允许的相对变慢比例")
+    parser.add_argument('--min-delta-ms', type=float, default=2.0, help="忽略小于该值的绝对差异")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.qubits, args.shots, args.repeat = [2, 4], [1024], 1
+
+    cold_import_ms = {}
+    for module in ('main', 'quantum_logic.games'):
+        cold_import_ms[module] = measure_import_times(module)[module][1] / 1000.0
+        print(f"冷启动导入 {module}: {cold_import_ms[module]:.1f} ms")
+
+    report = {
+        'meta': metadata(args.repeat),
+        'cold_import_ms': cold_import_ms,
+        'results': run_suite(args.demos, sorted(args.qubits), args.shots, args.repeat),
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入 {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        return 1 if compare(report, baseline, args.tolerance, args.min_delta_ms) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+启动时间检查
+用 `python -X importtime` 导入 GUI 入口模块，按模块报告导入耗时，
+并检查总耗时是否在预算之内、是否误导入了重量级依赖。
+
+用法:
+    python benchmarks/startup_time.py [--budget-ms 150] [--top 15] [--repeat 3]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# These must only be imported by the background warm-up thread, never at startup
+HEAVY_MODULES = ('qiskit', 'qiskit_aer', 'matplotlib', 'numpy', 'scipy')
+
+
+def measure_import_times(module='main'):
+    """Import ``module`` in a fresh interpreter; return {module_name: (self_us, cumulative_us)}."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{proc.stderr}")
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="报告 GUI 启动时的模块导入耗时")
+    parser.add_argument('--module', default='main', help="要导入的入口模块 (默认: main)")
+    parser.add_argument('--budget-ms', type=float, default=150.0, help="入口模块累计导入耗时上限 (毫秒)")
+    parser.add_argument('--top', type=int, default=15, help="显示累计耗时最高的模块数")
+    parser.add_argument('--repeat', type=int, default=3, help="重复次数，取最快的一次")
+    args = parser.parse_args(argv)
+
+    runs = [measure_import_times(args.module) for _ in range(max(1, args.repeat))]
+    best = min(runs, key=lambda times: times[args.module][1])
+    total_ms = best[args.module][1] / 1000.0
+
+    print(f"{'模块':<45} {'自身 (ms)':>10} {'累计 (ms)':>10}")
+    ranked = sorted(best.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_us, cumulative_us) in ranked[:args.top]:
+        print(f"{name:<45} {self_us / 1000.0:>10.1f} {cumulative_us / 1000.0:>10.1f}")
+
+    heavy = sorted(name for name in best if name.split('.')[0] in HEAVY_MODULES)
+    print(f"\n{args.module} 累计导入耗时: {total_ms:.1f} ms (预算 {args.budget_ms:.0f} ms)")
+    ok = total_ms <= args.budget_ms
+    if heavy:
+        print(f"启动时导入了重量级模块 (应延迟到后台预热): {', '.join(heavy[:10])}")
+        ok = False
+    print("结果: 通过" if ok else "结果: 未通过")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
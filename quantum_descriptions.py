@@ -13,6 +13,18 @@ QUANTUM_GAME_DESCRIPTIONS = {
         "circuit": "第一个比特H门产生叠加，CNOT门与第二个比特纠缠。",
         "histogram": "只会出现“00”或“11”，概率各50%，体现纠缠特性。"
     },
+    "ghz": {
+        "title": "GHZ 态演示（1000 量子比特）",
+        "principle": "GHZ 态 (|0...0⟩+|1...1⟩)/√2 把所有比特纠缠在一起。它只用 Clifford 门，可用稳定子方法以多项式代价模拟，上千个比特也能在秒级完成，而状态向量方法需要 2^N 个幅度。",
+        "circuit": "第一个比特H门产生叠加，再用一串CNOT门依次纠缠后续比特。",
+        "histogram": "只会出现全0或全1，概率各50%；输出中同时给出稳定子方法与状态向量方法的耗时对比。"
+    },
+    "phase_sweep": {
+        "title": "干涉条纹：相位扫描",
+        "principle": "Mach-Zehnder 干涉仪：两条路径的相位差 φ 决定测量结果，P(1) = sin²(φ/2)，连续改变 φ 得到干涉条纹。",
+        "circuit": "H门分束，相位门P(φ)引入相位差，H门合束后测量；φ 是参数，电路只构建和转译一次，所有取值一次提交模拟。",
+        "histogram": "横轴为 φ，纵轴为测得 1 的概率；模拟点沿 sin²(φ/2) 曲线分布，偏差来自有限 shots 的统计涨落。"
+    },
     "teleportation": {
         "title": "量子隐形传态演示",
         "principle": "通过纠缠和经典通信，将一个未知量子态“传送”到远处，体现量子信息的独特传递方式。",
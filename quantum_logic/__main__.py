@@ -0,0 +1,10 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""python -m quantum_logic: 无界面命令行入口 (见 quantum_logic.cli)"""
+
+import sys
+
+from quantum_logic.cli import main
+
+sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+状态向量幅度摘要
+用 NumPy 向量化地选出模最大的 k 个幅度、合并近似相等的幅度，并按页格式化，
+只有可见的那一页才会逐项转成字符串。
+"""
+
+import numpy as np
+
+from quantum_logic.bitstrings import ints_to_bitstrings
+
+
+def as_array(statevector):
+    """Complex NumPy view of a Statevector or array-like."""
+    return np.asarray(getattr(statevector, 'data', statevector), dtype=complex).ravel()
+
+
+def display_decimals(statevector, minimum=3):
+    """Decimal places that keep the largest amplitude readable (more for very large n)."""
+    largest = float(np.max(np.abs(as_array(statevector)), initial=0.0))
+    if largest == 0:
+        return minimum
+    return max(minimum, 2 - int(np.floor(np.log10(largest))))
+
+
+def format_amplitude(amplitude, decimals=3):
+    """Compact text for one amplitude, dropping a real or imaginary part that rounds to zero."""
+    real = round(float(amplitude.real), decimals) + 0.0
+    imag = round(float(amplitude.imag), decimals) + 0.0
+    if imag == 0:
+        return f"{real:.{decimals}f}"
+    if real == 0:
+        return f"{imag:.{decimals}f}j"
+    return f"{real:.{decimals}f}{imag:+.{decimals}f}j"
+
+
+def top_k(statevector, k):
+    """Indices and amplitudes of the ``k`` largest |amplitude|, largest first (argpartition).
+
+    Ties at the k-th magnitude are broken by basis-state index, so a uniform
+    superposition lists |0...0>, |0...1>, ... rather than an arbitrary subset.
+    """
+    data = as_array(statevector)
+    k = min(k, data.size)
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=complex)
+    magnitudes = np.abs(data)
+    threshold = magnitudes[np.argpartition(magnitudes, data.size - k)[data.size - k]]
+    above = np.flatnonzero(magnitudes > threshold)
+    ties = np.flatnonzero(magnitudes == threshold)[:k - above.size]
+    candidates = np.concatenate([above, ties])
+    order = candidates[np.lexsort((candidates, -magnitudes[candidates]))]
+    return order, data[order]
+
+
+def group_amplitudes(statevector, decimals=None, cutoff=None):
+    """Group amplitudes that agree to ``decimals`` places.
+
+    Returns ``[(amplitude, count, first_index), ...]`` sorted by |amplitude| (largest
+    first). Amplitudes with magnitude below ``cutoff`` (default: half the last
+    decimal) are left out, so a uniform superposition collapses to a single group.
+    """
+    data = as_array(statevector)
+    if decimals is None:
+        decimals = display_decimals(data)
+    if cutoff is None:
+        cutoff = 0.5 * 10.0 ** -decimals
+    kept = np.flatnonzero(np.abs(data) >= cutoff)
+    rounded = np.round(data[kept], decimals) + 0.0  # + 0.0 folds -0.0 into 0.0
+    unique_values, first, counts = np.unique(rounded, return_index=True, return_counts=True)
+    groups = [(complex(value), int(count), int(kept[index]))
+              for value, count, index in zip(unique_values, counts, first)]
+    groups.sort(key=lambda group: (-abs(group[0]), group[2]))
+    return groups
+
+
+def page(statevector, page_number=0, page_size=16, decimals=None):
+    """Formatted ``(bitstring, amplitude_text)`` rows for one page of the full vector."""
+    data = as_array(statevector)
+    if decimals is None:
+        decimals = display_decimals(data)
+    num_qubits = int(data.size).bit_length() - 1
+    start = page_number * page_size
+    stop = min(start + page_size, data.size)
+    if start >= data.size or start < 0:
+        return []
+    labels = ints_to_bitstrings(np.arange(start, stop), num_qubits)
+    return [(label, format_amplitude(amplitude, decimals)) for label, amplitude in zip(labels, data[start:stop])]
+
+
+def num_pages(statevector, page_size=16):
+    return -(-as_array(statevector).size // page_size)
+
+
+def summary_lines(statevector, k=8, decimals=None, max_groups=8):
+    """Text summary: amplitude groups (value × count) followed by the top-k basis states."""
+    data = as_array(statevector)
+    if decimals is None:
+        decimals = display_decimals(data)
+    num_qubits = int(data.size).bit_length() - 1
+    lines = []
+    groups = group_amplitudes(data, decimals)
+    lines.append(f"非零幅度共 {sum(count for _, count, _ in groups)} / {data.size} 个，"
+                 f"分为 {len(groups)} 组 (保留 {decimals} 位小数):\n")
+    for amplitude, count, first_index in groups[:max_groups]:
+        first_label = ints_to_bitstrings([first_index], num_qubits)[0]
+        lines.append(f"  幅度 {format_amplitude(amplitude, decimals)} × {count} 个基态 (例如 |{first_label}>)\n")
+    if len(groups) > max_groups:
+        lines.append(f"  ... 另有 {len(groups) - max_groups} 组\n")
+    indices, amplitudes = top_k(data, k)
+    lines.append(f"模最大的 {len(indices)} 个分量:\n")
+    for label, amplitude in zip(ints_to_bitstrings(indices, num_qubits), amplitudes):
+        lines.append(f"  |{label}>: {format_amplitude(amplitude, decimals)} (概率 {abs(amplitude) ** 2:.4g})\n")
+    return lines
+
+
+def summary_dict(statevector, k=8, max_groups=8):
+    """JSON-friendly form of summary_lines (amplitudes as [real, imag])."""
+    data = as_array(statevector)
+    num_qubits = int(data.size).bit_length() - 1
+    groups = group_amplitudes(data)
+    indices, top_amplitudes = top_k(data, k)
+    return {
+        'num_qubits': num_qubits,
+        'num_groups': len(groups),
+        'groups': [
+            {'amplitude': [value.real, value.imag], 'count': count,
+             'example': ints_to_bitstrings([first_index], num_qubits)[0]}
+            for value, count, first_index in groups[:max_groups]
+        ],
+        'top_k': [
+            {'state': label, 'amplitude': [float(value.real), float(value.imag)],
+             'probability': float(abs(value) ** 2)}
+            for label, value in zip(ints_to_bitstrings(indices, num_qubits), top_amplitudes)
+        ],
+    }
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+比特串工具
+把 Qiskit 的测量比特串 (memory / counts 的键) 向量化地转换为 NumPy 数组
+"""
+
+import numpy as np
+
+
+def memory_to_bits(memory, num_bits):
+    """Convert per-shot memory strings into a (shots, num_bits) uint8 array.
+
+    Column ``i`` holds classical bit ``i`` (Qiskit strings are written with the
+    highest clbit first, and registers are separated by spaces).
+    """
+    if len(memory) == 0:
+        return np.zeros((0, num_bits), dtype=np.uint8)
+    raw = ''.join(memory).replace(' ', '').encode('ascii')
+    bits = np.frombuffer(raw, dtype=np.uint8).reshape(len(memory), num_bits) - ord('0')
+    return bits[:, ::-1].copy()
+
+
+def ints_to_bitstrings(values, num_bits):
+    """Format integers as zero-padded bitstrings (highest bit first), vectorized."""
+    values = np.asarray(values, dtype=np.int64)
+    if num_bits == 0:
+        return [''] * len(values)
+    shifts = np.arange(num_bits - 1, -1, -1, dtype=np.int64)
+    chars = ((values[:, None] >> shifts) & 1).astype(np.uint8) + ord('0')
+    return np.ascontiguousarray(chars).view(f'S{num_bits}').ravel().astype(str).tolist()
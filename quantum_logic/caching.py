@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+缓存工具
+电路结构哈希、通用的线程安全 LRU (LRUCache)、转译 (transpile) 结果缓存，以及电路图 PNG 的持久化渲染缓存
+"""
+
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _operand_key(value, circuit, parameter_ids=True):
+    """Turn an instruction parameter / condition operand into a hashable, stable key."""
+    # Late import keeps this module cheap to import
+    from qiskit.circuit import Clbit, ClassicalRegister, ParameterExpression, QuantumCircuit
+    if isinstance(value, QuantumCircuit):
+        return ('circuit', circuit_fingerprint(value, parameter_ids))
+    if isinstance(value, Clbit):
+        return ('clbit', circuit.find_bit(value).index)
+    if isinstance(value, ClassicalRegister):
+        return ('creg', value.name, value.size)
+    if isinstance(value, np.ndarray):
+        return ('array', value.shape, str(value.dtype), value.tobytes())
+    if isinstance(value, (tuple, list)):
+        return tuple(_operand_key(v, circuit, parameter_ids) for v in value)
+    if isinstance(value, (int, float, complex, str, bool)) or value is None:
+        return value
+    if isinstance(value, ParameterExpression) and parameter_ids:
+        # A rebuilt template has new Parameter objects with the same names: key on their uuids
+        # too, or a cached transpile would hand back a circuit holding the old parameters
+        return ('param', str(value), tuple(sorted((p.name, p.uuid.int) for p in value.parameters)))
+    # expr.Expr and anything else: fall back to the text form
+    return (type(value).__name__, str(value))
+
+
+def circuit_fingerprint(qc, parameter_ids=True):
+    """Structural hash of a circuit (registers, gates, operands, qubit/clbit indices).
+
+    The circuit name is left out: every unnamed QuantumCircuit gets a fresh 'circuit-<n>',
+    so identical circuits rebuilt on each click would otherwise never match.
+    Unbound parameters are identified by name and uuid; ``parameter_ids=False`` keys them
+    by name only (enough for a drawing, and stable across sessions).
+    """
+    parts = [
+        qc.num_qubits,
+        qc.num_clbits,
+        tuple((reg.name, reg.size) for reg in qc.qregs),
+        tuple((reg.name, reg.size) for reg in qc.cregs),
+        _operand_key(qc.global_phase, qc, parameter_ids),
+    ]
+    for instruction in qc.data:
+        op = instruction.operation
+        parts.append((
+            op.name,
+            tuple(_operand_key(p, qc, parameter_ids) for p in op.params),
+            _operand_key(getattr(op, 'condition', None), qc, parameter_ids),
+            tuple(qc.find_bit(q).index for q in instruction.qubits),
+            tuple(qc.find_bit(c).index for c in instruction.clbits),
+        ))
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def backend_name(backend):
+    """Backend name for both BackendV1 (method) and BackendV2 (attribute)."""
+    name = getattr(backend, 'name', None)
+    return name() if callable(name) else str(name)
+
+
+class LRUCache:
+    """Thread-safe bounded LRU mapping with hit/miss statistics.
+
+    Holds at most ``maxsize`` entries (None: no limit) and, given ``weigh(value)``, at
+    most ``max_weight`` in total weight; the newest entry is kept even if it alone is
+    heavier. Values are stored and handed out as-is, callers copy mutable values.
+    The transpile, render and seeded-result caches and templates.TemplateRegistry use it.
+    """
+
+    def __init__(self, maxsize=128, max_weight=None, weigh=None):
+        self.maxsize = maxsize
+        self.max_weight = max_weight
+        self._weigh = weigh
+        self._entries = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _weight_of(self, value):
+        return self._weigh(value) if self._weigh else 0
+
+    def get(self, key, default=None):
+        """The value for ``key`` (marked most recently used), or ``default``."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._entries:
+                self._weight -= self._weight_of(self._entries.pop(key))
+            self._entries[key] = value
+            self._weight += self._weight_of(value)
+            while self._entries and (
+                    (self.maxsize is not None and len(self._entries) > self.maxsize)
+                    or (self.max_weight is not None and self._weight > self.max_weight and len(self._entries) > 1)):
+                _, evicted = self._entries.popitem(last=False)
+                self._weight -= self._weight_of(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def weight(self):
+        return self._weight
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Hit/miss statistics as a dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+class TranspileCache(LRUCache):
+    """Bounded LRU cache of transpiled circuits.
+
+    Keyed by (circuit fingerprint, backend name, transpile options); safe to use
+    from the GUI worker thread.
+    """
+
+    def __init__(self, maxsize=128):
+        super().__init__(maxsize)
+
+    @staticmethod
+    def make_key(qc, backend, options):
+        return (circuit_fingerprint(qc), backend_name(backend), repr(sorted(options.items())))
+
+    def get_or_transpile(self, qc, backend, **options):
+        """Return the cached transpiled circuit, transpiling on a miss."""
+        key = self.make_key(qc, backend, options)
+        compiled = self.get(key)
+        if compiled is None:
+            from qiskit import transpile
+            compiled = transpile(qc, backend, **options)
+            self.put(key, compiled)
+        return compiled
+
+
+def user_cache_dir(app_name='quantum_games'):
+    """Per-user cache directory (QUANTUM_GAMES_CACHE_DIR overrides the platform default)."""
+    override = os.environ.get('QUANTUM_GAMES_CACHE_DIR')
+    if override:
+        return override
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, app_name)
+
+
+class RenderCache:
+    """Content-addressed cache of circuit diagrams as PNG bytes.
+
+    Keyed by (circuit fingerprint, draw style, dpi, draw options, qiskit version).
+    Entries live in an in-memory LRU and in ``cache_dir`` on disk; both are bounded
+    by total size and evict the least recently used images first. Disk errors only
+    disable persistence, they never break drawing.
+    """
+
+    def __init__(self, cache_dir=None, max_memory_bytes=32 * 2 ** 20, max_disk_bytes=128 * 2 ** 20,
+                 persist=True):
+        self.cache_dir = (cache_dir or os.path.join(user_cache_dir(), 'render')) if persist else None
+        self.max_disk_bytes = max_disk_bytes
+        # In-memory PNGs, bounded by total size; a memory miss is a disk hit or a render
+        self._memory = LRUCache(maxsize=None, max_weight=max_memory_bytes, weigh=len)
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+
+    @staticmethod
+    def make_key(qc, style, dpi, options):
+        import qiskit
+        parts = (circuit_fingerprint(qc, parameter_ids=False), style, dpi, repr(sorted(options.items())), qiskit.__version__)
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+    def get_or_render(self, qc, style='iqx', dpi=100, title=None, **draw_options):
+        """PNG bytes of ``qc.draw('mpl', style=style, **draw_options)``, rendering on a miss."""
+        options = dict(draw_options, title=title)
+        key = self.make_key(qc, style, dpi, options)
+        png = self._memory.get(key)
+        if png is not None:
+            return png
+        png = self._read_disk(key)
+        if png is not None:
+            with self._lock:
+                self.disk_hits += 1
+            self._memory.put(key, png)
+            return png
+        png = self.render(qc, style, dpi, title, **draw_options)
+        self._memory.put(key, png)
+        self._write_disk(key, png)
+        return png
+
+    @staticmethod
+    def render(qc, style='iqx', dpi=100, title=None, **draw_options):
+        """Draw ``qc`` with the mpl drawer and return the PNG bytes (the figure is closed)."""
+        import matplotlib.pyplot as plt
+        fig = qc.draw('mpl', style=style, **draw_options)
+        try:
+            if title:
+                fig.suptitle(title)
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+            return buffer.getvalue()
+        finally:
+            plt.close(fig)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as handle:
+                png = handle.read()
+            # Touch so size-based eviction keeps recently viewed diagrams
+            os.utime(path)
+            return png
+        except OSError:
+            return None
+
+    def _write_disk(self, key, png):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temp file and rename so readers never see a partial PNG
+            fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(png)
+            os.replace(temp_path, self._path(key))
+            self._evict_disk()
+        except OSError:
+            self.cache_dir = None
+
+    def _evict_disk(self):
+        """Delete the least recently used PNGs until the directory fits in max_disk_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.png'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self, disk=False):
+        self._memory.clear()
+        with self._lock:
+            self.disk_hits = 0
+        if disk and self.cache_dir and os.path.isdir(self.cache_dir):
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith('.png'):
+                    os.remove(entry.path)
+
+    def stats(self):
+        """Hit/miss statistics as a dict."""
+        memory = self._memory.stats()
+        with self._lock:
+            disk_hits = self.disk_hits
+        misses = max(0, memory['misses'] - disk_hits)
+        lookups = memory['hits'] + memory['misses']
+        return {
+            'hits': memory['hits'],
+            'disk_hits': disk_hits,
+            'misses': misses,
+            'size': memory['size'],
+            'memory_bytes': self._memory.weight,
+            'cache_dir': self.cache_dir,
+            'hit_rate': (memory['hits'] + disk_hits) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+命令行入口 (无界面)
+用与 GUI 相同的 run_* 流程运行演示，回调改为无界面实现，结果可输出为 JSON，图表可保存为 PNG。
+
+用法:
+    python -m quantum_logic list
+    python -m quantum_logic run grover --qubits 5 --shots 2048 --seed 7 --json
+    python -m quantum_logic run qft --qubits 4 --input 3 --png-dir out/
+    python -m quantum_logic run superposition --qubits 20 --save
+    python -m quantum_logic results
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# demo name -> (QuantumGames method, description, {CLI option: method parameter})
+DEMOS = {
+    'coin': ('run_coin_game', "量子猜硬币游戏", {'shots': 'shots'}),
+    'entanglement': ('run_entanglement_game', "量子纠缠 (贝尔态，--qubits > 2 时为 GHZ 态)",
+                     {'shots': 'shots', 'qubits': 'num_qubits'}),
+    'interference': ('run_interference_game', "量子干涉 (H 与 HZH)", {'shots': 'shots'}),
+    'phase_sweep': ('run_phase_sweep_demo', "干涉条纹 (参数化相位扫描)", {'points': 'num_points', 'shots': 'shots'}),
+    'teleportation': ('run_teleportation_game', "量子隐形传态", {'shots': 'shots', 'dynamic': 'deferred'}),
+    'superposition': ('run_superposition_demo', "多量子比特叠加态",
+                      {'qubits': 'num_qubits', 'shots': 'shots', 'page': 'amplitude_page'}),
+    'deutsch_jozsa': ('run_deutsch_jozsa_demo', "Deutsch-Jozsa 算法",
+                      {'qubits': 'n', 'shots': 'shots', 'seed': 'seed'}),
+    'grover': ('run_grover_search_demo', "Grover 搜索",
+               {'qubits': 'n', 'shots': 'shots', 'marked': 'marked_items', 'iterations': 'iterations'}),
+    'qft': ('run_qft_demo', "量子傅里叶变换", {'qubits': 'n', 'input': 'input_state'}),
+}
+
+
+class HeadlessSession:
+    """GUI callbacks for running a demo without Tk: collect (or echo) text, save or drop figures."""
+
+    def __init__(self, echo=True, png_dir=None, prefix='figure', keep_images=False):
+        self.echo = echo
+        self.png_dir = png_dir
+        self.prefix = prefix
+        # Render figures to PNG bytes even without png_dir (the result store reuses them)
+        self.keep_images = keep_images
+        self.output = []
+        self.saved_figures = []
+
+    def write(self, message, clear=False):
+        text = str(message)
+        self.output.append(text)
+        if self.echo:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    def display_plots(self, figures):
+        """Save / drop ``figures``; returns their PNG bytes when they were rendered, else None."""
+        import io
+        import matplotlib.pyplot as plt
+        if not (self.png_dir or self.keep_images):
+            for figure in figures:
+                if figure is not None and not isinstance(figure, (bytes, bytearray)):
+                    plt.close(figure)
+            return None
+        images = []
+        for figure in figures:
+            if figure is None:
+                continue
+            if isinstance(figure, (bytes, bytearray)):
+                png = bytes(figure)
+            else:
+                buffer = io.BytesIO()
+                figure.savefig(buffer, format='png', bbox_inches='tight')
+                plt.close(figure)
+                png = buffer.getvalue()
+            images.append(png)
+            if self.png_dir:
+                os.makedirs(self.png_dir, exist_ok=True)
+                path = os.path.join(self.png_dir, f"{self.prefix}_{len(self.saved_figures) + 1}.png")
+                with open(path, 'wb') as handle:
+                    handle.write(png)
+                self.saved_figures.append(path)
+        return images
+
+    def end_game(self):
+        pass
+
+
+def _json_default(value):
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, complex):
+        return [value.real, value.imag]
+    raise TypeError(f"无法序列化为 JSON: {type(value).__name__}")
+
+
+def _demo_kwargs(args, parameter_map):
+    """Keyword arguments for the run_* method from the options the user actually gave."""
+    values = {
+        'shots': args.shots,
+        'qubits': args.qubits,
+        'seed': args.seed,
+        'marked': args.marked,
+        'iterations': args.iterations,
+        'input': args.input,
+        'points': args.points,
+        'dynamic': False if args.dynamic else None,
+        'page': args.page - 1 if args.page is not None else None,
+    }
+    return {parameter: values[option] for option, parameter in parameter_map.items() if values[option] is not None}
+
+
+def run_demo(args):
+    # Figures are only rasterized to files; never open a GUI backend
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    from quantum_logic.games import QuantumGames
+
+    method_name, _, parameter_map = DEMOS[args.demo]
+    session = HeadlessSession(echo=not args.json, png_dir=args.png_dir, prefix=args.demo, keep_images=args.save)
+    games = QuantumGames(gui_output_func=session.write, end_game_func=session.end_game,
+                         gui_display_plots_func=session.display_plots)
+    if args.seed is not None:
+        games.sampling_seed = args.seed
+    if args.no_fast_path:
+        games.fast_path_max_qubits = 0
+    if args.histogram:
+        games.histogram_mode = args.histogram
+    if args.histogram_bits:
+        games.histogram_qubits = args.histogram_bits
+    if args.memory_budget_mb is not None:
+        games.memory_budget_bytes = int(args.memory_budget_mb * 2 ** 20)
+    if args.save:
+        from quantum_logic.result_store import ResultStore
+        games.result_store = ResultStore(args.results_dir)
+    kwargs = _demo_kwargs(args, parameter_map)
+
+    start_time = time.perf_counter()
+    run_id = games.run_demo(method_name, demo=args.demo, **kwargs)
+    total_time = time.perf_counter() - start_time
+    if games.result_store is not None:
+        # The run is written in the background; it must be on disk before the process exits
+        games.result_store.flush()
+        if games.result_store.last_error is not None:
+            run_id = None
+
+    results = dict(games.last_run)
+    # The full statevector is only kept in the result store; the summary is reported
+    results.pop('statevector', None)
+    timings = results.pop('timings_ms', {})
+    timings['total'] = total_time * 1000
+    report = {
+        'demo': args.demo,
+        'parameters': kwargs,
+        # The seed the run actually used (the default unless --seed was given)
+        'seed': games.sampling_seed,
+        'results': results,
+        'timings_ms': timings,
+        'figures': session.saved_figures,
+        'run_id': run_id,
+    }
+    if args.json:
+        report['output'] = ''.join(session.output)
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2, default=_json_default)
+        sys.stdout.write('\n')
+    else:
+        print("耗时: " + ", ".join(f"{stage} {value:.1f} ms" for stage, value in timings.items()))
+        for path in session.saved_figures:
+            print(f"图表已保存: {path}")
+        if run_id:
+            print(f"结果已保存: {run_id} ({games.result_store.root_dir})")
+    return 1 if 'error' in results else 0
+
+
+def list_results(args):
+    from quantum_logic.result_store import ResultStore
+    store = ResultStore(args.results_dir)
+    records = store.runs(demo=args.demo)
+    for record in records[:args.limit]:
+        details = [f"{key}={record[key]}" for key in ('num_qubits', 'shots', 'seed') if record.get(key) is not None]
+        if record.get('statevector'):
+            details.append("statevector")
+        elif record.get('statevector_skipped_bytes'):
+            details.append("statevector (过大，未保存)")
+        hash_text = (record.get('circuit_hash') or '-')[:12]
+        print(f"{record['id']}  {record['demo']:<15} {hash_text:<12}  {' '.join(details)}")
+    stats = store.stats()
+    print(f"共 {stats['runs']} 次运行，{stats['bytes'] / 2 ** 20:.1f} MiB ({stats['root_dir']})")
+    return 0
+
+
+def build_parser():
+    from quantum_logic.histograms import HISTOGRAM_MODES
+    parser = argparse.ArgumentParser(prog='python -m quantum_logic', description="无界面运行量子游戏演示")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help="列出可运行的演示")
+
+    run_parser = subparsers.add_parser('run', help="运行一个演示")
+    run_parser.add_argument('demo', choices=sorted(DEMOS))
+    run_parser.add_argument('--qubits', type=int, help="量子比特数 (entanglement / superposition / deutsch_jozsa / grover / qft)")
+    run_parser.add_argument('--shots', type=int, help="测量次数")
+    run_parser.add_argument('--seed', type=int, help="随机种子 (Aer seed_simulator 与 NumPy 采样，默认 2025)")
+    run_parser.add_argument('--marked', nargs='+', help="Grover 标记项 (二进制串)")
+    run_parser.add_argument('--iterations', type=int, help="Grover 迭代次数 (默认取最优值)")
+    run_parser.add_argument('--points', type=int, help="相位扫描的 φ 取值个数")
+    run_parser.add_argument('--input', type=int, help="QFT 输入基态 (十进制)")
+    run_parser.add_argument('--page', type=int, help="叠加态演示列出的状态向量页码 (从 1 开始)")
+    run_parser.add_argument('--dynamic', action='store_true', help="隐形传态使用动态电路版本")
+    run_parser.add_argument('--histogram', choices=HISTOGRAM_MODES,
+                            help="直方图聚合方式 (默认 auto: 结果种类多时取 top-k + 其他)")
+    run_parser.add_argument('--histogram-bits', type=int, nargs='+',
+                            help="--histogram marginal 保留的经典比特 (默认最低的几位)")
+    run_parser.add_argument('--no-fast-path', action='store_true', help="禁用 NumPy 快速路径，全部交给 Aer")
+    run_parser.add_argument('--memory-budget-mb', type=float, help="模拟内存预算 (MiB，默认物理内存的一半)")
+    run_parser.add_argument('--json', action='store_true', help="以 JSON 输出结果、状态向量摘要和耗时")
+    run_parser.add_argument('--png-dir', help="把图表保存为 PNG 的目录")
+    run_parser.add_argument('--save', action='store_true', help="把结果保存到结果目录，可在 GUI 中回放")
+    run_parser.add_argument('--results-dir', help="结果目录 (默认 <缓存目录>/results)")
+
+    results_parser = subparsers.add_parser('results', help="列出保存的运行结果")
+    results_parser.add_argument('--demo', help="只列出该演示的结果")
+    results_parser.add_argument('--limit', type=int, default=20, help="最多列出的条数")
+    results_parser.add_argument('--results-dir', help="结果目录 (默认 <缓存目录>/results)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'list':
+        for name, (method_name, description, parameter_map) in DEMOS.items():
+            options = ' '.join(f"--{option}" for option in parameter_map)
+            print(f"{name:<15} {description}  [{options}]")
+        return 0
+    if args.command == 'results':
+        return list_results(args)
+    return run_demo(args)
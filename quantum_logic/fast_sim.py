@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+NumPy 状态向量快速路径
+对只包含演示所用标准门的小电路，直接在进程内用向量化的 NumPy 运算求状态向量并采样，
+省去 Aer 的任务提交和结果对象开销。不支持的电路由调用方回退到 Aer。
+
+约定与 Qiskit 一致：基态下标的第 q 位对应量子比特 q (little-endian)。
+"""
+
+import numpy as np
+
+_SQRT1_2 = 1 / np.sqrt(2)
+
+# Fixed single-qubit matrices
+_SINGLE_QUBIT_GATES = {
+    'id': np.array([[1, 0], [0, 1]], dtype=complex),
+    'h': np.array([[_SQRT1_2, _SQRT1_2], [_SQRT1_2, -_SQRT1_2]], dtype=complex),
+    'x': np.array([[0, 1], [1, 0]], dtype=complex),
+    'y': np.array([[0, -1j], [1j, 0]], dtype=complex),
+    'z': np.array([[1, 0], [0, -1]], dtype=complex),
+    's': np.array([[1, 0], [0, 1j]], dtype=complex),
+    'sdg': np.array([[1, 0], [0, -1j]], dtype=complex),
+    't': np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=complex),
+    'tdg': np.array([[1, 0], [0, np.exp(-1j * np.pi / 4)]], dtype=complex),
+}
+
+
+def _rotation_matrix(name, theta):
+    """Matrices of the parameterized single-qubit gates."""
+    if name == 'p':
+        return np.array([[1, 0], [0, np.exp(1j * theta)]], dtype=complex)
+    if name == 'rz':
+        return np.array([[np.exp(-0.5j * theta), 0], [0, np.exp(0.5j * theta)]], dtype=complex)
+    cos, sin = np.cos(theta / 2), np.sin(theta / 2)
+    if name == 'rx':
+        return np.array([[cos, -1j * sin], [-1j * sin, cos]], dtype=complex)
+    if name == 'ry':
+        return np.array([[cos, -sin], [sin, cos]], dtype=complex)
+    raise KeyError(name)
+
+
+_ROTATION_GATES = {'p', 'rz', 'rx', 'ry'}
+
+
+def _u_matrix(theta, phi, lam):
+    """U(θ, φ, λ) as defined by Qiskit (what transpiled / template circuits use)."""
+    cos, sin = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[cos, -np.exp(1j * lam) * sin],
+                     [np.exp(1j * phi) * sin, np.exp(1j * (phi + lam)) * cos]], dtype=complex)
+
+
+_U_GATES = {'u', 'u3', 'u2', 'u1'}
+# Controlled versions: name -> (number of controls, base gate name)
+_CONTROLLED_GATES = {
+    'cx': (1, 'x'), 'cy': (1, 'y'), 'cz': (1, 'z'), 'ch': (1, 'h'),
+    'cp': (1, 'p'), 'crz': (1, 'rz'), 'crx': (1, 'rx'), 'cry': (1, 'ry'),
+    'ccx': (2, 'x'), 'ccz': (2, 'z'),
+}
+# Gates whose number of controls is read from the instruction itself
+_MULTI_CONTROLLED_GATES = {'mcx': 'x', 'mcphase': 'p'}
+_IGNORED = {'barrier', 'delay'}
+
+SUPPORTED_GATES = (set(_SINGLE_QUBIT_GATES) | _ROTATION_GATES | _U_GATES | set(_CONTROLLED_GATES)
+                   | set(_MULTI_CONTROLLED_GATES) | _IGNORED | {'swap', 'measure', 'initialize'})
+
+
+def _numeric_params(op):
+    """Gate parameters as Python numbers, or None if any is symbolic/unbound."""
+    values = []
+    for param in op.params:
+        try:
+            values.append(complex(param) if isinstance(param, complex) else float(param))
+        except (TypeError, ValueError):
+            return None
+    return values
+
+
+CONTROL_FLOW_OPS = {'if_else', 'while_loop', 'for_loop', 'switch_case', 'box'}
+_NON_UNITARY = CONTROL_FLOW_OPS | {'reset'}
+
+
+def has_control_flow(qc):
+    """True if ``qc`` contains dynamic-circuit control flow (if_test, loops, switch)."""
+    return any(instruction.operation.name in CONTROL_FLOW_OPS for instruction in qc.data)
+
+
+def has_only_terminal_measurements(qc):
+    """True if every measurement is final, so counts can be drawn from one final statevector.
+
+    Gate set is not checked here; the statevector may come from Aer as well.
+    """
+    measured = set()
+    for position, instruction in enumerate(qc.data):
+        op = instruction.operation
+        if op.name in _NON_UNITARY or getattr(op, 'condition', None) is not None:
+            return False
+        if op.name == 'initialize' and position != 0:
+            return False
+        qubits = {qc.find_bit(q).index for q in instruction.qubits}
+        if op.name == 'measure':
+            if measured.intersection(qubits):
+                return False
+            measured.update(qubits)
+        elif op.name not in _IGNORED and measured.intersection(qubits):
+            return False
+    return True
+
+
+def is_supported(qc, max_qubits=None):
+    """True if ``qc`` only uses supported gates, measures terminally and fits in max_qubits."""
+    if max_qubits is not None and qc.num_qubits > max_qubits:
+        return False
+    try:
+        float(qc.global_phase)
+    except TypeError:
+        return False  # symbolic global phase of an unbound template
+    measured = set()
+    for position, instruction in enumerate(qc.data):
+        op = instruction.operation
+        name = op.name
+        if name not in SUPPORTED_GATES or getattr(op, 'condition', None) is not None:
+            return False
+        qubits = [qc.find_bit(q).index for q in instruction.qubits]
+        if name == 'measure':
+            measured.update(qubits)
+            continue
+        if name in _IGNORED:
+            continue
+        if name == 'initialize':
+            # Only a full-register initialize at the very start is a plain state preparation
+            if position != 0 or len(qubits) != qc.num_qubits or len(op.params) != 2 ** qc.num_qubits \
+                    or isinstance(op.params[0], str):
+                return False
+            continue
+        if measured.intersection(qubits):
+            return False  # Gate after a measurement: not a terminal measurement
+        if _numeric_params(op) is None:
+            return False
+    return True
+
+
+def _apply_single(state, num_qubits, target, matrix):
+    """Apply a 2x2 matrix to one qubit using a reshaped view (no index arrays)."""
+    view = state.reshape(2 ** (num_qubits - target - 1), 2, 2 ** target)
+    a0 = view[:, 0, :].copy()
+    a1 = view[:, 1, :]
+    view[:, 0, :] = matrix[0, 0] * a0 + matrix[0, 1] * a1
+    view[:, 1, :] = matrix[1, 0] * a0 + matrix[1, 1] * a1
+
+
+def _apply_controlled(state, indices, controls, target, matrix):
+    """Apply a 2x2 matrix to ``target`` on the subspace where all ``controls`` are 1."""
+    control_mask = 0
+    for control in controls:
+        control_mask |= 1 << control
+    target_bit = 1 << target
+    lower = indices[((indices & control_mask) == control_mask) & ((indices & target_bit) == 0)]
+    upper = lower | target_bit
+    if matrix[0, 1] == 0 and matrix[1, 0] == 0:
+        # Diagonal gate: pure phase multiplication
+        if matrix[0, 0] != 1:
+            state[lower] *= matrix[0, 0]
+        state[upper] *= matrix[1, 1]
+        return
+    a0 = state[lower]
+    a1 = state[upper]
+    state[lower] = matrix[0, 0] * a0 + matrix[0, 1] * a1
+    state[upper] = matrix[1, 0] * a0 + matrix[1, 1] * a1
+
+
+def _apply_swap(state, indices, qubit_a, qubit_b):
+    bit_a, bit_b = 1 << qubit_a, 1 << qubit_b
+    first = indices[((indices & bit_a) != 0) & ((indices & bit_b) == 0)]
+    second = first ^ bit_a ^ bit_b
+    state[first], state[second] = state[second], state[first].copy()
+
+
+def _base_matrix(name, params):
+    if name == 'u2':
+        return _u_matrix(np.pi / 2, *params)
+    if name == 'u1':
+        return _rotation_matrix('p', params[0])
+    if name in _U_GATES:
+        return _u_matrix(*params)
+    if name in _ROTATION_GATES:
+        return _rotation_matrix(name, params[-1])
+    return _SINGLE_QUBIT_GATES[name]
+
+
+def simulate_statevector(qc):
+    """Return the final statevector of ``qc`` (measurements and barriers are skipped)."""
+    num_qubits = qc.num_qubits
+    state = np.zeros(2 ** num_qubits, dtype=complex)
+    state[0] = 1
+    indices = None  # Built lazily, only needed for controlled / swap gates
+    for instruction in qc.data:
+        op = instruction.operation
+        name = op.name
+        if name in _IGNORED or name == 'measure':
+            continue
+        qubits = [qc.find_bit(q).index for q in instruction.qubits]
+        if name == 'initialize':
+            state = np.asarray(op.params, dtype=complex).copy()
+            continue
+        params = _numeric_params(op)
+        if name in _SINGLE_QUBIT_GATES or name in _ROTATION_GATES or name in _U_GATES:
+            _apply_single(state, num_qubits, qubits[0], _base_matrix(name, params))
+            continue
+        if indices is None:
+            indices = np.arange(2 ** num_qubits)
+        if name == 'swap':
+            _apply_swap(state, indices, qubits[0], qubits[1])
+        elif name in _CONTROLLED_GATES:
+            num_controls, base = _CONTROLLED_GATES[name]
+            _apply_controlled(state, indices, qubits[:num_controls], qubits[-1], _base_matrix(base, params))
+        elif name in _MULTI_CONTROLLED_GATES:
+            base = _MULTI_CONTROLLED_GATES[name]
+            _apply_controlled(state, indices, qubits[:-1], qubits[-1], _base_matrix(base, params))
+        else:
+            raise ValueError(f"fast_sim 不支持的门: {name}")
+    # Transpiled circuits may carry a global phase (irrelevant for counts, not for statevectors)
+    global_phase = float(qc.global_phase)
+    if global_phase:
+        state *= np.exp(1j * global_phase)
+    return state
+
+
+def _measurement_map(qc):
+    """List of (qubit index, clbit index) pairs of the circuit's measurements."""
+    pairs = {}
+    for instruction in qc.data:
+        if instruction.operation.name == 'measure':
+            for qubit, clbit in zip(instruction.qubits, instruction.clbits):
+                pairs[qc.find_bit(clbit).index] = qc.find_bit(qubit).index
+    return [(qubit, clbit) for clbit, qubit in pairs.items()]
+
+
+def sample_indices(probabilities, shots, seed=None):
+    """Multinomial sample of basis indices; returns (outcome indices, counts) with counts > 0."""
+    rng = np.random.default_rng(seed)
+    probabilities = np.asarray(probabilities, dtype=float)
+    probabilities = probabilities / probabilities.sum()
+    histogram = rng.multinomial(shots, probabilities)
+    outcomes = np.flatnonzero(histogram)
+    return outcomes, histogram[outcomes]
+
+
+def _clbit_values(outcomes, measurements):
+    """Map basis indices to the integer value of the classical register bits."""
+    values = np.zeros(len(outcomes), dtype=np.int64)
+    for qubit, clbit in measurements:
+        values |= ((outcomes >> qubit) & 1) << clbit
+    return values
+
+
+def counts_key_columns(qc):
+    """Clbit index of each character of a Qiskit counts key, left to right (-1 = register space).
+
+    Highest register first, highest bit first.
+    """
+    if qc.cregs:
+        columns = []
+        for register in reversed(qc.cregs):
+            if columns:
+                columns.append(-1)
+            columns.extend(qc.find_bit(clbit).index for clbit in reversed(list(register)))
+    else:
+        columns = list(range(qc.num_clbits - 1, -1, -1))
+    return np.array(columns, dtype=np.int64)
+
+
+def _chars_to_strings(chars):
+    return np.ascontiguousarray(chars).view(f'S{chars.shape[1]}').ravel().astype(str).tolist()
+
+
+def format_clbit_values(values, qc):
+    """Format integer clbit values the way Qiskit formats counts keys ('c1 c0' registers).
+
+    Vectorized: builds one character matrix for all values instead of formatting each key.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    columns = counts_key_columns(qc)
+    if not columns.size:
+        return [''] * len(values)
+    chars = ((values[:, None] >> np.maximum(columns, 0)) & 1).astype(np.uint8) + ord('0')
+    chars[:, columns < 0] = ord(' ')
+    return _chars_to_strings(chars)
+
+
+def format_clbit_rows(bits, qc):
+    """Counts keys for rows of a (samples, num_clbits) 0/1 array; works for any register width."""
+    bits = np.asarray(bits, dtype=np.uint8)
+    columns = counts_key_columns(qc)
+    if not columns.size:
+        return [''] * len(bits)
+    chars = bits[:, np.maximum(columns, 0)] + np.uint8(ord('0'))
+    chars[:, columns < 0] = ord(' ')
+    return _chars_to_strings(chars)
+
+
+def parse_counts_key(key, qc):
+    """Inverse of format_clbit_rows for one key: uint8 array indexed by clbit."""
+    columns = counts_key_columns(qc)
+    bits = np.zeros(qc.num_clbits, dtype=np.uint8)
+    chars = np.frombuffer(key.encode('ascii'), dtype=np.uint8)
+    mask = columns >= 0
+    bits[columns[mask]] = chars[mask] - ord('0')
+    return bits
+
+
+def counts_from_statevector(qc, statevector, shots, seed=None):
+    """Counts dict for ``qc``'s terminal measurements, sampled from ``statevector``."""
+    measurements = _measurement_map(qc)
+    probabilities = np.abs(np.asarray(statevector)) ** 2
+    outcomes, hits = sample_indices(probabilities, shots, seed)
+    values = _clbit_values(outcomes, measurements)
+    unique_values, inverse = np.unique(values, return_inverse=True)
+    totals = np.bincount(inverse, weights=hits).astype(np.int64)
+    return dict(zip(format_clbit_values(unique_values, qc), totals.tolist()))
+
+
+def run_counts(qc, shots, seed=None):
+    """Simulate ``qc`` and return a Qiskit-style counts dict."""
+    return counts_from_statevector(qc, simulate_statevector(qc), shots, seed)
+
+
+def sample_clbits(qc, shots, seed=None):
+    """Per-shot samples as a (shots, num_clbits) uint8 array (column i = clbit i)."""
+    rng = np.random.default_rng(seed)
+    probabilities = np.abs(simulate_statevector(qc)) ** 2
+    outcomes = rng.choice(len(probabilities), size=shots, p=probabilities / probabilities.sum())
+    values = _clbit_values(outcomes, _measurement_map(qc))
+    return ((values[:, None] >> np.arange(qc.num_clbits)) & 1).astype(np.uint8)
@@ -7,30 +7,387 @@
 展示了量子叠加、量子纠缠、量子干涉等量子力学特性
 """
 
-from qiskit_aer import Aer
-from qiskit import QuantumCircuit, transpile
-from qiskit.visualization import plot_histogram, plot_bloch_multivector, plot_state_city
+from qiskit import QuantumCircuit
+from qiskit.visualization import plot_bloch_multivector, plot_state_city
 from qiskit.quantum_info import Statevector
-from qiskit.circuit.library import MCPhaseGate
 import matplotlib.pyplot as plt
 import numpy as np
 import random
 import time
 import os
 import math
+import threading
+
+from quantum_logic import (amplitudes, deutsch_jozsa, fast_sim, grover, histograms, interference, planner, qft,
+                           result_store, stabilizer, templates)
+from quantum_logic.bitstrings import ints_to_bitstrings, memory_to_bits
+from quantum_logic.caching import LRUCache, RenderCache, TranspileCache, backend_name, circuit_fingerprint
+from quantum_logic.profiling import Profiler
 
 class QuantumGames:
     # Modify init to accept GUI interaction functions
-    def __init__(self, gui_output_func=None, request_input_func=None, end_game_func=None, gui_display_plots_func=None):
+    def __init__(self, gui_output_func=None, request_input_func=None, end_game_func=None, gui_display_plots_func=None,
+                 cancel_check_func=None, profiler=None, result_store=None):
         """Initialize with optional callbacks for GUI interaction."""
         self.gui_output = gui_output_func
         self.request_input = request_input_func # Expects a function that takes a callback
         self.end_game = end_game_func # Callback to signal game end to GUI
         self.gui_display_plots = gui_display_plots_func # NEW: Callback for list of plots
-        self.simulator = Aer.get_backend('qasm_simulator')
-        self.statevector_sim = Aer.get_backend('statevector_simulator')
+        self.cancel_check = cancel_check_func # Optional: raises to abort long loops (GUI cancel button)
+        # Per-stage timing spans (transpile, simulate, draw, ...); disabled unless a profiler is passed in
+        self.profiler = profiler or Profiler(enabled=False)
+        # Aer backends are created lazily on first use (see simulator / statevector_sim)
+        self._backends = {}
+        self._backend_lock = threading.Lock()
         # Store GUI interaction functions
         self.current_game_state = {} # Optional: For more complex state between inputs
+        # Structured results of the latest run_* call (counts, summaries, timings), for the CLI
+        self.last_run = {}
+        # Optional result_store.ResultStore: run_demo persists every run there for replay
+        self.result_store = result_store
+        # Circuits simulated by the current run_demo call (for the stored circuit hash); None = not collecting
+        self._run_circuits = None
+        # Transpiled circuits are reused across clicks (see _transpile)
+        self.transpile_cache = TranspileCache(maxsize=128)
+        # Demo circuits built and transpiled once per shape; runs only bind parameters
+        self.templates = templates.TemplateRegistry(self._transpile)
+        self.templates.register('grover', templates.build_grover_template)
+        self.templates.register('qft', templates.build_qft_template, target=lambda: self.statevector_sim,
+                                optimization_level=1)
+        self.templates.register('phase_sweep', templates.build_phase_sweep_template)
+        # Circuit diagrams are rendered once and kept as PNG bytes in memory and on disk
+        self.render_cache = RenderCache()
+        # Small circuits with supported gates skip Aer (see _use_fast_path); 0 disables it
+        self.fast_path_max_qubits = 12
+        # One seed for every simulation: Aer seed_simulator and all NumPy sampling, so a demo
+        # re-run with the same settings gives the same counts; None = fresh randomness each run.
+        # Single-shot / per-sample helpers (coin flips, entangled pairs) instead draw a new
+        # child seed per call from it (see _fresh_seed), so they differ from call to call
+        self.sampling_seed = 2025
+        self._seed_sequence = None # (root seed, np.random.SeedSequence)
+        # Seeded counts keyed by (circuit fingerprints, methods, backend / run options, shots, seed);
+        # only seeded runs are memoized, so a hit is exactly what a new simulation would return
+        self.result_memo = LRUCache(maxsize=64)
+        # Grover: build/simulate the real circuit up to this size, NumPy reflection beyond
+        self.grover_circuit_max_qubits = 10
+        # Histograms with more outcomes than this switch to top-k + "其他" (see _plot_counts)
+        self.histogram_max_bars = 32
+        # Histogram aggregation (histograms.HISTOGRAM_MODES) and the clbits kept by 'marginal'
+        self.histogram_mode = 'auto'
+        self.histogram_qubits = None
+        # Pre-flight budgets for plan_simulation; None = half the installed RAM
+        self.memory_budget_bytes = None
+        self.time_budget_seconds = 120
+
+    def _get_backend(self, name):
+        """Return the named Aer backend, importing qiskit_aer and building it on first use."""
+        with self._backend_lock:
+            backend = self._backends.get(name)
+            if backend is None:
+                from qiskit_aer import Aer
+                backend = Aer.get_backend(name)
+                self._backends[name] = backend
+            return backend
+
+    @property
+    def simulator(self):
+        return self._get_backend('qasm_simulator')
+
+    @property
+    def statevector_sim(self):
+        return self._get_backend('statevector_simulator')
+
+    def warm_up(self):
+        """Build the simulator backends and run a trivial job so the first click is fast.
+
+        Meant to be called from a background thread while the window is already shown.
+        """
+        warm_up_circuit = self.create_coin_circuit()
+        self.simulator.run(self._transpile(warm_up_circuit), shots=1).result()
+        self._get_backend('statevector_simulator')
+
+    def _draw_circuit(self, qc, style='iqx', **draw_options):
+        """Circuit diagram as PNG bytes via the render cache (the GUI shows them directly)."""
+        with self.profiler.span('draw_circuit'):
+            return self.render_cache.get_or_render(qc, style=style, **draw_options)
+
+    def _record(self, **results):
+        """Add structured results of the running demo to last_run (see quantum_logic.cli)."""
+        self.last_run.update(results)
+
+    def _note_circuit(self, qc):
+        """Remember ``qc`` as simulated by the current run_demo call (no-op outside run_demo)."""
+        if self._run_circuits is not None:
+            self._run_circuits.setdefault(id(qc), qc)
+
+    def run_demo(self, method_name, demo=None, **kwargs):
+        """Run QuantumGames.<method_name>(**kwargs) with a fresh last_run.
+
+        With a result_store, the results, text output, figures, circuit hash and seed of the
+        run are then saved under ``demo`` (default: method_name) and the run id is returned;
+        otherwise returns None. The files are written on the store's writer thread
+        (ResultStore.save_run_async); storage errors are reported, they never fail the demo.
+        A gui_display_plots callback may return the images it rendered (PNG / PPM bytes),
+        which are then stored instead of rendering the figures a second time.
+        """
+        self.last_run = {}
+        if self.result_store is None:
+            getattr(self, method_name)(**kwargs)
+            return None
+        output, figures = [], []
+        gui_output, gui_display_plots = self.gui_output, self.gui_display_plots
+
+        def capture_output(message, *args, **options):
+            output.append(str(message))
+            gui_output(message, *args, **options)
+
+        def capture_plots(plot_list):
+            images = gui_display_plots(plot_list)
+            figures.extend(figure for figure in (plot_list if images is None else images) if figure is not None)
+
+        if gui_output:
+            self.gui_output = capture_output
+        if gui_display_plots:
+            self.gui_display_plots = capture_plots
+        self._run_circuits = {}
+        try:
+            getattr(self, method_name)(**kwargs)
+            circuits = list(self._run_circuits.values())
+        finally:
+            self.gui_output, self.gui_display_plots = gui_output, gui_display_plots
+            self._run_circuits = None
+        def report_error(error):
+            if gui_output:
+                gui_output(f"\n保存运行结果失败: {error}\n")
+
+        try:
+            with self.profiler.span('store_results'):
+                fingerprints = list(dict.fromkeys(circuit_fingerprint(qc) for qc in circuits))
+                return self.result_store.save_run_async(demo or method_name, kwargs, self.last_run, ''.join(output),
+                                                        figures, result_store.combined_hash(fingerprints),
+                                                        self.sampling_seed, on_error=report_error)
+        except OSError as e:
+            report_error(e)
+            return None
+
+    def _plot_counts(self, counts, title=None, **options):
+        """Histogram figure that aggregates large outcome spaces (see histograms.plot_counts).
+
+        Uses histogram_mode; 'marginal' keeps the histogram_qubits that exist in ``counts``
+        (a one-bit histogram such as Bob's qubit keeps just clbit 0).
+        """
+        options.setdefault('mode', self.histogram_mode)
+        if options['mode'] == 'marginal' and self.histogram_qubits is not None and counts:
+            width = len(next(iter(counts)).replace(' ', ''))
+            options.setdefault('qubits', [qubit for qubit in self.histogram_qubits if qubit < width] or None)
+        with self.profiler.span('plot_histogram'):
+            return histograms.plot_counts(counts, title=title, max_bars=self.histogram_max_bars, **options)
+
+    def _transpile(self, qc, backend=None, **options):
+        """Transpile via the LRU cache keyed by circuit structure, backend and options."""
+        with self.profiler.span('transpile'):
+            return self.transpile_cache.get_or_transpile(qc, backend or self.simulator, **options)
+
+    def _use_fast_path(self, qc):
+        """True if ``qc`` is small enough and simple enough for the in-process NumPy engine."""
+        return fast_sim.is_supported(qc, max_qubits=self.fast_path_max_qubits)
+
+    @property
+    def memory_budget(self):
+        """Effective memory budget in bytes (memory_budget_bytes, or half the installed RAM)."""
+        if self.memory_budget_bytes is not None:
+            return self.memory_budget_bytes
+        return planner.physical_memory_bytes() // 2
+
+    def plan_simulation(self, qc, shots=1024, return_statevector=False):
+        """Pick the simulation method for ``qc`` within the memory / time budgets.
+
+        Returns a planner.SimulationPlan; raises planner.SimulationTooLarge when no method fits.
+        """
+        return planner.plan_simulation(qc, self.memory_budget, self.time_budget_seconds, shots,
+                                       self.fast_path_max_qubits, return_statevector)
+
+    def max_statevector_qubits(self, copies=3):
+        """Largest register whose ``copies`` dense statevectors fit in the memory budget."""
+        return planner.max_statevector_qubits(self.memory_budget, copies)
+
+    def _prepare_for_backend(self, qc, backend=None):
+        """Cached transpile, except for dynamic circuits: the legacy qasm_simulator target
+        rejects if_else during transpile, so those are handed to Aer as they are."""
+        if fast_sim.has_control_flow(qc):
+            return qc
+        return self._transpile(qc, backend)
+
+    def _run_counts(self, qc, shots, seed=None, memoize=True, method=None):
+        """Counts of ``qc``: NumPy fast path for small circuits, Aer qasm_simulator otherwise
+        (``method`` forces one planner method, see run_batch)."""
+        return self.run_batch([qc], shots, method=method, memoize=memoize, seed=seed)[0]
+
+    def _method_backend(self, method, backend=None):
+        """Aer backend for a planner method: the given backend for statevector, else aer_simulator_<method>.
+
+        Without a backend, statevector also gets its own aer_simulator_statevector: the
+        default qasm_simulator picks stabilizer on its own for Clifford circuits.
+        """
+        if method is None:
+            return backend or self.simulator
+        if method == 'statevector' and backend is not None:
+            return backend
+        return self._get_backend(f'aer_simulator_{method}')
+
+    def _seed_options(self, run_options, seed=None):
+        """``run_options`` plus seed_simulator=``seed`` (default: sampling_seed), unless seeding
+        is off or run_options already has a seed."""
+        seed = self.sampling_seed if seed is None else seed
+        if seed is None or 'seed_simulator' in run_options:
+            return run_options
+        return dict(run_options, seed_simulator=seed)
+
+    def _fresh_seed(self):
+        """A new seed on every call, spawned from a SeedSequence rooted at sampling_seed.
+
+        Calls differ from each other, yet a session started with the same sampling_seed
+        draws the same sequence of seeds (sampling_seed=None: OS entropy).
+        """
+        root, sequence = self._seed_sequence or (None, None)
+        if sequence is None or root != self.sampling_seed:
+            sequence = np.random.SeedSequence(self.sampling_seed)
+            self._seed_sequence = (self.sampling_seed, sequence)
+        return int(sequence.spawn(1)[0].generate_state(1)[0])
+
+    def _simulation_timing(self, stage, elapsed, memo_hits_before):
+        """``({stage: ms}, '')`` for a timed simulation; ``({'memo_lookup': ms}, note)`` if
+        result_memo answered it since ``memo_hits_before`` (a lookup is not a simulation time)."""
+        if self.result_memo.hits > memo_hits_before:
+            return {'memo_lookup': elapsed * 1000}, " (结果来自备忘录，未重新模拟)"
+        return {stage: elapsed * 1000}, ""
+
+    def run_batch(self, circuits, shots=1024, backend=None, method=None, transpiled=False, memoize=True,
+                  seed=None, **run_options):
+        """Execute a list of circuits in ONE simulator submission; return their counts in order.
+
+        With the default backend and no extra run options, each circuit is first planned
+        (see plan_simulation): circuits the NumPy engine supports are answered in-process,
+        stabilizer / matrix_product_state circuits go to the matching aer_simulator_<method>
+        backend, and one job is submitted per backend. Clifford circuits with terminal
+        measurements run a single stabilizer shot and the rest are sampled in NumPy (see
+        quantum_logic.stabilizer). ``method`` forces one planner method for every circuit
+        (e.g. to compare timings), each on its aer_simulator_<method> backend. ``transpiled=True`` marks circuits already compiled for
+        ``backend`` (bound templates), which are then sent as they are. Raises planner.SimulationTooLarge before running
+        anything if some circuit fits no method.
+
+        Every run is seeded with ``seed`` (default: sampling_seed), and seeded results are
+        memoized in result_memo: the same circuits, methods, options, shots and seed return
+        the remembered counts (as copies) without simulating. ``memoize=False`` always simulates.
+        """
+        backend = backend or self.simulator
+        planned = backend is self.simulator and not run_options
+        forced = method is not None
+        methods = [method or (self.plan_simulation(qc, shots).method if planned else None) for qc in circuits]
+        run_options = self._seed_options(run_options, seed)
+        memo_key = None
+        if memoize and 'seed_simulator' in run_options:
+            with self.profiler.span('memo_lookup'):
+                # Aer derives each experiment's seed from its position in the job, so the
+                # whole batch is the unit that reproduces exactly
+                memo_key = (tuple(circuit_fingerprint(qc) for qc in circuits), tuple(methods), backend_name(backend),
+                            transpiled, repr(sorted(run_options.items())), shots)
+                memoized = self.result_memo.get(memo_key)
+            if memoized is not None:
+                for qc in circuits:
+                    self._note_circuit(qc)
+                return [dict(counts) for counts in memoized]
+        seed = run_options.get('seed_simulator')
+        all_counts = [None] * len(circuits)
+        # (backend name, sampled) -> (backend, [(position, original, compiled circuit), ...])
+        aer_jobs = {}
+        for position, (qc, method) in enumerate(zip(circuits, methods)):
+            self._note_circuit(qc)
+            if method == 'numpy':
+                with self.profiler.span('fast_path'):
+                    all_counts[position] = fast_sim.run_counts(qc, shots, seed)
+                continue
+            # A forced method must not fall back to qasm_simulator's own method choice
+            method_backend = self._method_backend(method, None if forced else backend)
+            sampled = method == 'stabilizer' and fast_sim.has_only_terminal_measurements(qc)
+            compiled = qc if transpiled and method_backend is backend else self._prepare_for_backend(qc, method_backend)
+            aer_jobs.setdefault((method_backend.name, sampled), (method_backend, []))[1].append(
+                (position, qc, compiled))
+        for (_, sampled), (method_backend, jobs) in aer_jobs.items():
+            with self.profiler.span('simulate'):
+                result = method_backend.run([compiled for _, _, compiled in jobs], shots=1 if sampled else shots,
+                                            **run_options).result()
+            with self.profiler.span('sample' if sampled else 'parse'):
+                for index, (position, qc, _) in enumerate(jobs):
+                    counts = result.get_counts(index)
+                    if sampled:
+                        counts = stabilizer.sample_counts(qc, next(iter(counts)), shots, seed)
+                    all_counts[position] = counts
+        if memo_key is not None:
+            self.result_memo.put(memo_key, [dict(counts) for counts in all_counts])
+        return all_counts
+
+    def run_interference_variants(self, variants=('standard', 'no_z', 's_gate'), shots=1000):
+        """Run several create_interference_circuit variants together; returns {variant: counts}."""
+        circuits = [self.create_interference_circuit(variant, draw_only=True) for variant in variants]
+        return dict(zip(variants, self.run_batch(circuits, shots)))
+
+    def run_phase_sweep(self, phases, shots=1024):
+        """P(1) of the H-P(φ)-H interferometer for every φ in ``phases``.
+
+        The parameterized template is built and transpiled once; all bindings are sent to
+        Aer as ONE job via parameter_binds. Returns a NumPy array aligned with ``phases``.
+        """
+        template = self.templates.get('phase_sweep')
+        self._note_circuit(template.circuit)
+        run_options = self._seed_options({})
+        memo_key = None
+        if run_options:
+            phases = np.asarray(phases, dtype=float)
+            memo_key = ('phase_sweep', circuit_fingerprint(template.compiled), phases.tobytes(), shots,
+                        run_options['seed_simulator'])
+            memoized = self.result_memo.get(memo_key)
+            if memoized is not None:
+                return memoized.copy()
+        with self.profiler.span('simulate'):
+            result = self.simulator.run(template.compiled, shots=shots,
+                                        parameter_binds=[template.binds([phases])], **run_options).result()
+        with self.profiler.span('parse'):
+            probabilities = interference.probabilities_of_one(result.get_counts(), shots)
+        if memo_key is not None:
+            self.result_memo.put(memo_key, probabilities.copy())
+        return probabilities
+
+    def _run_statevector(self, qc, transpiled=False):
+        """Final Statevector of ``qc`` (without measurements), using the fast path when possible.
+
+        ``transpiled=True`` marks a circuit already compiled for statevector_sim (a bound
+        template). Raises planner.SimulationTooLarge when the statevector does not fit the budgets.
+        """
+        self._note_circuit(qc)
+        if self.plan_simulation(qc, return_statevector=True).method == 'numpy':
+            with self.profiler.span('fast_path'):
+                return Statevector(fast_sim.simulate_statevector(qc))
+        # optimization_level=1: higher levels may elide trailing SWAPs into a final layout
+        # permutation, which get_statevector does not undo (wrong amplitude order)
+        compiled_circuit = qc if transpiled else self._transpile(qc, self.statevector_sim, optimization_level=1)
+        with self.profiler.span('simulate'):
+            result = self.statevector_sim.run(compiled_circuit).result()
+        return result.get_statevector(compiled_circuit)
+
+    def _counts_from_statevector(self, qc, shots, statevector=None, seed=None):
+        """Counts for a circuit whose measurements are all terminal, from a single statevector.
+
+        The multinomial draw costs O(2^n) regardless of ``shots``. ``statevector`` may be
+        passed in when the caller already has it.
+        """
+        if not fast_sim.has_only_terminal_measurements(qc):
+            raise ValueError("电路包含中间测量或经典控制，无法从单个状态向量采样。")
+        if statevector is None:
+            statevector = self._run_statevector(qc.remove_final_measurements(inplace=False))
+        with self.profiler.span('sample'):
+            return fast_sim.counts_from_statevector(
+                qc, statevector, shots, self.sampling_seed if seed is None else seed)
     
     # Remove clear_screen as it's GUI's responsibility or done via gui_output
     # def clear_screen(self):
@@ -64,10 +421,8 @@ class QuantumGames:
         qc.measure(0, 0)
         if draw_only:
             return qc
-        compiled_circuit = transpile(qc, self.simulator)
-        job = self.simulator.run(compiled_circuit, shots=1)
-        result = job.result()
-        counts = result.get_counts(compiled_circuit)
+        # A fresh seed per flip (and no memo): a seeded single shot would repeat forever
+        counts = self._run_counts(qc, shots=1, seed=self._fresh_seed(), memoize=False)
         return list(counts.keys())[0]
     
     # ... (other internal logic methods like flip_quantum_biased_coin, create_entangled_pair etc. remain unchanged) ...
@@ -80,14 +435,82 @@ class QuantumGames:
         qc.measure([0, 1], [0, 1])
         if draw_only:
             return qc
-        compiled_circuit = transpile(qc, self.simulator)
-        job = self.simulator.run(compiled_circuit, shots=1)
-        result = job.result()
-        counts = result.get_counts(compiled_circuit)
+        # A fresh seed per flip (and no memo): a seeded single shot would repeat forever
+        counts = self._run_counts(qc, shots=1, seed=self._fresh_seed(), memoize=False)
         return list(counts.keys())[0]
 
-    def create_superposition(self, num_qubits=3, shots=1000):
-        """创建多量子比特叠加态 (Internal Logic, but might need GUI output for counts/statevector)"""
+    def create_ghz_circuit(self, num_qubits=3):
+        """N 量子比特 GHZ 态 (|0...0> + |1...1>)/sqrt(2) 并测量全部比特 (Clifford 电路)"""
+        qc = QuantumCircuit(num_qubits, num_qubits)
+        qc.h(0)
+        for qubit in range(num_qubits - 1):
+            qc.cx(qubit, qubit + 1)
+        qc.measure(range(num_qubits), range(num_qubits))
+        return qc
+
+    def compare_methods(self, qc, shots, methods=('stabilizer', 'statevector'), max_seconds=10, memoize=True):
+        """Time ``qc`` under each planner method that is supported and fits the budgets.
+
+        Returns {method: milliseconds, or the reason it was skipped (str)}. Backends and
+        transpiled circuits are prepared before timing. Methods whose estimate exceeds
+        ``max_seconds`` are skipped so the comparison stays interactive. With a sampling_seed
+        the timings are kept in result_memo, so a repeated click does not run every method again.
+        """
+        memo_key = None
+        if memoize and self.sampling_seed is not None:
+            memo_key = ('compare_methods', circuit_fingerprint(qc), tuple(methods), shots, self.sampling_seed,
+                        max_seconds, self.memory_budget)
+            memoized = self.result_memo.get(memo_key)
+            if memoized is not None:
+                return dict(memoized)
+        estimates = planner.estimate_methods(qc, shots, self.fast_path_max_qubits)
+        timings = {}
+        for method in methods:
+            estimate = estimates[method]
+            if not estimate.supported:
+                timings[method] = estimate.reason
+            elif estimate.memory_bytes > self.memory_budget or estimate.seconds > max_seconds:
+                timings[method] = f"跳过 (预计{estimate.cost()})"
+            else:
+                self._prepare_for_backend(qc, self._method_backend(method))
+                start_time = time.perf_counter()
+                self.run_batch([qc], shots, method=method, memoize=False)
+                timings[method] = (time.perf_counter() - start_time) * 1000
+        if memo_key is not None:
+            self.result_memo.put(memo_key, dict(timings))
+        return timings
+
+    def _sample_bits(self, qc, num_samples):
+        """Run ``qc`` once with per-shot memory; return a (num_samples, num_clbits) uint8 array.
+
+        Each call samples with a fresh seed (see _fresh_seed).
+        """
+        self._note_circuit(qc)
+        seed = self._fresh_seed()
+        if self._use_fast_path(qc):
+            return fast_sim.sample_clbits(qc, num_samples, seed)
+        compiled_circuit = self._transpile(qc)
+        job = self.simulator.run(compiled_circuit, shots=num_samples, memory=True, **self._seed_options({}, seed))
+        memory = job.result().get_memory(compiled_circuit)
+        return memory_to_bits(memory, qc.num_clbits)
+
+    def flip_quantum_coins(self, num_flips=1000):
+        """批量抛量子硬币：一次模拟任务返回 num_flips 个结果 (uint8 数组，元素为 0/1)"""
+        return self._sample_bits(self.create_coin_circuit(), num_flips)[:, 0]
+
+    def create_entangled_pairs(self, num_pairs=1000):
+        """批量测量贝尔对：一次模拟任务返回形状为 (num_pairs, 2) 的 uint8 数组，第 i 列对应量子比特 i"""
+        qc = self.create_entangled_pair(draw_only=True)
+        return self._sample_bits(qc, num_pairs)
+
+    def create_superposition(self, num_qubits=3, shots=1000, single_pass=True, seed=None):
+        """创建多量子比特叠加态 (Internal Logic, but might need GUI output for counts/statevector)
+
+        single_pass=True: 只模拟一次状态向量，再用固定种子的多项分布采样得到计数；
+        single_pass=False: 额外用 qasm 模拟器运行一次带测量的电路 (旧行为)。
+        """
+        # 2^n amplitudes, an Aer copy and the sampling probabilities: refuse before allocating
+        planner.check_statevector_memory(num_qubits, self.memory_budget, copies=3)
         # ... (Internal logic for circuit creation) ...
         qc = QuantumCircuit(num_qubits, num_qubits)
         for q in range(num_qubits):
@@ -96,16 +519,14 @@ class QuantumGames:
         # Statevector part (no direct print)
         statevector_circuit = qc.copy()
         statevector_circuit.remove_final_measurements(inplace=True)
-        statevector_job = self.statevector_sim.run(transpile(statevector_circuit, self.statevector_sim))
-        statevector_result = statevector_job.result()
-        statevector = statevector_result.get_statevector(statevector_circuit)
+        statevector = self._run_statevector(statevector_circuit)
         
         # Measurement part (no direct print)
         qc.measure(range(num_qubits), range(num_qubits))
-        compiled_circuit = transpile(qc, self.simulator)
-        job = self.simulator.run(compiled_circuit, shots=shots)
-        result = job.result()
-        counts = result.get_counts(compiled_circuit)
+        if single_pass:
+            counts = self._counts_from_statevector(qc, shots, statevector=statevector, seed=seed)
+        else:
+            counts = self._run_counts(qc, shots)
         
         # Return results; calling function decides how to display
         return qc, counts, statevector
@@ -123,23 +544,73 @@ class QuantumGames:
          qc.measure(0, 0)
          if draw_only:
              return qc
-         compiled_circuit = transpile(qc, self.simulator)
-         job = self.simulator.run(compiled_circuit, shots=shots)
-         result = job.result()
-         counts = result.get_counts(compiled_circuit)
+         counts = self._run_counts(qc, shots)
          return counts
 
-    def quantum_teleportation_demo(self, state_to_teleport=None, draw_only=False):
-        """量子隐形传态演示 (Internal Logic)"""
-        # ... (Internal logic as before) ...
-        # This one likely needs significant refactoring if it had print/input.
-        # For now, assume it just returns the circuit or results.
-        qc = QuantumCircuit(3, 2) 
-        # ... rest of teleportation logic ...
-        # Ensure no print/input inside this core logic function
-        # It should return results (e.g., circuit, final state, counts) 
-        # The calling GUI function will display them.
-        pass # Placeholder - requires detailed check
+    def quantum_teleportation_demo(self, state_to_teleport=None, draw_only=False, deferred=True, shots=1024,
+                                   method=None):
+        """量子隐形传态电路 (Internal Logic)
+
+        两种变体共用同一构建逻辑:
+        - deferred=False: Alice 中途测量 q0/q1，Bob 用 if_test 根据经典比特做 X/Z 修正 (动态电路，
+          Aer 必须逐次模拟每个 shot);
+        - deferred=True: 延迟测量原理，用受控 X (q1→q2) 和受控 Z (q0→q2) 代替经典修正，
+          所有测量都在末尾，Aer 可从单个状态向量采样，统计结果相同。
+
+        state_to_teleport: None 表示 |+>，否则为 Alice 量子比特的两个复振幅 [a, b]。
+        draw_only=True 时返回电路，否则返回计数 (c2 c1 c0)。
+        method: 强制使用的模拟方法 (见 run_batch)，None 表示由规划器选择。
+        """
+        qc = QuantumCircuit(3, 3, name="Teleportation (deferred)" if deferred else "Teleportation")
+
+        # 1. Prepare Alice's state |ψ> on q0 (|+> by default)
+        if state_to_teleport is None:
+            qc.h(0)
+        else:
+            # a|0> + b|1> up to global phase = P(φ)·RY(θ)|0>, with θ = 2·acos|a|, φ = arg b - arg a
+            a, b = np.asarray(state_to_teleport, dtype=complex) / np.linalg.norm(state_to_teleport)
+            qc.ry(2 * np.arccos(min(abs(a), 1.0)), 0)
+            qc.p(float(np.angle(b) - np.angle(a)), 0)
+        qc.barrier() # Visually separate steps
+
+        # 2. Create Bell pair between q1 (Alice) and q2 (Bob)
+        qc.h(1)
+        qc.cx(1, 2)
+        qc.barrier()
+
+        # 3. Alice performs Bell measurement on her qubits (q0, q1)
+        qc.cx(0, 1)
+        qc.h(0)
+        qc.barrier()
+
+        if deferred:
+            # 4'. Corrections as quantum-controlled gates (deferred measurement principle)
+            qc.cx(1, 2)
+            qc.cz(0, 2)
+            qc.barrier()
+            # 5'. Measure everything at the end: q0 -> c0, q1 -> c1, q2 -> c2
+            qc.measure([0, 1, 2], [0, 1, 2])
+        else:
+            # 4. Alice measures q0 and q1 into classical bits c0 and c1
+            qc.measure([0, 1], [0, 1]) # Measure q0 to c0, q1 to c1
+            qc.barrier()
+
+            # 5. Bob applies corrections to q2 based on Alice's classical bits (c0, c1)
+            creg = qc.cregs[0]
+            # Apply X gate to q2 if c1 (creg[1]) is 1
+            with qc.if_test((creg[1], 1)):
+                qc.x(2)
+            # Apply Z gate to q2 if c0 (creg[0]) is 1
+            with qc.if_test((creg[0], 1)):
+                qc.z(2)
+            qc.barrier()
+
+            # 6. Measure Bob's qubit (q2) to see the teleported state
+            qc.measure(2, 2) # Measure q2 into classical bit c2
+
+        if draw_only:
+            return qc
+        return self._run_counts(qc, shots, method=method)
 
     def create_coin_circuit(self):
         """
@@ -156,63 +627,55 @@ class QuantumGames:
     # ---------- Game Flows (Refactored for GUI) ----------
 
     # --- Coin Game --- 
-    def run_coin_game(self):
+    def run_coin_game(self, shots=1000):
         """Entry point for the GUI to start the coin game."""
         if not self.gui_output:
             return
         self.gui_output("--- 量子猜硬币游戏 ---\n")
-        self.gui_output("我们将抛掷1000次量子硬币 (Hadamard门+测量)，统计0/1出现次数。\n")
-        from qiskit import transpile
-        from qiskit.visualization import plot_histogram
+        self.gui_output(f"我们将抛掷{shots}次量子硬币 (Hadamard门+测量)，统计0/1出现次数。\n")
         qc = self.create_coin_circuit()
-        compiled_circuit = transpile(qc, self.simulator)
-        job = self.simulator.run(compiled_circuit, shots=1000)
-        counts = job.result().get_counts(compiled_circuit)
+        counts = self._run_counts(qc, shots=shots)
+        self._record(shots=shots, counts=counts)
         count_0 = counts.get('0', 0)
         count_1 = counts.get('1', 0)
         self.gui_output(f"实验统计结果：\n  0（正面）：{count_0} 次\n  1（反面）：{count_1} 次\n")
-        from matplotlib.figure import Figure
         figs = []
         if self.gui_display_plots:
             # 直方图
-            hist_fig = plot_histogram(counts, title='1000次量子硬币实验结果分布')
+            hist_fig = self._plot_counts(counts, title=f'{shots}次量子硬币实验结果分布')
             figs.append(hist_fig)
             # 电路图
-            fig_circuit = Figure(figsize=(4,2))
-            ax = fig_circuit.add_subplot(111)
-            qc.draw(output='mpl', ax=ax)
-            ax.set_title('量子猜硬币实验电路')
-            figs.append(fig_circuit)
+            figs.append(self._draw_circuit(qc, style=None, title='量子猜硬币实验电路'))
             self.gui_display_plots(figs)
         self.gui_output("--------------------\n")
         self.end_game()
 
     # --- Entanglement Game --- 
-    def run_entanglement_game(self):
-        """Entry point for GUI - Demonstrates Bell state entanglement."""
+    def run_entanglement_game(self, shots=100, num_qubits=2):
+        """Entry point for GUI - Demonstrates Bell state entanglement.
+
+        num_qubits > 2 prepares an N-qubit GHZ state instead; being a Clifford circuit it
+        runs on the stabilizer method even for thousands of qubits, and its timing is
+        reported next to the statevector method where that is still feasible.
+        """
         self.gui_output("--- 量子纠缠演示 ---\n")
-        self.gui_output("创建一个纠缠贝尔对 (|00> + |11>)/sqrt(2)。\n")
-        self.gui_output("测量两个量子比特会显示出相关性：它们总是相同的 (00 或 11)。\n")
+        if num_qubits == 2:
+            self.gui_output("创建一个纠缠贝尔对 (|00> + |11>)/sqrt(2)。\n")
+            self.gui_output("测量两个量子比特会显示出相关性：它们总是相同的 (00 或 11)。\n")
+        else:
+            self.gui_output(f"创建 {num_qubits} 量子比特 GHZ 态 (|0...0> + |1...1>)/sqrt(2)。\n")
+            self.gui_output("测量所有量子比特会显示出相关性：它们总是全部相同 (全 0 或全 1)。\n")
         
         try:
-            # Create a 2-qubit quantum circuit
-            qc = QuantumCircuit(2, 2) # 2 qubits, 2 classical bits
+            # Bell state |Φ+>: H on qubit 0, then a CNOT chain (GHZ for num_qubits > 2)
+            qc = self.create_ghz_circuit(num_qubits)
             
-            # Create Bell state |Φ+>
-            qc.h(0)    # Apply Hadamard gate to qubit 0
-            qc.cx(0, 1) # Apply CNOT gate with control qubit 0 and target qubit 1
-            
-            # Measure both qubits
-            qc.measure([0, 1], [0, 1])
-            
-            self.gui_output("\n贝尔态 |Φ+> 的量子电路已创建。\n")
-            # Plot circuit diagram using GUI callback
-            if self.gui_display_plots:
+            self.gui_output(f"\n{'贝尔态 |Φ+>' if num_qubits == 2 else 'GHZ 态'} 的量子电路已创建。\n")
+            # Circuit diagram, shown together with the result histogram below
+            figures_to_display = []
+            if self.gui_display_plots and num_qubits <= 8:
                 try:
-                    circuit_fig = qc.draw('mpl', style='iqx')
-                    figures_to_display = [circuit_fig]
-                    self.gui_display_plots(figures_to_display)
-                    self.gui_output("电路图已在 GUI 区域绘制。\n")
+                    figures_to_display.append(self._draw_circuit(qc))
                 except ImportError:
                     self.gui_output("绘制电路图需要 'pylatexenc' 包。请运行 'pip install pylatexenc'。\n")
                 except Exception as plot_error:
@@ -223,21 +686,63 @@ class QuantumGames:
             # Optional: Save circuit image
             # self.save_circuit_image(qc, "entanglement_circuit.png")
 
-            self.gui_output("模拟电路运行 100 次...\n")
-            # Execute the circuit on the qasm simulator
-            job = self.simulator.run(qc, shots=100)
-            result = job.result()
-            counts = result.get_counts(qc)
+            plan = self.plan_simulation(qc, shots)
+            self.gui_output(f"模拟电路运行 {shots} 次 ({planner.METHOD_NAMES[plan.method]})...\n")
+            memo_hits = self.result_memo.hits
+            start_time = time.perf_counter()
+            counts = self._run_counts(qc, shots=shots)
+            elapsed = time.perf_counter() - start_time
             
             self.gui_output("\n测量结果:\n")
-            # Nicely format counts dictionary
+            # Nicely format counts dictionary (long GHZ bitstrings are abbreviated)
             for state, count in sorted(counts.items()):
-                self.gui_output(f"  状态 |{state}>: {count} 次\n")
+                label = state if len(state) <= 16 else f"{state[:4]}...{state[-4:]} ({state.count('1')} 个 1)"
+                self.gui_output(f"  状态 |{label}>: {count} 次\n")
             
-            self.gui_output("\n注意结果只包含 '00' 或 '11'，显示了完美的关联性。\n")
+            correlated = all(len(set(state)) == 1 for state in counts)
+            if num_qubits == 2:
+                self.gui_output("\n注意结果只包含 '00' 或 '11'，显示了完美的关联性。\n")
+            else:
+                self.gui_output(f"\n{'所有结果都是全 0 或全 1' if correlated else '出现了不全相同的结果!'}，"
+                                f"{num_qubits} 个量子比特完全关联。\n")
+
+            if self.gui_display_plots:
+                try:
+                    mode = self.histogram_mode
+                    if mode == 'auto' and num_qubits > 16:
+                        # Full-width GHZ labels are unreadable; the lowest clbits show the same correlation
+                        mode = 'marginal'
+                    figures_to_display.append(self._plot_counts(
+                        counts, title='测量结果分布' + (' (边缘分布)' if mode == 'marginal' else ''), mode=mode))
+                    self.gui_display_plots(figures_to_display)
+                    self.gui_output("\n电路图和结果直方图已在 GUI 区域绘制。\n" if len(figures_to_display) > 1
+                                    else "\n结果直方图已在 GUI 区域绘制。\n")
+                except Exception as plot_error:
+                    self.gui_output(f"绘制直方图时出错: {plot_error}\n")
+
+            # Same circuit under the stabilizer and statevector methods, for comparison
+            timings, memo_note = self._simulation_timing(plan.method, elapsed, memo_hits)
+            # A repeated click gets the timings measured last time from result_memo
+            comparison_hits = self.result_memo.hits
+            comparison = self.compare_methods(qc, shots)
+            comparison_label = "各方法对比 (已转译" + ("，上次测得):\n" if self.result_memo.hits > comparison_hits else "):\n")
+            if memo_note:
+                self.gui_output(f"\n本次结果来自备忘录，未重新模拟 ({elapsed * 1000:.1f} ms)，{comparison_label}")
+            else:
+                self.gui_output(f"\n模拟耗时 (本次使用 {planner.METHOD_NAMES[plan.method]}，含首次转译: {elapsed * 1000:.1f} ms)，"
+                                + comparison_label)
+            for method, timing in comparison.items():
+                if isinstance(timing, str):
+                    self.gui_output(f"  {planner.METHOD_NAMES[method]}: {timing}\n")
+                else:
+                    self.gui_output(f"  {planner.METHOD_NAMES[method]}: {timing:.1f} ms\n")
+                    timings.setdefault(method, timing)
+            self._record(shots=shots, num_qubits=num_qubits, method=plan.method, counts=counts,
+                         correlated=correlated, timings_ms=timings)
             
         except Exception as e:
             self.gui_output(f"\n纠缠演示过程中出错: {e}\n")
+            self._record(error=str(e))
             
         # TODO: Refactor this game flow using gui_output and request_input
         # Possible extension: Measure only one qubit, ask user to predict the other.
@@ -247,7 +752,7 @@ class QuantumGames:
         self.end_game()
 
     # --- Interference Game --- 
-    def run_interference_game(self):
+    def run_interference_game(self, shots=1024):
         """Entry point for GUI - Demonstrates Quantum Interference (Mach-Zehnder)."""
         self.gui_output("--- 量子干涉演示 ---\n")
         self.gui_output("比较两个单量子比特电路:\n")
@@ -255,7 +760,6 @@ class QuantumGames:
         self.gui_output("2. H门, Z门, H门后测量 (HZH): 展示干涉现象。\n")
         self.gui_output("   理想情况下，HZH 作用于 |0> 等效于 X 门, 结果应为 100% '1'。\n")
         
-        shots = 1024
         figures_to_display = [] # Initialize list to collect figures
         try:
             # Circuit 1: H-Measure
@@ -265,7 +769,7 @@ class QuantumGames:
             self.gui_output("\n电路 H 已创建.")
             # Try plotting circuit H
             try:
-                circuit_fig_h = qc_h.draw('mpl', style='iqx')
+                circuit_fig_h = self._draw_circuit(qc_h)
                 figures_to_display.append(circuit_fig_h)
                 self.gui_output("电路 H 图已生成.")
             except ImportError:
@@ -273,18 +777,6 @@ class QuantumGames:
             except Exception as plot_error:
                  self.gui_output(f"绘制电路 H 图时出错: {plot_error}\n")
 
-            job_h = self.simulator.run(qc_h, shots=shots)
-            result_h = job_h.result()
-            counts_h = result_h.get_counts(qc_h)
-            self.gui_output(f"结果 (H): {counts_h}\n")
-            # Generate histogram for H circuit
-            try:
-                hist_h_fig = plot_histogram(counts_h, title='电路 H 的结果')
-                figures_to_display.append(hist_h_fig) # Append figure
-                self.gui_output("直方图 H 已生成.")
-            except Exception as plot_error:
-                self.gui_output(f"绘制直方图 H 时出错: {plot_error}\n")
-            
             # Circuit 2: H-Z-H-Measure
             qc_hzh = QuantumCircuit(1, 1)
             qc_hzh.h(0)
@@ -294,7 +786,7 @@ class QuantumGames:
             self.gui_output("\n电路 HZH 已创建.")
             # Try plotting circuit HZH
             try:
-                circuit_fig_hzh = qc_hzh.draw('mpl', style='iqx')
+                circuit_fig_hzh = self._draw_circuit(qc_hzh)
                 figures_to_display.append(circuit_fig_hzh)
                 self.gui_output("电路 HZH 图已生成.")
             except ImportError:
@@ -302,13 +794,22 @@ class QuantumGames:
             except Exception as plot_error:
                  self.gui_output(f"绘制电路 HZH 图时出错: {plot_error}\n")
             
-            job_hzh = self.simulator.run(qc_hzh, shots=shots)
-            result_hzh = job_hzh.result()
-            counts_hzh = result_hzh.get_counts(qc_hzh)
+            # Both circuits go to the simulator in a single submission
+            counts_h, counts_hzh = self.run_batch([qc_h, qc_hzh], shots)
+            self._record(shots=shots, counts={'H': counts_h, 'HZH': counts_hzh})
+            self.gui_output(f"\n结果 (H): {counts_h}\n")
+            # Generate histogram for H circuit
+            try:
+                hist_h_fig = self._plot_counts(counts_h, title='电路 H 的结果')
+                figures_to_display.append(hist_h_fig) # Append figure
+                self.gui_output("直方图 H 已生成.")
+            except Exception as plot_error:
+                self.gui_output(f"绘制直方图 H 时出错: {plot_error}\n")
+
             self.gui_output(f"结果 (HZH): {counts_hzh}\n")
             # Generate histogram for HZH circuit
             try:
-                hist_hzh_fig = plot_histogram(counts_hzh, title='电路 HZH 的结果')
+                hist_hzh_fig = self._plot_counts(counts_hzh, title='电路 HZH 的结果')
                 figures_to_display.append(hist_hzh_fig) # Append figure
                 self.gui_output("直方图 HZH 已生成.")
             except Exception as plot_error:
@@ -325,6 +826,7 @@ class QuantumGames:
             
         except Exception as e:
             self.gui_output(f"\n干涉演示过程中出错: {e}\n")
+            self._record(error=str(e))
             
         # TODO: Refactor this game flow
         # Example: Ask user which circuit type, display results/histogram
@@ -333,61 +835,89 @@ class QuantumGames:
         self.gui_output("--------------------\n")
         self.end_game()
 
+    def run_phase_sweep_demo(self, num_points=181, shots=1024):
+        """Mach-Zehnder phase sweep: H, P(φ), H over ``num_points`` phases in [0, 2π], plotted as a fringe."""
+        self.gui_output("--- 干涉条纹: 相位扫描 ---\n")
+        self.gui_output("电路: H 门, 相位门 P(φ), H 门, 测量。理论上 P(1) = sin²(φ/2)。\n")
+        self.gui_output(f"φ 在 [0, 2π] 内取 {num_points} 个值，每个值测量 {shots} 次。\n")
+
+        figures_to_display = []
+        try:
+            if num_points < 2:
+                raise ValueError("相位扫描至少需要 2 个点。")
+            phases = interference.sweep_phases(num_points)
+            # One parameterized circuit: drawn once, transpiled once, all bindings in one job
+            try:
+                figures_to_display.append(self._draw_circuit(self.templates.get('phase_sweep').circuit))
+            except ImportError:
+                self.gui_output("绘制电路图需要 'pylatexenc' 包。\n")
+            except Exception as plot_error:
+                self.gui_output(f"绘制电路图时出错: {plot_error}\n")
+            memo_hits = self.result_memo.hits
+            start_time = time.perf_counter()
+            probabilities = self.run_phase_sweep(phases, shots)
+            elapsed = time.perf_counter() - start_time
+            timings, memo_note = self._simulation_timing('simulate', elapsed, memo_hits)
+
+            deviation = float(np.max(np.abs(probabilities - interference.theoretical_probabilities(phases))))
+            fringe_visibility = interference.visibility(probabilities)
+            self.gui_output(f"\n模拟完成: 1 个参数化电路, {num_points} 组参数绑定, 1 次提交, 耗时 {elapsed * 1000:.1f} ms{memo_note}。\n")
+            self.gui_output(f"条纹可见度 (max-min)/(max+min): {fringe_visibility:.3f} (理想值 1)\n")
+            self.gui_output(f"与理论 sin²(φ/2) 的最大偏差: {deviation:.3f} "
+                            f"(统计误差量级 1/(2·sqrt(shots)) ≈ {0.5 / math.sqrt(shots):.3f})\n")
+            for label, phase in (("0", 0.0), ("π/2", math.pi / 2), ("π", math.pi)):
+                index = int(np.argmin(np.abs(phases - phase)))
+                self.gui_output(f"  φ ≈ {label}: P(1) = {probabilities[index]:.3f}\n")
+            self._record(num_points=num_points, shots=shots, phases=phases, probabilities=probabilities,
+                         visibility=fringe_visibility, max_deviation=deviation, timings_ms=timings)
+
+            try:
+                with self.profiler.span('plot_fringe'):
+                    figures_to_display.append(interference.fringe_figure(phases, probabilities, shots,
+                                                                         title="Mach-Zehnder 干涉条纹"))
+            except Exception as plot_error:
+                self.gui_output(f"绘制干涉条纹时出错: {plot_error}\n")
+
+            if self.gui_display_plots and figures_to_display:
+                self.gui_display_plots(figures_to_display)
+                self.gui_output("\n图表已在 GUI 区域绘制。\n")
+
+        except Exception as e:
+            self.gui_output(f"\n相位扫描过程中出错: {e}\n")
+            self._record(error=str(e))
+
+        self.gui_output("--------------------\n")
+        self.end_game()
+
     # --- Teleportation Game --- 
-    def run_teleportation_game(self):
-        """Entry point for GUI - Demonstrates Quantum Teleportation."""
+    def run_teleportation_game(self, deferred=True, shots=1024):
+        """Entry point for GUI - Demonstrates Quantum Teleportation.
+
+        deferred=True runs the deferred-measurement variant (controlled X/Z corrections,
+        terminal measurements, sampled from one statevector); deferred=False runs the
+        dynamic-circuit variant with mid-circuit measurements and if_test corrections.
+        """
         self.gui_output("--- 量子隐形传态演示 ---\n")
         self.gui_output("将量子态 |+> = (|0> + |1>)/sqrt(2) 从 Alice (q0) 传输到 Bob (q2)。\n")
         self.gui_output("使用一个纠缠对 (q1, q2) 和 2 个经典比特进行通信。\n")
 
         try:
-            # Create a 3-qubit, 3-classical bit circuit
-            qc = QuantumCircuit(3, 3)
-            
-            # 1. Prepare Alice's state |ψ> on q0 (let's use |+>)
-            qc.h(0)
-            qc.barrier() # Visually separate steps
-            
-            # 2. Create Bell pair between q1 (Alice) and q2 (Bob)
-            qc.h(1)
-            qc.cx(1, 2)
-            qc.barrier()
-            
-            # 3. Alice performs Bell measurement on her qubits (q0, q1)
-            qc.cx(0, 1)
-            qc.h(0)
-            qc.barrier()
-            
-            # 4. Alice measures q0 and q1 into classical bits c0 and c1
-            qc.measure([0, 1], [0, 1]) # Measure q0 to c0, q1 to c1
-            qc.barrier()
-            
-            # 5. Bob applies corrections to q2 based on Alice's classical bits (c0, c1)
-            # Get the classical register (assuming only one is named 'c' or is the default)
-            creg = qc.cregs[0]
-            
-            # Apply X gate to q2 if c1 (creg[1]) is 1
-            with qc.if_test((creg[1], 1)):
-                qc.x(2)
-                
-            # Apply Z gate to q2 if c0 (creg[0]) is 1
-            with qc.if_test((creg[0], 1)):
-                qc.z(2)
-                
-            qc.barrier()
-
-            # 6. Measure Bob's qubit (q2) to see the teleported state
-            # Note: For a |+> input state, the output should ideally be |+> again.
-            qc.measure(2, 2) # Measure q2 into classical bit c2
-            
+            qc = self.quantum_teleportation_demo(draw_only=True, deferred=deferred)
+            if deferred:
+                self.gui_output("\n使用延迟测量版本: 以受控 X / 受控 Z 门代替基于经典比特的修正, 所有测量移到末尾。\n")
+                self.gui_output("统计结果与中途测量版本相同, 但模拟器只需计算一次状态向量即可采样所有 shot。\n")
+            else:
+                self.gui_output("\n使用动态电路版本: Alice 中途测量, Bob 根据经典比特 (if_test) 做修正。\n")
             self.gui_output("\n量子隐形传态电路已创建。\n")
 
-            shots = 1024
             self.gui_output(f"模拟电路运行 {shots} 次...\n")
             # Execute the circuit
-            job = self.simulator.run(qc, shots=shots)
-            result = job.result()
-            counts = result.get_counts(qc)
+            memo_hits = self.result_memo.hits
+            start_time = time.perf_counter()
+            counts = self.quantum_teleportation_demo(deferred=deferred, shots=shots)
+            elapsed = time.perf_counter() - start_time
+            timings, memo_note = self._simulation_timing('simulate', elapsed, memo_hits)
+            self.gui_output(f"模拟耗时: {elapsed * 1000:.1f} ms{memo_note}\n")
             
             self.gui_output("\n完整测量结果 (c2 c1 c0):\n")
             # Display raw counts (c2 is the leftmost bit)
@@ -404,20 +934,22 @@ class QuantumGames:
             self.gui_output(f"  状态 |0>: {bob_counts.get('0', 0)} 次\n")
             self.gui_output(f"  状态 |1>: {bob_counts.get('1', 0)} 次\n")
             self.gui_output("由于原始状态是 |+>, 我们期望 Bob 的量子比特测量结果中 0 和 1 大约各占 50%。\n")
+            self._record(shots=shots, deferred=deferred, counts=counts, bob_counts=bob_counts, timings_ms=timings)
 
             # Plot Bob's qubit results using GUI callback
             if self.gui_display_plots:
                 try:
                     # Use bob_counts for the histogram
-                    hist_bob_fig = plot_histogram(bob_counts, title='Bob 量子比特 (q2) 的测量结果')
-                    figures_to_display = [hist_bob_fig]
+                    hist_bob_fig = self._plot_counts(bob_counts, title='Bob 量子比特 (q2) 的测量结果')
+                    figures_to_display = [self._draw_circuit(qc), hist_bob_fig]
                     self.gui_display_plots(figures_to_display)
-                    self.gui_output("\nBob 量子比特的直方图已在 GUI 区域绘制。\n")
+                    self.gui_output("\n隐形传态电路和 Bob 量子比特的直方图已在 GUI 区域绘制。\n")
                 except Exception as plot_error:
                     self.gui_output(f"绘制 Bob 量子比特直方图时出错: {plot_error}\n")
 
         except Exception as e:
             self.gui_output(f"\n隐形传态演示过程中出错: {e}\n")
+            self._record(error=str(e))
             
         # TODO: Refactor this game flow
         # self.gui_output("This game is not yet fully adapted for GUI.\n")
@@ -425,39 +957,58 @@ class QuantumGames:
         self.end_game()
         
     # --- Superposition Demo ---
-    def run_superposition_demo(self, num_qubits=2):
-        """Demonstrates superposition for multiple qubits with GUI output and plots."""
+    def run_superposition_demo(self, num_qubits=2, shots=1024, amplitude_page=0):
+        """Demonstrates superposition for multiple qubits with GUI output and plots.
+
+        ``amplitude_page`` (0-based) is the statevector page listed first; step_amplitude_page
+        pages on from there.
+        """
         if not self.gui_output or not self.gui_display_plots:
             self.gui_output("错误: GUI 回调函数未设置!")
             return
         self.gui_output("--- 量子叠加态演示 ---\n")
         try:
+            max_qubits = self.max_statevector_qubits()
+            if num_qubits > max_qubits:
+                self.gui_output(f"{num_qubits} 个量子比特的状态向量约需 "
+                                f"{planner.format_bytes(planner.statevector_bytes(num_qubits, 3))} 内存，"
+                                f"超出预算 {planner.format_bytes(self.memory_budget)}；已降为 {max_qubits} 个量子比特。\n")
+                num_qubits = max_qubits
             self.gui_output(f"为 {num_qubits} 个量子比特创建叠加态 (应用H门)...\n")
-            qc, counts, statevector = self.create_superposition(num_qubits=num_qubits, shots=1024)
-            
-            self.gui_output(f"\n模拟运行 {1024} 次的测量结果:\n") # Use actual shots number if needed
-
-            # Nicely format counts dictionary
-            for state, count in sorted(counts.items()):
-                self.gui_output(f"  状态 |{state}>: {count} 次\n")
+            start_time = time.perf_counter()
+            qc, counts, statevector = self.create_superposition(num_qubits=num_qubits, shots=shots)
+            elapsed = time.perf_counter() - start_time
+            self._record(num_qubits=num_qubits, shots=shots, counts=counts, statevector=statevector,
+                         statevector_summary=amplitudes.summary_dict(statevector),
+                         timings_ms={'simulate': elapsed * 1000})
+
+            self.gui_output(f"\n模拟运行 {shots} 次的测量结果:\n")
+
+            # Nicely format counts dictionary (most frequent outcomes only when there are many)
+            if len(counts) <= self.histogram_max_bars:
+                shown_counts = sorted(counts.items())
+            else:
+                shown_counts = histograms.top_k_counts(counts, self.histogram_max_bars - 1).items()
+            for state, count in shown_counts:
+                label = f"|{state}>" if state in counts else state # "其他" bucket has no ket
+                self.gui_output(f"  状态 {label}: {count} 次\n")
             
-            self.gui_output("\n理论状态向量 (部分):\n")
-            # Display statevector nicely (can be long)
-            max_display = 2**num_qubits if 2**num_qubits <= 8 else 8 # Limit display
-            for i, amp in enumerate(statevector):
-                if i >= max_display:
-                    self.gui_output(f"  ... (仅显示前 {max_display} 个分量)\n")
-                    break
-                basis_state = format(i, f'0{num_qubits}b')
-                self.gui_output(f"  |{basis_state}>: {amp:.3f}\n")
-            # Add a pass statement here just in case it helps parser with line 268 error
-            pass 
+            # Summaries are vectorized; only the visible page is formatted entry by entry
+            self.set_amplitude_statevector(statevector)
+            if 2 ** num_qubits <= 8:
+                self.gui_output("\n理论状态向量:\n")
+                self.show_amplitude_page(0, page_size=8)
+            else:
+                self.gui_output("\n理论状态向量摘要:\n")
+                self.gui_output(''.join(amplitudes.summary_lines(statevector, k=8)))
+                self.gui_output("\n")
+                self.show_amplitude_page(amplitude_page)
                 
             # Show plots? Now use the callback if available.
             if self.gui_display_plots:
                 try:
                     # Generate histogram figure
-                    hist_fig = plot_histogram(counts)
+                    hist_fig = self._plot_counts(counts)
                     # Send figure to GUI for display (this will replace the circuit diagram)
                     figures_to_display = [hist_fig]
                     self.gui_display_plots(figures_to_display)
@@ -478,93 +1029,130 @@ class QuantumGames:
                 
         except Exception as e:
             self.gui_output(f"\n叠加态演示过程中出错: {e}\n")
+            self._record(error=str(e))
             
         self.gui_output("--------------------\n")
         self.end_game()
         
+    def set_amplitude_statevector(self, statevector):
+        """Make ``statevector`` the one show_amplitude_page / step_amplitude_page browse (page 1)."""
+        self.current_game_state.update(statevector=statevector, amplitude_page=0, amplitude_decimals=None)
+
+    def show_amplitude_page(self, page_number=0, page_size=16):
+        """Print one page of the last superposition statevector (see run_superposition_demo)."""
+        statevector = self.current_game_state.get('statevector')
+        if statevector is None:
+            self.gui_output("还没有可浏览的状态向量，请先运行叠加态演示。\n")
+            return
+        # One O(2^n) pass for the rounding, shared by every page of this vector
+        decimals = self.current_game_state.get('amplitude_decimals')
+        if decimals is None:
+            decimals = self.current_game_state['amplitude_decimals'] = amplitudes.display_decimals(statevector)
+        total_pages = amplitudes.num_pages(statevector, page_size)
+        rows = amplitudes.page(statevector, page_number, page_size, decimals=decimals)
+        if not rows:
+            self.gui_output(f"页码 {page_number + 1} 超出范围 (共 {total_pages} 页)。\n")
+            return
+        self.current_game_state.update(amplitude_page=page_number, amplitude_page_size=page_size)
+        if total_pages > 1:
+            self.gui_output(f"第 {page_number + 1} / {total_pages} 页:\n")
+        self.gui_output(''.join(f"  |{label}>: {text}\n" for label, text in rows))
+
+    def step_amplitude_page(self, delta):
+        """Show the page ``delta`` pages after the current one, clamped to the first / last page."""
+        statevector = self.current_game_state.get('statevector')
+        page_size = self.current_game_state.get('amplitude_page_size', 16)
+        if statevector is None:
+            self.show_amplitude_page(0, page_size)
+            return
+        last_page = amplitudes.num_pages(statevector, page_size) - 1
+        current = self.current_game_state.get('amplitude_page', 0)
+        self.show_amplitude_page(min(max(current + delta, 0), last_page), page_size)
+
     # --- Deutsch-Jozsa Demo --- NEW
-    def run_deutsch_jozsa_demo(self):
+    def run_deutsch_jozsa_demo(self, n=2, num_random_oracles=8, shots=100, seed=None):
         """Demonstrates the Deutsch-Jozsa algorithm.
 
         Distinguishes between a constant function (f(x) = c for all x)
         and a balanced function (f(x) = 0 for half of inputs, 1 for the other half)
         with a single query to the oracle.
+
+        After the step-by-step XOR example, ``num_random_oracles`` random constant /
+        balanced oracles are evaluated together in ONE simulator submission. They are drawn
+        with ``seed`` (default: sampling_seed), so re-running gives the same oracles.
         """
         self.gui_output("--- Deutsch-Jozsa 算法演示 ---\n")
         self.gui_output("目标: 判断一个未知函数 f(x) 是常数函数还是平衡函数。\n")
         self.gui_output("方法: 使用量子预言机（Oracle）查询一次即可区分。\n")
         
-        n = 2 # Number of input qubits for the function f:{0,1}^n -> {0,1}
         self.gui_output(f"示例: n = {n} 个输入比特。\n")
-
-        # Create the circuit with n input qubits + 1 output qubit + n classical bits
-        dj_circuit = QuantumCircuit(n + 1, n)
         figures_to_display = []
 
         try:
-            # Step 1: Initialize output qubit to |->
+            # Example oracle: balanced f(x) = x_{n-1} XOR ... XOR x_0 (CNOT from every input)
+            xor_oracle = deutsch_jozsa.balanced_oracle(n, 2**n - 1)
             self.gui_output("步骤 1: 将输出量子比特初始化为 |-> 状态 (应用 X 和 H 门)。\n")
-            dj_circuit.x(n) # Apply X gate to the last qubit (index n)
-            dj_circuit.h(n) # Apply H gate to the last qubit
-
-            # Step 2: Apply Hadamard to all input qubits
             self.gui_output(f"步骤 2: 对所有 {n} 个输入量子比特应用 Hadamard (H) 门。\n")
-            for i in range(n):
-                dj_circuit.h(i)
-            dj_circuit.barrier() # Separator for clarity
-
-            # Step 3: Define and Apply the Oracle U_f
-            # Example: Balanced oracle f(x_1, x_0) = x_1 XOR x_0
-            # Implemented using CNOTs targeting the output qubit
-            self.gui_output("步骤 3: 应用代表平衡函数 f(x1, x0) = x1 XOR x0 的预言机。\n")
+            self.gui_output(f"步骤 3: 应用代表平衡函数 {xor_oracle.metadata['label']} 的预言机。\n")
             self.gui_output("        (通过 CNOT 门实现)\n")
-            for i in range(n):
-                dj_circuit.cx(i, n) # CNOT from input qubit i to output qubit n
-            dj_circuit.barrier()
-
-            # Step 4: Apply Hadamard to input qubits again
             self.gui_output(f"步骤 4: 再次对所有 {n} 个输入量子比特应用 Hadamard 门。\n")
-            for i in range(n):
-                dj_circuit.h(i)
-            dj_circuit.barrier()
-
-            # Step 5: Measure the input qubits
             self.gui_output(f"步骤 5: 测量前 {n} 个输入量子比特。\n")
-            dj_circuit.measure_all()
+            dj_circuit = deutsch_jozsa.build_dj_circuit(n, xor_oracle)
 
             # --- Simulation and Results ---
             self.gui_output("\n电路构建完成，准备模拟...\n")
             # Draw the circuit
-            try:
-                circuit_fig = dj_circuit.draw('mpl', style='iqx')
-                figures_to_display.append(circuit_fig)
-                self.gui_output("电路图已生成。\n")
-            except ImportError:
-                self.gui_output("绘制电路图需要 'pylatexenc' 包。\n")
-            except Exception as plot_error:
-                self.gui_output(f"绘制电路图时出错: {plot_error}\n")
+            if n <= 6:
+                try:
+                    circuit_fig = self._draw_circuit(dj_circuit)
+                    figures_to_display.append(circuit_fig)
+                    self.gui_output("电路图已生成。\n")
+                except ImportError:
+                    self.gui_output("绘制电路图需要 'pylatexenc' 包。\n")
+                except Exception as plot_error:
+                    self.gui_output(f"绘制电路图时出错: {plot_error}\n")
 
-            # Simulate
-            shots = 100 # Only need a few shots, ideally 1 is enough theoretically
-            job = self.simulator.run(dj_circuit, shots=shots)
-            result = job.result()
-            counts = result.get_counts(dj_circuit)
-            self.gui_output(f"模拟结果 (测量前 {n} 个比特): {counts}\n")
+            # --- Batch: the example plus random oracles, all in one job ---
+            oracles = [xor_oracle] + deutsch_jozsa.random_oracles(n, num_random_oracles, self.sampling_seed if seed is None else seed)
+            circuits = [deutsch_jozsa.build_dj_circuit(n, oracle) for oracle in oracles]
+            self.gui_output(f"将 {len(circuits)} 个预言机电路合并为一次模拟提交 (每个 {shots} 次)...\n")
+            memo_hits = self.result_memo.hits
+            start_time = time.perf_counter()
+            all_counts = self.run_batch(circuits, shots)
+            elapsed = time.perf_counter() - start_time
+            timings, memo_note = self._simulation_timing('simulate_batch', elapsed, memo_hits)
+
+            counts = all_counts[0]
+            self.gui_output(f"示例预言机的模拟结果 (测量前 {n} 个比特): {counts}\n")
 
             # Interpretation
             # For Deutsch-Jozsa, if the result is |00...0>, the function is constant.
             # If the result is anything else, the function is balanced.
-            all_zeros = '0' * n
-            if all_zeros in counts and len(counts) == 1: # Check if only the all-zero state is measured
+            if deutsch_jozsa.classify_counts(counts, n) == 'constant':
                  self.gui_output("解释: 测量结果全部为 '0...0'，表明函数是常数函数。\n")
+            elif counts.get('0' * n, 0) == 0:
+                 self.gui_output("解释: 测量结果不是 '0...0'，表明函数是平衡函数。\n")
             else:
-                 # Check if the all-zero state is absent or has zero probability
-                 measurement_keys = counts.keys()
-                 if all_zeros not in measurement_keys or counts.get(all_zeros, 0) == 0:
-                     self.gui_output("解释: 测量结果不是 '0...0'，表明函数是平衡函数。\n")
-                 else:
-                     # This case (mixing 0s and non-0s) shouldn't happen for a valid DJ oracle/circuit
-                     self.gui_output("解释: 测量结果包含 '0...0' 和其他状态，这不符合Deutsch-Jozsa算法的预期。可能预言机或电路有问题。\n")
+                 # This case (mixing 0s and non-0s) shouldn't happen for a valid DJ oracle/circuit
+                 self.gui_output("解释: 测量结果包含 '0...0' 和其他状态，这不符合Deutsch-Jozsa算法的预期。可能预言机或电路有问题。\n")
+
+            # Summary table of all classifications
+            kind_names = {'constant': '常数', 'balanced': '平衡'}
+            self.gui_output(f"\n批量判定结果 ({len(oracles)} 个预言机, 一次提交耗时 {elapsed * 1000:.1f} ms{memo_note}):\n")
+            self.gui_output(f"  {'#':>3}  {'实际':<4} {'判定':<4} {'正确':<4} 预言机\n")
+            num_correct = 0
+            for index, (oracle, oracle_counts) in enumerate(zip(oracles, all_counts)):
+                predicted = deutsch_jozsa.classify_counts(oracle_counts, n)
+                correct = predicted == oracle.metadata['kind']
+                num_correct += correct
+                self.gui_output(f"  {index:>3}  {kind_names[oracle.metadata['kind']]:<4} {kind_names[predicted]:<4} "
+                                f"{'✓' if correct else '✗':<4} {oracle.metadata['label']}\n")
+            self.gui_output(f"  正确率: {num_correct}/{len(oracles)} (每个预言机只需查询一次)\n")
+            self._record(n=n, shots=shots, counts=counts, num_correct=num_correct,
+                         oracles=[{'kind': oracle.metadata['kind'], 'label': oracle.metadata['label'],
+                                   'predicted': deutsch_jozsa.classify_counts(oracle_counts, n)}
+                                  for oracle, oracle_counts in zip(oracles, all_counts)],
+                         timings_ms=timings)
 
             # Display plots
             if self.gui_display_plots and figures_to_display:
@@ -575,6 +1163,7 @@ class QuantumGames:
 
         except Exception as e:
             self.gui_output(f"\nDeutsch-Jozsa 演示过程中出错: {e}\n")
+            self._record(error=str(e))
         finally:
             # End the game/demo process
             self.gui_output("--------------------\n")
@@ -582,109 +1171,117 @@ class QuantumGames:
 
 
     # --- Grover Search Demo --- NEW
-    def run_grover_search_demo(self):
+    def run_grover_search_demo(self, n=3, marked_items=None, iterations=None, shots=1024, method='auto'):
         """Demonstrates Grover's search algorithm.
 
         Finds a marked item in an unstructured database quadratically faster
         than classical algorithms.
+
+        n: number of qubits; marked_items: bitstrings or ints (default '10...01');
+        iterations: defaults to the optimum for N = 2^n and M = len(marked_items);
+        method: 'circuit' (Qiskit circuit), 'fast' (NumPy phase flip + reflection)
+        or 'auto' (circuit for 2..grover_circuit_max_qubits qubits, fast otherwise; the circuit
+        needs at least 2 qubits).
         """
         self.gui_output("--- Grover 搜索算法演示 ---\n")
-        self.gui_output("目标: 在未排序的数据库中高效查找一个标记项。\n")
+        self.gui_output("目标: 在未排序的数据库中高效查找标记项。\n")
         self.gui_output("方法: 通过量子叠加和幅度放大实现平方级加速。\n")
-        
-        n = 3 # Number of qubits
-        num_states = 2**n
-        marked_item_bin = '101' # The item we want to find (example)
-        self.gui_output(f"示例: n = {n} 个量子比特 (数据库大小 N = {num_states}).\n")
-        self.gui_output(f"        标记项 (二进制): {marked_item_bin}\n")
 
         figures_to_display = []
 
         try:
-            # --- Oracle Definition --- 
-            # Marks the state |101> by flipping its phase
-            def create_oracle(qc, n, marked_state_binary):
-                # Flip bits corresponding to 0s in the marked state
-                for qubit, bit in enumerate(reversed(marked_state_binary)):
-                    if bit == '0':
-                        qc.x(qubit)
-                # Apply multi-controlled Z gate
-                control_qubits = list(range(n-1))
-                target_qubit = n-1
-                qc.append(MCPhaseGate(np.pi, len(control_qubits)), control_qubits + [target_qubit]) # Corrected: positional arg
-                # Flip bits back
-                for qubit, bit in enumerate(reversed(marked_state_binary)):
-                    if bit == '0':
-                        qc.x(qubit)
-                qc.barrier()
-
-            # --- Diffuser Definition ---
-            def create_diffuser(qc, n):
-                qc.h(range(n))
-                qc.x(range(n))
-                control_qubits = list(range(n-1))
-                target_qubit = n-1
-                qc.append(MCPhaseGate(np.pi, len(control_qubits)), control_qubits + [target_qubit]) # Corrected: positional arg
-                qc.x(range(n))
-                qc.h(range(n))
-                qc.barrier()
-
-            # --- Circuit Construction ---
-            self.gui_output("步骤 1: 初始化所有量子比特到 |+> 状态 (应用 H 门).\n")
-            grover_circuit = QuantumCircuit(n, name="Grover Search Demo")
-            grover_circuit.h(range(n))
-            grover_circuit.barrier()
-
-            # Calculate optimal number of iterations
-            # optimal_iterations = int(np.round((np.pi / 4) * np.sqrt(num_states)))
-            # For n=3, N=8, sqrt(8) is approx 2.82, pi/4 * 2.82 is approx 2.2. Let's use 2 iterations.
-            optimal_iterations = 2 
-            self.gui_output(f"步骤 2: 重复应用 Oracle 和 Diffuser {optimal_iterations} 次.\n")
-
-            for iteration in range(optimal_iterations):
-                self.gui_output(f"  迭代 {iteration + 1}:")
-                self.gui_output("    应用 Oracle (标记状态 '{marked_item_bin}')")
-                create_oracle(grover_circuit, n, marked_item_bin)
-                self.gui_output("    应用 Diffuser (放大标记态幅度)")
-                create_diffuser(grover_circuit, n)
-            
-            # Step 3: Measure all qubits
-            self.gui_output(f"步骤 3: 测量所有 {n} 个量子比特.\n")
-            grover_circuit.measure_all()
-
-            # --- Simulation and Results ---
-            self.gui_output("\n电路构建完成，准备模拟...\n")
-            
-            # Draw the circuit
-            try:
-                circuit_fig = grover_circuit.draw('mpl', style='iqx', fold=-1)
-                figures_to_display.append(circuit_fig)
-                self.gui_output("电路图已生成.\n")
-            except ImportError:
-                self.gui_output("绘制电路图需要 'pylatexenc' 包.\n")
-            except Exception as plot_error:
-                self.gui_output(f"绘制电路图时出错: {plot_error}\n")
+            if marked_items is None:
+                marked_items = ['1' + '0' * (n - 2) + '1'] if n >= 2 else ['1']
+            marked_indices = grover.normalize_marked_items(n, marked_items)
+            marked_bins = ints_to_bitstrings(marked_indices, n)
+            num_states = 2**n
+            num_marked = len(marked_indices)
+            if iterations is None:
+                iterations = grover.optimal_iterations(num_states, num_marked)
+            if method == 'auto':
+                method = 'fast' if n < 2 or n > self.grover_circuit_max_qubits else 'circuit'
+
+            self.gui_output(f"示例: n = {n} 个量子比特 (数据库大小 N = {num_states}).\n")
+            shown_marked = ', '.join(marked_bins[:8]) + (' ...' if num_marked > 8 else '')
+            self.gui_output(f"        标记项 (二进制, 共 M = {num_marked} 个): {shown_marked}\n")
+            self.gui_output(f"        最优迭代次数 ≈ π/4·sqrt(N/M) → {iterations} 次, "
+                            f"理论成功概率 {grover.success_probability(num_states, num_marked, iterations):.4f}\n")
+
+            memo_hits = self.result_memo.hits
+            start_time = time.perf_counter()
+            if method == 'fast':
+                # Real amplitudes (8 bytes each) plus the probabilities for sampling
+                planner.check_statevector_memory(n, self.memory_budget, copies=1)
+                # --- NumPy path: oracle = phase flip, diffuser = reflection about the mean ---
+                self.gui_output(f"使用 NumPy 快速路径: Oracle 作为相位翻转, Diffuser 作为关于均值的向量化反射 ({iterations} 次迭代).\n")
+                state = grover.grover_statevector(n, marked_indices, iterations, cancel_check=self.cancel_check)
+                outcomes, hits = fast_sim.sample_indices(state ** 2, shots, self.sampling_seed)
+                counts = dict(zip(ints_to_bitstrings(outcomes, n), hits.tolist()))
+            else:
+                # --- Circuit path: oracle / diffuser built from multi-controlled phase gates ---
+                self.gui_output("步骤 1: 初始化所有量子比特到 |+> 状态 (应用 H 门).\n")
+                self.gui_output(f"步骤 2: 重复应用 Oracle 和 Diffuser {iterations} 次.\n")
+                for iteration in range(min(iterations, 4)):
+                    self.gui_output(f"  迭代 {iteration + 1}:")
+                    self.gui_output(f"    应用 Oracle (标记状态 {shown_marked})")
+                    self.gui_output("    应用 Diffuser (放大标记态幅度)")
+                if iterations > 4:
+                    self.gui_output(f"  ... (共 {iterations} 次迭代)")
+                self.gui_output(f"步骤 3: 测量所有 {n} 个量子比特.\n")
+                # Template per (n, iterations, M), transpiled once; the marked states are parameters
+                grover_circuit = self.templates.bind('grover', (n, iterations, num_marked),
+                                                     templates.grover_values(n, marked_indices))
+
+                # --- Simulation and Results ---
+                self.gui_output("\n电路构建完成，准备模拟...\n")
+
+                # Draw the circuit (only readable for small circuits; X gates read better than U flips)
+                if n * max(iterations, 1) <= 24:
+                    try:
+                        circuit_fig = self._draw_circuit(grover.build_grover_circuit(n, marked_indices, iterations),
+                                                         fold=-1)
+                        figures_to_display.append(circuit_fig)
+                        self.gui_output("电路图已生成.\n")
+                    except ImportError:
+                        self.gui_output("绘制电路图需要 'pylatexenc' 包.\n")
+                    except Exception as plot_error:
+                        self.gui_output(f"绘制电路图时出错: {plot_error}\n")
+                else:
+                    self.gui_output("电路较大，跳过电路图绘制.\n")
+
+                counts = self.run_batch([grover_circuit], shots, transpiled=True)[0]
+            elapsed = time.perf_counter() - start_time
+            timings, memo_note = self._simulation_timing('simulate', elapsed, memo_hits)
 
             # Simulate
-            shots = 1024 # Use more shots for better statistics
-            job = self.simulator.run(grover_circuit, shots=shots)
-            result = job.result()
-            counts = result.get_counts(grover_circuit)
-            self.gui_output(f"模拟结果 (测量 {n} 个比特 {shots} 次): {counts}\n")
+            if len(counts) <= 16:
+                self.gui_output(f"模拟结果 (测量 {n} 个比特 {shots} 次): {counts}\n")
+            else:
+                top_counts = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:8]
+                self.gui_output(f"模拟结果 (测量 {n} 个比特 {shots} 次, 共 {len(counts)} 种结果, 前 8 个): {dict(top_counts)}\n")
+            self.gui_output(f"模拟耗时: {elapsed * 1000:.1f} ms ({'NumPy 快速路径' if method == 'fast' else '电路模拟'})"
+                            f"{memo_note}\n")
 
             # Interpretation
-            # The state with the highest probability should be the marked item
+            # The state with the highest probability should be a marked item
             most_frequent = max(counts, key=counts.get)
+            marked_set = set(marked_bins)
+            marked_hits = sum(count for state, count in counts.items() if state in marked_set)
             self.gui_output(f"解释: 测量结果中概率最高的态是 '{most_frequent}'.\n")
-            if most_frequent == marked_item_bin:
-                self.gui_output(f"        这与我们标记的项 '{marked_item_bin}' 相符，搜索成功！\n")
+            if most_frequent in marked_set:
+                self.gui_output(f"        这是标记项之一，搜索成功！命中标记项的比例: {marked_hits / shots:.3f}\n")
             else:
                 # This case (not finding the marked item) could happen due to insufficient iterations or noise
-                self.gui_output(f"        这与我们标记的项 '{marked_item_bin}' 不符，搜索可能未完全收敛或存在错误.\n")
+                self.gui_output(f"        这不是标记项，搜索可能未完全收敛或存在错误. 命中标记项的比例: {marked_hits / shots:.3f}\n")
+            self._record(n=n, shots=shots, method=method, marked=marked_bins, iterations=iterations,
+                         success_probability=grover.success_probability(num_states, num_marked, iterations),
+                         marked_hit_rate=marked_hits / shots, most_frequent=most_frequent,
+                         counts=counts if len(counts) <= 1024 else histograms.top_k_counts(counts, 1024),
+                         timings_ms=timings)
 
             # Generate and add histogram
             try:
-                hist_fig = plot_histogram(counts, title="Grover 搜索结果")
+                hist_fig = self._plot_counts(counts, title="Grover 搜索结果")
                 figures_to_display.append(hist_fig)
                 self.gui_output("直方图已生成.\n")
             except Exception as plot_error:
@@ -699,6 +1296,7 @@ class QuantumGames:
 
         except Exception as e:
              self.gui_output(f"\nGrover 搜索演示过程中出错: {e}\n")
+             self._record(error=str(e))
              import traceback
              traceback.print_exc() # Print detailed traceback to console for debugging
         finally:
@@ -707,98 +1305,111 @@ class QuantumGames:
             self.end_game()
 
     # --- Quantum Fourier Transform (QFT) Demo --- NEW
-    def run_qft_demo(self):
-        """Demonstrates the Quantum Fourier Transform (QFT)."""
+    def run_qft_demo(self, n=3, input_state=5):
+        """Demonstrates the Quantum Fourier Transform (QFT).
+
+        n: number of qubits; input_state: basis state as an int, or a sequence of
+        2^n amplitudes (normalized automatically). The simulated output is checked
+        against numpy.fft and both timings are reported.
+        """
         self.gui_output("--- 量子傅里叶变换 (QFT) 演示 ---\n")
         self.gui_output("目标: 演示 QFT 如何将计算基态转换为傅里叶基态.\n")
         self.gui_output("应用: QFT 是许多量子算法的关键组成部分，如 Shor 算法.\n")
-        
-        n = 3 # Number of qubits
-        input_state_decimal = 5
-        input_state_binary = format(input_state_decimal, f'0{n}b') # '101' for n=3
-
-        self.gui_output(f"示例: n = {n} 个量子比特.\n")
-        self.gui_output(f"        输入态: |{input_state_binary}> (十进制 {input_state_decimal})\n")
 
         figures_to_display = []
 
         try:
-            # --- Helper Functions for Manual QFT ---
-            def qft_rotations(circuit, n):
-                """Applies the rotation part of the QFT circuit."""
-                if n == 0:
-                    return circuit
-                # Apply H gate to the most significant qubit
-                circuit.h(n-1)
-                # Apply controlled rotations
-                for qubit in range(n-1):
-                    # control=qubit, target=n-1
-                    circuit.cp(np.pi/2**(n-1-qubit), qubit, n-1)
-                # Recursively apply to the rest
-                qft_rotations(circuit, n-1)
-
-            def swap_registers(circuit, n):
-                """Applies SWAP gates to reverse qubit order after QFT rotations."""
-                for qubit in range(n//2):
-                    circuit.swap(qubit, n-qubit-1)
-                return circuit
+            # Input vector, simulated output and the numpy.fft reference
+            planner.check_statevector_memory(n, self.memory_budget, copies=4)
+            input_vector = qft.input_vector(n, input_state)
+            is_basis_input = isinstance(input_state, (int, np.integer))
+            self.gui_output(f"示例: n = {n} 个量子比特.\n")
+            if is_basis_input:
+                input_state_binary = format(int(input_state), f'0{n}b')
+                self.gui_output(f"        输入态: |{input_state_binary}> (十进制 {input_state})\n")
+            else:
+                self.gui_output(f"        输入态: 任意叠加态 ({2**n} 个幅度，已归一化)\n")
 
             # --- Circuit Construction ---
-            # 1. Prepare initial state |101>
-            qc = QuantumCircuit(n, name="Manual QFT Demo")
-            self.gui_output("步骤 1: 准备初始态 |101>.\n") # Corrected single line
-            # Initialize to |101> (Qiskit order is qn-1...q0, so |101> means q2=1, q1=0, q0=1)
-            if input_state_binary[0] == '1': qc.x(n-1) # q2
-            if input_state_binary[1] == '1': qc.x(n-2) # q1
-            if input_state_binary[2] == '1': qc.x(n-3) # q0
-            qc.barrier()
-
-            # 2. Apply QFT manually
-            self.gui_output("步骤 2: 手动应用 QFT 旋转门.\n") # Corrected single line
-            qft_rotations(qc, n)
-            qc.barrier()
-            self.gui_output("步骤 3: 应用 SWAP 门来反转量子比特顺序.\n") # Corrected single line
-            swap_registers(qc, n)
-            qc.barrier()
-
-            self.gui_output("手动 QFT 电路构建完成.\n") # Corrected single line
-
-            # Draw the circuit (no need to decompose now)
-            self.gui_output("绘制电路图...\n") # Added closing parenthesis and newline
-            try:
-                circuit_fig = qc.draw('mpl', style='iqx', fold=-1)
-                figures_to_display.append(circuit_fig)
-                self.gui_output("电路图已生成.\n") # Corrected previous message
-            except ImportError:
-                self.gui_output("绘制电路图需要 'pylatexenc' 包.\n") # Corrected quotes
-            except Exception as plot_error:
-                self.gui_output(f"绘制电路图时出错: {plot_error}\n")
+            start_time = time.perf_counter()
+            if is_basis_input:
+                self.gui_output(f"步骤 1: 准备初始态 |{input_state_binary}> (对为 1 的比特应用 X 门).\n")
+            else:
+                self.gui_output("步骤 1: 用 initialize 准备输入叠加态.\n")
+            self.gui_output("步骤 2: 迭代应用 QFT 的 H 门与受控相位旋转.\n")
+            self.gui_output("步骤 3: 应用 SWAP 门来反转量子比特顺序.\n")
+            if is_basis_input:
+                # Template per n, built and transpiled once; the input state is bound as flip angles
+                template = self.templates.get('qft', n)
+                qc = template.bind(templates.flip_angles(input_state, range(n)))
+                gate_count = template.circuit.size()
+            else:
+                qc = qft.build_qft_demo_circuit(n, input_state)
+                gate_count = qc.size()
+            build_time = time.perf_counter() - start_time
+            self.gui_output(f"QFT 电路构建完成 ({gate_count} 个门).\n")
+
+            # Draw the circuit (only readable for small n)
+            if n <= 5:
+                self.gui_output("绘制电路图...\n")
+                try:
+                    # The diagram shows the plain X-gate preparation rather than the template's U flips
+                    drawn = qft.build_qft_demo_circuit(n, input_state) if is_basis_input else qc
+                    circuit_fig = self._draw_circuit(drawn, fold=-1)
+                    figures_to_display.append(circuit_fig)
+                    self.gui_output("电路图已生成.\n")
+                except ImportError:
+                    self.gui_output("绘制电路图需要 'pylatexenc' 包.\n")
+                except Exception as plot_error:
+                    self.gui_output(f"绘制电路图时出错: {plot_error}\n")
+            else:
+                self.gui_output("电路较大，跳过电路图绘制.\n")
 
             # --- Simulation (Statevector) ---
-            self.gui_output("\n准备使用状态向量模拟器模拟...\n") # Corrected newline/string termination
+            self.gui_output("\n准备模拟状态向量...\n")
             try:
-                sv_simulator = Aer.get_backend('statevector_simulator')
+                start_time = time.perf_counter()
+                # NumPy fast path for small n, Aer otherwise (bound templates are already transpiled)
+                output_statevector = self._run_statevector(qc, transpiled=is_basis_input)
+                simulation_time = time.perf_counter() - start_time
+
+                # --- Verification against numpy.fft ---
+                start_time = time.perf_counter()
+                expected = qft.reference_qft(input_vector)
+                fft_time = time.perf_counter() - start_time
+                max_error = float(np.max(np.abs(np.asarray(output_statevector) - expected)))
+                self.gui_output(f"与 numpy.fft 参考结果比较: 最大误差 {max_error:.2e} "
+                                f"({'一致' if max_error < 1e-6 else '不一致!'})\n")
+                self.gui_output(f"耗时: 电路构建 {build_time * 1000:.2f} ms, 电路模拟 {simulation_time * 1000:.2f} ms, "
+                                f"numpy.fft {fft_time * 1000:.3f} ms\n")
+                self._record(n=n, max_error=max_error, statevector=output_statevector,
+                             statevector_summary=amplitudes.summary_dict(output_statevector),
+                             timings_ms={'build': build_time * 1000, 'simulate': simulation_time * 1000,
+                                         'numpy_fft': fft_time * 1000})
 
-                # Run the circuit directly (should contain only basic gates now)
-                job = sv_simulator.run(qc)
-                result = job.result()
-                output_statevector = result.get_statevector(qc)
-                
                 self.gui_output("模拟完成。输出状态向量:\n")
                 # Format output for better readability
-                for i, amp in enumerate(output_statevector):
+                output_amplitudes = np.asarray(output_statevector)
+                nonzero = np.flatnonzero(~np.isclose(output_amplitudes, 0))
+                for i in nonzero[:16]:
                     # Only show non-negligible amplitudes
-                    if not np.isclose(amp, 0):
-                         self.gui_output(f"  |{format(i, f'0{n}b')}> : {amp:.3f}")
+                    self.gui_output(f"  |{format(int(i), f'0{n}b')}> : {output_amplitudes[i]:.3f}")
+                if len(nonzero) > 16:
+                    self.gui_output(f"\n  ... (共 {len(nonzero)} 个非零分量, 仅显示前 16 个)")
                 self.gui_output("\n(注意: 幅度是复数，这里显示了实部和虚部)\n")
 
-                # Visualize the statevector
-                state_fig = plot_state_city(output_statevector, title="QFT 输出状态向量")
-                figures_to_display.append(state_fig)
-                self.gui_output("状态向量图已生成.\n")
+                # Visualize the statevector (the city plot has 2^n x 2^n bars)
+                if n <= 4:
+                    with self.profiler.span('plot_statevector'):
+                        state_fig = plot_state_city(output_statevector, title="QFT 输出状态向量")
+                    figures_to_display.append(state_fig)
+                    self.gui_output("状态向量图已生成.\n")
+                else:
+                    self.gui_output("量子比特较多，跳过状态向量城市图.\n")
 
             except Exception as sim_error: # Restored missing except block for simulation try
                 self.gui_output(f"状态向量模拟或绘图时出错: {sim_error}\n")
+                self._record(error=str(sim_error))
                 import traceback
                 traceback.print_exc()
 
@@ -811,6 +1422,7 @@ class QuantumGames:
 
         except Exception as e:
             self.gui_output(f"\nQFT 演示过程中出错: {e}\n")
+            self._record(error=str(e))
             
         # End the game/demo process
         self.gui_output("--------------------\n")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Grover 搜索引擎
+任意 n、多个标记项、根据 N 和 M 计算最优迭代次数；
+既可构建 Qiskit 电路，也可直接在 NumPy 中模拟 (Oracle = 相位翻转，Diffuser = 关于均值的反射)，
+后者不依赖多控门分解，可用于 20+ 量子比特的交互演示。
+"""
+
+import math
+
+import numpy as np
+
+
+def normalize_marked_items(n, marked_items):
+    """Validate marked items (bitstrings or ints) and return them as sorted unique ints."""
+    if not marked_items:
+        raise ValueError("至少需要一个标记项。")
+    num_states = 2 ** n
+    indices = set()
+    for item in marked_items:
+        if isinstance(item, str):
+            if len(item) != n or set(item) - {'0', '1'}:
+                raise ValueError(f"标记项 '{item}' 必须是长度为 {n} 的二进制串。")
+            index = int(item, 2)
+        else:
+            index = int(item)
+        if not 0 <= index < num_states:
+            raise ValueError(f"标记项 {item} 超出范围 [0, {num_states - 1}]。")
+        indices.add(index)
+    if len(indices) == num_states:
+        raise ValueError("所有状态都被标记，Grover 搜索没有意义。")
+    return sorted(indices)
+
+
+def rotation_angle(num_states, num_marked):
+    """θ with sin(θ) = sqrt(M/N): each Grover iteration rotates the state by 2θ."""
+    return math.asin(math.sqrt(num_marked / num_states))
+
+
+def optimal_iterations(num_states, num_marked):
+    """Iteration count k that brings (2k+1)θ closest to π/2."""
+    theta = rotation_angle(num_states, num_marked)
+    return max(0, int(round(math.pi / (4 * theta) - 0.5)))
+
+
+def success_probability(num_states, num_marked, iterations):
+    """Theoretical probability of measuring any marked item after ``iterations`` rounds."""
+    theta = rotation_angle(num_states, num_marked)
+    return math.sin((2 * iterations + 1) * theta) ** 2
+
+
+def append_oracle(qc, n, marked_index):
+    """Phase-flip |marked_index> using X conjugation around a multi-controlled phase."""
+    from qiskit.circuit.library import MCPhaseGate
+    zero_bits = [qubit for qubit in range(n) if not (marked_index >> qubit) & 1]
+    if zero_bits:
+        qc.x(zero_bits)
+    qc.append(MCPhaseGate(np.pi, n - 1), list(range(n)))
+    if zero_bits:
+        qc.x(zero_bits)
+
+
+def append_diffuser(qc, n):
+    """Reflection about the uniform superposition."""
+    from qiskit.circuit.library import MCPhaseGate
+    qc.h(range(n))
+    qc.x(range(n))
+    qc.append(MCPhaseGate(np.pi, n - 1), list(range(n)))
+    qc.x(range(n))
+    qc.h(range(n))
+
+
+def build_grover_circuit(n, marked_indices, iterations, measure=True):
+    """Grover circuit for ``marked_indices`` (needs n >= 2 for the multi-controlled phase)."""
+    from qiskit import QuantumCircuit
+    if n < 2:
+        raise ValueError("Grover 电路至少需要 2 个量子比特。")
+    qc = QuantumCircuit(n, name="Grover Search Demo")
+    qc.h(range(n))
+    qc.barrier()
+    for _ in range(iterations):
+        for marked_index in marked_indices:
+            append_oracle(qc, n, marked_index)
+        qc.barrier()
+        append_diffuser(qc, n)
+        qc.barrier()
+    if measure:
+        qc.measure_all()
+    return qc
+
+
+def grover_statevector(n, marked_indices, iterations, cancel_check=None):
+    """Simulate Grover directly on a real amplitude vector of length 2^n.
+
+    The oracle negates the marked amplitudes and the diffuser maps a -> 2*mean(a) - a;
+    both are O(2^n) vectorized NumPy operations. ``cancel_check`` (optional) is called
+    once per iteration so long runs can be interrupted.
+    """
+    num_states = 2 ** n
+    marked = np.asarray(marked_indices, dtype=np.int64)
+    state = np.full(num_states, 1 / math.sqrt(num_states))
+    for _ in range(iterations):
+        if cancel_check is not None:
+            cancel_check()
+        state[marked] *= -1
+        np.subtract(2 * state.mean(), state, out=state)
+    return state
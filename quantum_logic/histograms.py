@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+可扩展的直方图
+结果种类很多时 (12+ 量子比特)，自动聚合为 top-k + "其他"、边缘分布或分箱密度图，
+聚合全部用 NumPy 完成，绘图耗时与 n 基本无关。超过 62 位的寄存器 (如 1000 比特 GHZ 态)
+按比特矩阵做边缘分布，按前导比特分箱画密度图。
+"""
+
+import numpy as np
+
+from quantum_logic.bitstrings import ints_to_bitstrings, memory_to_bits
+
+HISTOGRAM_MODES = ('auto', 'full', 'top_k', 'marginal', 'density')
+# Outcome integers are int64; wider registers are handled as bit matrices
+MAX_INDEX_BITS = 62
+
+
+def _bits_to_ints(bits):
+    """Integers of the rows of a (rows, k) bit matrix, column i = bit i (k <= MAX_INDEX_BITS)."""
+    return bits.astype(np.int64) @ (np.int64(1) << np.arange(bits.shape[1], dtype=np.int64))
+
+
+def outcome_bits(counts):
+    """``(bits, frequencies, num_bits)``: (outcomes, num_bits) uint8 matrix (column i = clbit i) and counts."""
+    keys = list(counts)
+    num_bits = len(keys[0].replace(' ', '')) if keys else 0
+    frequencies = np.fromiter(counts.values(), dtype=np.int64, count=len(keys))
+    return memory_to_bits(keys, num_bits), frequencies, num_bits
+
+
+def outcome_arrays(counts):
+    """``(values, frequencies, num_bits)``: outcome integers (clbit i = bit i) and their counts.
+
+    Raises ValueError for registers wider than MAX_INDEX_BITS (use outcome_bits).
+    """
+    bits, frequencies, num_bits = outcome_bits(counts)
+    if num_bits > MAX_INDEX_BITS:
+        raise ValueError(f"{num_bits} 位的测量结果超过 {MAX_INDEX_BITS} 位，无法表示为整数。")
+    return _bits_to_ints(bits), frequencies, num_bits
+
+
+def top_k_counts(counts, k=16):
+    """The ``k`` most frequent outcomes, plus one "其他" bucket holding the rest."""
+    if len(counts) <= k:
+        return dict(counts)
+    keys = list(counts)
+    frequencies = np.fromiter(counts.values(), dtype=np.int64, count=len(keys))
+    top = np.argpartition(frequencies, len(keys) - k)[len(keys) - k:]
+    top = top[np.argsort(-frequencies[top], kind='stable')]
+    result = {keys[index]: int(frequencies[index]) for index in top}
+    result[f"其他 ({len(keys) - k} 种)"] = int(frequencies.sum() - frequencies[top].sum())
+    return result
+
+
+def marginal_counts(counts, qubits):
+    """Counts of the classical bits ``qubits`` only (highest listed bit leftmost, as in Qiskit)."""
+    bits, frequencies, num_bits = outcome_bits(counts)
+    qubits = sorted(set(qubits))
+    if not qubits or qubits[-1] >= num_bits or qubits[0] < 0:
+        raise ValueError(f"边缘分布的比特必须在 [0, {num_bits - 1}] 范围内。")
+    if len(qubits) > MAX_INDEX_BITS:
+        raise ValueError(f"边缘分布最多取 {MAX_INDEX_BITS} 个比特。")
+    # Only observed outcomes are tallied, so the cost does not grow with 2^len(qubits)
+    outcomes, inverse = np.unique(_bits_to_ints(bits[:, qubits]), return_inverse=True)
+    totals = np.bincount(inverse, weights=frequencies, minlength=outcomes.size).astype(np.int64)
+    return dict(zip(ints_to_bitstrings(outcomes, len(qubits)), totals.tolist()))
+
+
+def density_figure(counts, bins=64, title=None):
+    """Bar chart of the shot distribution over the outcome integers, in ``bins`` equal bins.
+
+    Outcomes are binned by their leading bits, so any register width works; the binning
+    is exact whenever ``bins`` is a power of two or the register has at most ~55 bits.
+    """
+    from matplotlib.figure import Figure
+    bits, frequencies, num_bits = outcome_bits(counts)
+    bins = max(1, min(bins, 2 ** num_bits))
+    # prefix * bins must fit in int64
+    prefix_bits = min(num_bits, MAX_INDEX_BITS - int(bins).bit_length())
+    prefix = _bits_to_ints(bits[:, num_bits - prefix_bits:])
+    totals = np.bincount((prefix * bins) >> prefix_bits, weights=frequencies, minlength=bins)
+    probabilities = totals / max(1, frequencies.sum())
+    fig = Figure(figsize=(7, 4))
+    ax = fig.add_subplot(111)
+    if num_bits <= 52:
+        width = 2 ** num_bits / bins
+        ax.bar(np.arange(bins) * width, probabilities, width=width, align='edge', color='#648fff')
+        ax.set_xlim(0, 2 ** num_bits)
+        ax.set_xlabel(f"测量结果 (整数值, 每箱 {width:g} 个)")
+    else:
+        # 2^n no longer fits a float axis: label the bins instead
+        ax.bar(np.arange(bins), probabilities, width=1, align='edge', color='#648fff')
+        ax.set_xlim(0, bins)
+        ax.set_xlabel(f"测量结果 (按前导比特分为 {bins} 箱, 每箱约 2^{num_bits - np.log2(bins):.1f} 个)")
+    ax.set_ylabel("概率")
+    if title:
+        ax.set_title(title)
+    fig.tight_layout()
+    return fig
+
+
+def plot_counts(counts, title=None, mode='auto', max_bars=32, k=None, qubits=None, bins=64):
+    """Histogram whose size does not grow with the number of distinct outcomes.
+
+    ``mode``: 'full' (one bar per outcome), 'top_k' (k most frequent + "其他"),
+    'marginal' (onto ``qubits``; default: as many low bits as fit in ``max_bars``),
+    'density' (binned), or 'auto', which uses 'full' up to ``max_bars`` outcomes and
+    'top_k' beyond.
+    """
+    from qiskit.visualization import plot_histogram
+    if mode not in HISTOGRAM_MODES:
+        raise ValueError(f"未知的直方图模式 '{mode}'，可选: {', '.join(HISTOGRAM_MODES)}")
+    if mode == 'auto':
+        mode = 'full' if len(counts) <= max_bars else 'top_k'
+    if mode == 'density':
+        return density_figure(counts, bins, title)
+    if mode == 'marginal':
+        if qubits is None:
+            num_bits = len(next(iter(counts)).replace(' ', '')) if counts else 0
+            qubits = range(min(num_bits, max(1, int(max_bars).bit_length() - 1)))
+        counts = marginal_counts(counts, qubits)
+        if len(counts) > max_bars:
+            mode = 'top_k'
+    if mode == 'top_k':
+        return plot_histogram(top_k_counts(counts, k or max_bars - 1), title=title, sort='value_desc')
+    return plot_histogram(counts, title=title)
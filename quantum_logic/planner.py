@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+模拟方法规划
+在运行前估算各模拟方法 (NumPy 快速路径、Aer statevector / stabilizer / matrix_product_state)
+的内存和时间开销，自动选择可行的方法；没有方法能在预算内完成时给出明确的提示。
+估算只用于量级判断，常数是粗略的经验值。
+"""
+
+import math
+import os
+
+from quantum_logic import fast_sim
+
+COMPLEX_BYTES = 16
+# Rough per-operation costs (seconds), only meant for order-of-magnitude decisions
+_SECONDS_PER_AMPLITUDE_GATE = {'numpy': 4e-9, 'statevector': 1e-9}
+_SECONDS_PER_STABILIZER_OP = 2e-8
+# One all-qubit measurement in Aer's stabilizer method is O(n^3)
+_SECONDS_PER_STABILIZER_MEASURE = 2.5e-10
+_SECONDS_PER_MPS_OP = 2e-9
+
+# Preference order when several methods fit the budget
+METHOD_ORDER = ('numpy', 'stabilizer', 'statevector', 'matrix_product_state')
+METHOD_NAMES = {
+    'numpy': "NumPy 快速路径",
+    'stabilizer': "Aer stabilizer (Clifford)",
+    'statevector': "Aer statevector",
+    'matrix_product_state': "Aer matrix_product_state",
+}
+
+# Widest circuit the method-specific Aer backends (aer_simulator_<method>) accept
+AER_MAX_QUBITS = {'stabilizer': 10000, 'matrix_product_state': 63}
+
+CLIFFORD_GATES = {'id', 'x', 'y', 'z', 'h', 's', 'sdg', 'sx', 'sxdg', 'cx', 'cy', 'cz', 'swap',
+                  'iswap', 'ecr', 'dcx', 'measure', 'reset', 'barrier', 'delay'}
+# Phase / Z rotations are Clifford when the angle is a multiple of π/2
+_QUARTER_TURN_GATES = {'p', 'rz', 'u1'}
+
+
+class SimulationTooLarge(ValueError):
+    """No simulation method fits the memory / time budget for this circuit."""
+
+
+def physical_memory_bytes(default=4 * 2 ** 30):
+    """Installed RAM (POSIX sysconf, Windows GlobalMemoryStatusEx), or ``default`` if unknown."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        pass
+    try:
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                        ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                        ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                        ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                        ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return int(status.ullTotalPhys)
+    except (AttributeError, OSError):
+        pass
+    return default
+
+
+def is_clifford(qc):
+    """True if every instruction of ``qc`` is a Clifford gate (or measure / reset / barrier)."""
+    for instruction in qc.data:
+        op = instruction.operation
+        if op.name in CLIFFORD_GATES:
+            continue
+        if op.name in _QUARTER_TURN_GATES:
+            try:
+                quarter_turns = float(op.params[0]) / (math.pi / 2)
+            except (TypeError, ValueError):
+                return False  # unbound Parameter
+            if abs(quarter_turns - round(quarter_turns)) < 1e-9:
+                continue
+        return False
+    return True
+
+
+def _pow2(exponent):
+    """2.0 ** exponent, saturating at inf (estimates for thousands of qubits)."""
+    return 2.0 ** exponent if exponent < 1000 else math.inf
+
+
+def format_bytes(num_bytes):
+    if math.isinf(num_bytes):
+        return "∞"
+    for unit in ('B', 'KiB', 'MiB', 'GiB', 'TiB', 'PiB'):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f} {unit}" if unit == 'B' else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes / 1024:.3g} EiB"
+
+
+def statevector_bytes(num_qubits, copies=1):
+    return COMPLEX_BYTES * _pow2(num_qubits) * copies
+
+
+def max_statevector_qubits(memory_budget_bytes, copies=1):
+    """Largest n whose ``copies`` complex statevectors fit in the budget."""
+    return max(0, int(math.floor(math.log2(max(1, memory_budget_bytes / (COMPLEX_BYTES * copies))))))
+
+
+def check_statevector_memory(num_qubits, memory_budget_bytes, copies=1, what="状态向量"):
+    """Raise SimulationTooLarge if ``copies`` dense statevectors of ``num_qubits`` exceed the budget."""
+    needed = statevector_bytes(num_qubits, copies)
+    if needed > memory_budget_bytes:
+        raise SimulationTooLarge(
+            f"{num_qubits} 个量子比特的{what}约需 {format_bytes(needed)} 内存，超出预算 {format_bytes(memory_budget_bytes)}；"
+            f"当前预算下最多 {max_statevector_qubits(memory_budget_bytes, copies)} 个量子比特。")
+
+
+class MethodEstimate:
+    """Estimated memory (bytes) and time (s) of one method; ``reason`` says why it cannot be used."""
+
+    def __init__(self, method, memory_bytes, seconds, reason=None):
+        self.method = method
+        self.memory_bytes = memory_bytes
+        self.seconds = seconds
+        self.reason = reason
+
+    @property
+    def supported(self):
+        return self.reason is None
+
+    def cost(self):
+        seconds = "∞" if math.isinf(self.seconds) else f"{self.seconds:.2g} s"
+        return f"内存 ≈ {format_bytes(self.memory_bytes)}, 时间 ≈ {seconds}"
+
+    def describe(self):
+        return f"{METHOD_NAMES[self.method]}: {self.cost()}" + (f" ({self.reason})" if self.reason else "")
+
+
+class SimulationPlan:
+    """Chosen method plus the estimates of every method that was considered."""
+
+    def __init__(self, method, estimates, num_qubits):
+        self.method = method
+        self.estimates = estimates
+        self.num_qubits = num_qubits
+
+    def describe(self):
+        lines = [f"模拟规划 ({self.num_qubits} 个量子比特): 选择 {METHOD_NAMES[self.method]}"]
+        lines.extend("  " + estimate.describe() for estimate in self.estimates.values())
+        return "\n".join(lines) + "\n"
+
+
+def mps_bond_exponents(qc):
+    """Upper bound on log2 of the MPS bond dimension at each cut between qubit k-1 and k.
+
+    A gate acting on q qubits spanning a cut raises the Schmidt rank across it by at most
+    4^(q-1), and a cut with k qubits on its short side never exceeds 2^k.
+    """
+    num_qubits = qc.num_qubits
+    if num_qubits < 2:
+        return []
+    crossings = [0] * (num_qubits + 1)
+    for instruction in qc.data:
+        if len(instruction.qubits) < 2 or instruction.operation.name in ('barrier', 'measure'):
+            continue
+        indices = [qc.find_bit(qubit).index for qubit in instruction.qubits]
+        growth = 2 * (len(indices) - 1)
+        crossings[min(indices) + 1] += growth
+        crossings[max(indices) + 1] -= growth
+    exponents = []
+    running = 0
+    for cut in range(1, num_qubits):
+        running += crossings[cut]
+        exponents.append(min(running, cut, num_qubits - cut))
+    return exponents
+
+
+def estimate_methods(qc, shots=1024, fast_path_max_qubits=12, return_statevector=False):
+    """MethodEstimate for each method in METHOD_ORDER.
+
+    ``return_statevector``: the caller needs the final statevector itself, so only the
+    dense methods qualify and Aer's result counts as a second copy.
+    """
+    num_qubits = qc.num_qubits
+    num_ops = max(1, len(qc.data))
+    estimates = {}
+
+    dense_ops = _pow2(num_qubits) * num_ops
+    fast_reason = None if fast_sim.is_supported(qc, max_qubits=fast_path_max_qubits) else \
+        f"只支持不超过 {fast_path_max_qubits} 个量子比特、门集受限且测量都在末尾的电路"
+    # State plus one temporary during a gate, plus the probabilities for sampling
+    estimates['numpy'] = MethodEstimate('numpy', statevector_bytes(num_qubits, 3),
+                                        dense_ops * _SECONDS_PER_AMPLITUDE_GATE['numpy'], fast_reason)
+
+    def aer_reason(method, reason=None):
+        if return_statevector:
+            return "不返回状态向量"
+        if num_qubits > AER_MAX_QUBITS[method]:
+            return f"最多支持 {AER_MAX_QUBITS[method]} 个量子比特"
+        return reason
+
+    clifford = is_clifford(qc)
+    # Aer tableau (bits) and the byte-per-entry Clifford tableau used for sampling, plus the
+    # sampled bits; each gate touches O(n) entries, one reference shot costs O(n^3) and
+    # every further shot an O(n^2) GF(2) product (see quantum_logic.stabilizer)
+    estimates['stabilizer'] = MethodEstimate(
+        'stabilizer', 4 * num_qubits ** 2 + shots * num_qubits + 2 ** 20,
+        num_ops * num_qubits * _SECONDS_PER_STABILIZER_OP
+        + (num_qubits ** 3 + shots * num_qubits ** 2) * _SECONDS_PER_STABILIZER_MEASURE,
+        aer_reason('stabilizer', None if clifford else "电路包含非 Clifford 门"))
+
+    estimates['statevector'] = MethodEstimate('statevector', statevector_bytes(num_qubits, 2 if return_statevector else 1),
+                                              dense_ops * _SECONDS_PER_AMPLITUDE_GATE['statevector'])
+
+    # Site k holds a 2 x chi_left x chi_right tensor; gates cost O(chi^3)
+    bonds = [0] + mps_bond_exponents(qc) + [0]
+    largest = max(bonds)
+    estimates['matrix_product_state'] = MethodEstimate(
+        'matrix_product_state', sum(2 * COMPLEX_BYTES * _pow2(left + right) for left, right in zip(bonds, bonds[1:])),
+        num_ops * _pow2(3 * largest) * _SECONDS_PER_MPS_OP * (1 + shots / 1024),
+        aer_reason('matrix_product_state'))
+    return estimates
+
+
+def plan_simulation(qc, memory_budget_bytes, time_budget_seconds=None, shots=1024, fast_path_max_qubits=12,
+                    return_statevector=False):
+    """Choose the first method in METHOD_ORDER that is supported and fits both budgets.
+
+    Raises SimulationTooLarge (with every estimate in the message) when none fits.
+    """
+    estimates = estimate_methods(qc, shots, fast_path_max_qubits, return_statevector)
+    for method in METHOD_ORDER:
+        estimate = estimates[method]
+        if not estimate.supported:
+            continue
+        if estimate.memory_bytes > memory_budget_bytes:
+            continue
+        if time_budget_seconds is not None and estimate.seconds > time_budget_seconds:
+            continue
+        return SimulationPlan(method, estimates, qc.num_qubits)
+    budget = f"内存预算 {format_bytes(memory_budget_bytes)}"
+    if time_budget_seconds is not None:
+        budget += f", 时间预算 {time_budget_seconds:g} s"
+    details = "\n".join("  " + estimate.describe() for estimate in estimates.values())
+    raise SimulationTooLarge(f"{qc.num_qubits} 个量子比特的电路没有可在预算内完成的模拟方法 ({budget}):\n{details}")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+分阶段计时
+记录每次演示中各阶段 (转译、模拟、绘图、显示等) 的耗时区间，保留滚动历史并可导出 CSV。
+关闭时 span() 返回一个共享的空上下文管理器，几乎没有开销。
+"""
+
+import csv
+import threading
+import time
+from collections import deque
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('profiler', 'stage', 'start')
+
+    def __init__(self, profiler, stage):
+        self.profiler = profiler
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.stage, self.start, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    """Collects ``(stage, start, duration)`` spans per demo run, keeping the last ``history`` runs.
+
+    Runs are opened with ``begin_run`` and closed with ``end_run``; spans may be
+    recorded from any thread (worker and Tk main thread) in between. Spans outside
+    a run are dropped.
+    """
+
+    def __init__(self, enabled=False, history=200):
+        self.enabled = enabled
+        self._runs = deque(maxlen=history)
+        self._current = None
+        self._lock = threading.Lock()
+
+    def span(self, stage):
+        """Context manager timing ``stage``; a shared no-op when profiling is off."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage)
+
+    def begin_run(self, name):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._current = {'run': name, 'started': time.time(), 'origin': time.perf_counter(), 'spans': []}
+
+    def record(self, stage, start, duration):
+        with self._lock:
+            if self._current is not None:
+                self._current['spans'].append((stage, start - self._current['origin'], duration))
+
+    def end_run(self):
+        """Close the current run, store it in the history and return it (None if none was open)."""
+        with self._lock:
+            run, self._current = self._current, None
+            if run is None:
+                return None
+            run['total'] = time.perf_counter() - run.pop('origin')
+            self._runs.append(run)
+            return run
+
+    def history(self):
+        with self._lock:
+            return list(self._runs)
+
+    def clear(self):
+        with self._lock:
+            self._runs.clear()
+
+    @staticmethod
+    def breakdown(run):
+        """``[(stage, total_seconds, count), ...]`` for one run, slowest stage first."""
+        totals = {}
+        for stage, _, duration in run['spans']:
+            total, count = totals.get(stage, (0.0, 0))
+            totals[stage] = (total + duration, count + 1)
+        return sorted(((stage, total, count) for stage, (total, count) in totals.items()),
+                      key=lambda item: item[1], reverse=True)
+
+    def export_csv(self, path):
+        """Write every span in the history as one CSV row; returns the number of rows."""
+        rows = 0
+        with open(path, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['run_index', 'run', 'started', 'stage', 'start_ms', 'duration_ms', 'run_total_ms'])
+            for index, run in enumerate(self.history()):
+                started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run['started']))
+                for stage, start, duration in run['spans']:
+                    writer.writerow([index, run['run'], started, stage, f"{start * 1000:.3f}",
+                                     f"{duration * 1000:.3f}", f"{run['total'] * 1000:.3f}"])
+                    rows += 1
+        return rows
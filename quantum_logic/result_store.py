@@ -0,0 +1,428 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+结果存储
+把每次演示运行的结果 (电路哈希、shots、种子、计数、可选的状态向量、文本输出和图表) 保存在本地目录中，
+之后可以在 GUI 中直接回放，无需重新模拟。
+
+目录结构 (默认 ~/.cache/quantum_games/results，见 caching.user_cache_dir):
+    index.json                所有运行的元数据，按时间先后排列
+    <run_id>/run.json         单次运行的元数据 (index.json 损坏或丢失时据此重建)
+    <run_id>/counts.npz       计数: 每组结果一个整数下标数组 (结果 → 整数) 和一个次数数组
+    <run_id>/arrays.npz       其他数值数组 (如相位扫描的 φ 与 P(1))
+    <run_id>/statevector.npy  状态向量 (超过 max_statevector_bytes 时不保存)，以内存映射方式打开，不复制进内存
+    <run_id>/output.txt       文本输出
+    <run_id>/figure_<k>.png   图表 (GUI 已光栅化的图像直接转存为 PNG，不重新渲染)
+
+save_run_async 在单独的写入线程中保存，演示线程只做浅拷贝；flush() 等待写入完成。
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from quantum_logic.caching import user_cache_dir
+
+INDEX_VERSION = 1
+# Outcomes up to this many bits are stored as int64 indices, wider ones as packed bits
+MAX_INDEX_BITS = 62
+
+
+def encode_counts(counts):
+    """Arrays for a counts dict: integer outcome per key, plus the count, width and space positions.
+
+    Keys must all have the same layout of '0' / '1' with spaces between registers;
+    raises ValueError otherwise.
+    """
+    keys = list(counts)
+    values = np.fromiter((int(count) for count in counts.values()), dtype=np.int64, count=len(keys))
+    if not keys:
+        return {'outcomes': np.zeros(0, dtype=np.int64), 'counts': values, 'width': np.int64(0),
+                'spaces': np.zeros(0, dtype=np.int64)}
+    length = len(keys[0])
+    joined = ''.join(keys).encode('ascii')
+    if len(joined) != length * len(keys):
+        raise ValueError("计数结果的长度不一致。")
+    chars = np.frombuffer(joined, dtype=np.uint8).reshape(len(keys), length)
+    spaces = np.flatnonzero(chars[0] == ord(' '))
+    columns = np.flatnonzero(chars[0] != ord(' '))
+    bits = chars[:, columns] - ord('0')
+    if np.any(chars[:, spaces] != ord(' ')) or np.any(bits > 1):
+        raise ValueError("计数结果不是二进制串。")
+    arrays = {'counts': values, 'width': np.int64(len(columns)), 'spaces': spaces.astype(np.int64)}
+    if len(columns) <= MAX_INDEX_BITS:
+        weights = np.left_shift(np.int64(1), np.arange(len(columns) - 1, -1, -1, dtype=np.int64))
+        arrays['outcomes'] = bits.astype(np.int64) @ weights
+    else:
+        arrays['outcome_bits'] = np.packbits(bits, axis=1)
+    return arrays
+
+
+def decode_counts(arrays):
+    """Inverse of encode_counts: {bitstring: count}."""
+    width = int(arrays['width'])
+    spaces = np.asarray(arrays['spaces'])
+    values = np.asarray(arrays['counts'])
+    if 'outcomes' in arrays:
+        shifts = np.arange(width - 1, -1, -1, dtype=np.int64)
+        bits = ((np.asarray(arrays['outcomes'])[:, None] >> shifts) & 1).astype(np.uint8)
+    else:
+        bits = np.unpackbits(np.asarray(arrays['outcome_bits']), axis=1, count=width)
+    length = width + len(spaces)
+    chars = np.full((len(values), length), ord(' '), dtype=np.uint8)
+    chars[:, np.setdiff1d(np.arange(length), spaces)] = bits + ord('0')
+    text = chars.tobytes().decode('ascii')
+    return {text[row * length:(row + 1) * length]: int(count) for row, count in enumerate(values)}
+
+
+def _is_counts(value):
+    return (isinstance(value, dict) and value and all(isinstance(key, str) for key in value)
+            and all(isinstance(count, (int, np.integer)) and not isinstance(count, bool) for count in value.values()))
+
+
+def _find_counts(results, prefix=''):
+    """(name, counts dict) for every counts dict in ``results``, nested dicts named 'outer.inner'."""
+    found = []
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if _is_counts(value):
+            found.append((name, value))
+        elif isinstance(value, dict) and value and all(_is_counts(inner) for inner in value.values()):
+            found.extend(_find_counts(value, prefix=f"{name}."))
+    return found
+
+
+def _json_default(value):
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, complex):
+        return [value.real, value.imag]
+    return str(value)
+
+
+def _png_from_ppm(data):
+    """PNG bytes for binary PPM (P6, 8-bit) bytes such as ui.rendering produces; zlib only."""
+    match = re.match(rb'P6\s+(\d+)\s+(\d+)\s+255\s', data)
+    if match is None:
+        raise ValueError("不支持的 PPM 图像。")
+    width, height = int(match.group(1)), int(match.group(2))
+    rows = np.frombuffer(data, dtype=np.uint8, count=width * height * 3, offset=match.end()).reshape(height, -1)
+    # Filter type 0 (none) in front of every row
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), rows]).tobytes()
+
+    def chunk(kind, body):
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw, 6)) + chunk(b'IEND', b''))
+
+
+def _png_bytes(figure):
+    """PNG bytes for a figure: PNG bytes as-is, PPM bytes converted, matplotlib figures rendered."""
+    if isinstance(figure, (bytes, bytearray)):
+        return bytes(figure) if bytes(figure[:4]) == b'\x89PNG' else _png_from_ppm(bytes(figure))
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png', bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def combined_hash(fingerprints):
+    """One hash for the circuits of a run: the fingerprint itself for a single circuit."""
+    if len(fingerprints) == 1:
+        return fingerprints[0]
+    return hashlib.sha1('\n'.join(fingerprints).encode('ascii')).hexdigest() if fingerprints else None
+
+
+class ResultStore:
+    """Local directory of demo runs with an index; see the module docstring for the layout.
+
+    Bounded by ``max_runs`` and ``max_disk_bytes``: saving a run deletes the oldest ones
+    (never the run just saved). Statevectors larger than ``max_statevector_bytes`` (as
+    complex128; None = no limit) are not saved. Safe to use from the GUI worker and main threads.
+    """
+
+    def __init__(self, root_dir=None, max_runs=200, max_disk_bytes=2 * 2 ** 30, max_statevector_bytes=64 * 2 ** 20):
+        self.root_dir = root_dir or os.path.join(user_cache_dir(), 'results')
+        self.max_runs = max_runs
+        self.max_disk_bytes = max_disk_bytes
+        self.max_statevector_bytes = max_statevector_bytes
+        self._lock = threading.Lock()
+        # One writer thread, created on the first save_run_async, so runs are written in order
+        self._writer = None
+        self._pending = []
+        self.last_error = None
+
+    def _run_dir(self, run_id):
+        return os.path.join(self.root_dir, run_id)
+
+    def _index_path(self):
+        return os.path.join(self.root_dir, 'index.json')
+
+    # ---------- Writing ----------
+
+    def save_run(self, demo, parameters=None, results=None, output='', figures=(), circuit_hash=None, seed=None):
+        """Persist one run and return its id.
+
+        ``results`` is the demo's last_run: counts dicts go to counts.npz, top-level NumPy
+        arrays to arrays.npz, 'statevector' to statevector.npy and everything else into
+        the JSON record. ``figures`` are image bytes (PNG or PPM) or matplotlib figures.
+        """
+        record, payload = self._prepare(demo, parameters, results, output, figures, circuit_hash, seed)
+        self._write_run(record, *payload)
+        return record['id']
+
+    def save_run_async(self, demo, parameters=None, results=None, output='', figures=(), circuit_hash=None,
+                       seed=None, on_error=None):
+        """Like save_run, but the files are written on the store's writer thread.
+
+        Returns the run id at once; the run is listed by runs() when its write finishes
+        (see flush). A failed write is kept in ``last_error`` and passed to ``on_error``.
+        Matplotlib figures are rendered here, on the calling thread.
+        """
+        record, payload = self._prepare(demo, parameters, results, output, figures, circuit_hash, seed)
+
+        def write():
+            try:
+                self._write_run(record, *payload)
+            except OSError as e:
+                self.last_error = e
+                if on_error:
+                    on_error(e)
+
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='result-store')
+            self._pending = [future for future in self._pending if not future.done()]
+            self._pending.append(self._writer.submit(write))
+        return record['id']
+
+    def flush(self, timeout=None):
+        """Wait until every save_run_async write has finished."""
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.result(timeout)
+
+    def _prepare(self, demo, parameters, results, output, figures, circuit_hash, seed):
+        """(record, (results, statevector, output, figures)) for a run, without touching the disk."""
+        # Copy one level deep: counts are removed from nested dicts when writing
+        results = {key: dict(value) if isinstance(value, dict) else value for key, value in (results or {}).items()}
+        statevector = results.pop('statevector', None)
+        skipped_statevector = None
+        if statevector is not None and self.max_statevector_bytes is not None:
+            statevector_bytes = np.size(getattr(statevector, 'data', statevector)) * 16
+            if statevector_bytes > self.max_statevector_bytes:
+                statevector, skipped_statevector = None, statevector_bytes
+        figures = [figure if isinstance(figure, (bytes, bytearray)) else _png_bytes(figure)
+                   for figure in figures if figure is not None]
+        now = time.time()
+        # Sortable by time (index rebuilds order runs by id), unique across processes
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}{int(now % 1 * 1000):03d}-{uuid.uuid4().hex[:8]}"
+        record = {
+            'id': run_id,
+            'demo': demo,
+            'created': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now)),
+            'parameters': dict(parameters or {}),
+            'circuit_hash': circuit_hash,
+            'shots': results.get('shots'),
+            'seed': seed,
+            'num_qubits': results.get('num_qubits', results.get('n')),
+            'error': results.get('error'),
+            'statevector_skipped_bytes': skipped_statevector,
+        }
+        return record, (results, statevector, output, figures)
+
+    def _write_run(self, record, results, statevector, output, figures):
+        run_id = record['id']
+        os.makedirs(self.root_dir, exist_ok=True)
+        # Build the run in a temp directory and rename it, so readers never see half a run
+        temp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=self.root_dir)
+        try:
+            record.update(self._write_files(temp_dir, results, statevector, output, figures))
+            record['bytes'] = sum(entry.stat().st_size for entry in os.scandir(temp_dir))
+            with open(os.path.join(temp_dir, 'run.json'), 'w', encoding='utf-8') as handle:
+                json.dump(record, handle, ensure_ascii=False, default=_json_default)
+            os.replace(temp_dir, self._run_dir(run_id))
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        with self._lock:
+            # A rebuilt index already contains the run just renamed into place
+            records = [existing for existing in self._read_index() if existing['id'] != run_id]
+            records.append(json.loads(json.dumps(record, default=_json_default)))
+            self._evict(records)
+            self._write_index(records)
+
+    @staticmethod
+    def _write_files(run_dir, results, statevector, output, figures):
+        """Write the data files of a run; returns the record fields describing them."""
+        counts_arrays, counts_names = {}, []
+        for name, counts in _find_counts(results):
+            try:
+                encoded = encode_counts(counts)
+            except ValueError:
+                continue  # not bitstring-keyed: stays in the JSON record
+            counts_names.append(name)
+            counts_arrays.update({f"{name}:{field}": array for field, array in encoded.items()})
+            # Drop it from the JSON record (top-level and nested names alike)
+            container, _, key = name.rpartition('.')
+            (results[container] if container else results).pop(key, None)
+            if container and not results[container]:
+                del results[container]
+        arrays = {key: value for key, value in results.items()
+                  if isinstance(value, np.ndarray) and value.dtype.kind in 'biufc'}
+        if counts_arrays:
+            np.savez_compressed(os.path.join(run_dir, 'counts.npz'), **counts_arrays)
+        if arrays:
+            np.savez_compressed(os.path.join(run_dir, 'arrays.npz'), **arrays)
+
+        statevector_info = None
+        if statevector is not None:
+            data = np.asarray(statevector, dtype=np.complex128)
+            np.save(os.path.join(run_dir, 'statevector.npy'), data)
+            statevector_info = {'shape': list(data.shape), 'dtype': str(data.dtype)}
+
+        with open(os.path.join(run_dir, 'output.txt'), 'w', encoding='utf-8') as handle:
+            handle.write(output)
+
+        # Already-rendered image bytes: rasterized PPM is only compressed to PNG here
+        for index, figure in enumerate(figures):
+            with open(os.path.join(run_dir, f"figure_{index + 1}.png"), 'wb') as handle:
+                handle.write(_png_bytes(figure))
+
+        return {
+            'counts': counts_names,
+            'arrays': sorted(arrays),
+            'statevector': statevector_info,
+            'figures': len(figures),
+            'results': {key: value for key, value in results.items() if key not in arrays},
+        }
+
+    def _evict(self, records):
+        """Delete the oldest runs (in place) until the limits hold; the newest run is kept."""
+        total = sum(record.get('bytes', 0) for record in records)
+        while len(records) > 1 and (len(records) > self.max_runs or total > self.max_disk_bytes):
+            oldest = records.pop(0)
+            total -= oldest.get('bytes', 0)
+            shutil.rmtree(self._run_dir(oldest['id']), ignore_errors=True)
+
+    # ---------- Index ----------
+
+    def _read_index(self):
+        try:
+            with open(self._index_path(), encoding='utf-8') as handle:
+                index = json.load(handle)
+            if index.get('version') == INDEX_VERSION:
+                return index['runs']
+        except (OSError, ValueError, KeyError):
+            pass
+        return self._rebuild_index()
+
+    def _rebuild_index(self):
+        """Index records recovered from every <run_id>/run.json, oldest first."""
+        records = []
+        if not os.path.isdir(self.root_dir):
+            return records
+        for entry in os.scandir(self.root_dir):
+            if not entry.is_dir() or entry.name.startswith('.'):
+                continue
+            try:
+                with open(os.path.join(entry.path, 'run.json'), encoding='utf-8') as handle:
+                    records.append(json.load(handle))
+            except (OSError, ValueError):
+                continue
+        return sorted(records, key=lambda record: record['id'])
+
+    def _write_index(self, records):
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=self.root_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            json.dump({'version': INDEX_VERSION, 'runs': records}, handle, ensure_ascii=False)
+        os.replace(temp_path, self._index_path())
+
+    # ---------- Reading ----------
+
+    def runs(self, demo=None):
+        """Index records, newest first (only those of ``demo`` if given)."""
+        with self._lock:
+            records = self._read_index()
+        return [record for record in reversed(records) if demo is None or record['demo'] == demo]
+
+    def get_run(self, run_id):
+        for record in self.runs():
+            if record['id'] == run_id:
+                return record
+        raise KeyError(f"没有找到运行记录: {run_id}")
+
+    def load_counts(self, run_id):
+        """{name: counts dict} of a run; nested results are named like 'counts.H'."""
+        path = os.path.join(self._run_dir(run_id), 'counts.npz')
+        if not os.path.exists(path):
+            return {}
+        grouped = {}
+        with np.load(path) as data:
+            for key in data.files:
+                name, _, field = key.rpartition(':')
+                grouped.setdefault(name, {})[field] = data[key]
+        return {name: decode_counts(arrays) for name, arrays in grouped.items()}
+
+    def load_arrays(self, run_id):
+        path = os.path.join(self._run_dir(run_id), 'arrays.npz')
+        if not os.path.exists(path):
+            return {}
+        with np.load(path) as data:
+            return {key: data[key] for key in data.files}
+
+    def load_statevector(self, run_id):
+        """The stored statevector as a read-only memory map (no copy), or None."""
+        path = os.path.join(self._run_dir(run_id), 'statevector.npy')
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode='r')
+
+    def load_output(self, run_id):
+        with open(os.path.join(self._run_dir(run_id), 'output.txt'), encoding='utf-8') as handle:
+            return handle.read()
+
+    def load_figures(self, run_id):
+        """PNG bytes of the run's figures, in display order."""
+        figures = []
+        for index in range(self.get_run(run_id).get('figures', 0)):
+            with open(os.path.join(self._run_dir(run_id), f"figure_{index + 1}.png"), 'rb') as handle:
+                figures.append(handle.read())
+        return figures
+
+    def delete_run(self, run_id):
+        with self._lock:
+            records = [existing for existing in self._read_index() if existing['id'] != run_id]
+            shutil.rmtree(self._run_dir(run_id), ignore_errors=True)
+            if os.path.isdir(self.root_dir):
+                self._write_index(records)
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.root_dir, ignore_errors=True)
+
+    def stats(self):
+        records = self.runs()
+        return {
+            'runs': len(records),
+            'bytes': sum(record.get('bytes', 0) for record in records),
+            'root_dir': self.root_dir,
+        }
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+参数化电路模板
+每个演示电路按形状 (量子比特数、迭代次数等) 只构建并转译一次，随运行变化的部分
+(标记态、输入基态、相位) 用符号 Parameter 表示；之后每次运行只需绑定参数，
+不再逐门构建电路、计算指纹或转译。
+
+比特翻转用 U(θ, 0, θ) 表示: θ = 0 时为恒等，θ = π 时恰好是 X 门 (无全局相位)。
+"""
+
+import math
+
+import numpy as np
+
+from quantum_logic import grover, interference, qft
+from quantum_logic.caching import LRUCache
+
+
+def flip_angles(value, qubits):
+    """θ for each U(θ, 0, θ) flip: π where bit q of ``value`` is 1, else 0."""
+    return [math.pi * ((int(value) >> qubit) & 1) for qubit in qubits]
+
+
+def _append_flips(qc, parameters):
+    for qubit, theta in enumerate(parameters):
+        qc.u(theta, 0, theta, qubit)
+
+
+def build_grover_template(n, iterations, num_marked):
+    """Grover circuit whose oracles take the marked states as flip parameters.
+
+    Parameters are ordered marked item by marked item, qubit 0 first; bind them with
+    grover_values.
+    """
+    from qiskit import QuantumCircuit
+    from qiskit.circuit import ParameterVector
+    from qiskit.circuit.library import MCPhaseGate
+    if n < 2:
+        raise ValueError("Grover 电路至少需要 2 个量子比特。")
+    flips = [ParameterVector(f'm{item}', n) for item in range(num_marked)]
+    qc = QuantumCircuit(n, name="Grover Search Template")
+    qc.h(range(n))
+    qc.barrier()
+    for _ in range(iterations):
+        for item_flips in flips:
+            # X on the qubits where the marked state has a 0, around the phase flip of |1...1>
+            _append_flips(qc, item_flips)
+            qc.append(MCPhaseGate(np.pi, n - 1), list(range(n)))
+            _append_flips(qc, item_flips)
+        qc.barrier()
+        grover.append_diffuser(qc, n)
+        qc.barrier()
+    qc.measure_all()
+    return qc, [parameter for item_flips in flips for parameter in item_flips]
+
+
+def grover_values(n, marked_indices):
+    """Flip angles for build_grover_template: flip the qubits where each marked state has a 0."""
+    values = []
+    for marked_index in marked_indices:
+        values.extend(math.pi - theta for theta in flip_angles(marked_index, range(n)))
+    return values
+
+
+def build_qft_template(n):
+    """QFT demo circuit for a basis-state input given as flip parameters (bind with flip_angles)."""
+    from qiskit import QuantumCircuit
+    from qiskit.circuit import ParameterVector
+    flips = ParameterVector('x', n)
+    qc = QuantumCircuit(n, name="QFT Template")
+    _append_flips(qc, flips)
+    qc.barrier()
+    qft.append_qft(qc, n)
+    qc.barrier()
+    return qc, list(flips)
+
+
+def build_phase_sweep_template():
+    qc, phi = interference.build_phase_sweep_circuit()
+    return qc, [phi]
+
+
+class CircuitTemplate:
+    """One parameterized circuit for one shape, with its transpiled form.
+
+    ``parameters`` fixes the order in which bind() takes plain values. Parameters that
+    do not occur in the compiled circuit (e.g. the oracle flips of a 0-iteration Grover
+    circuit) still take a value, which is ignored.
+    """
+
+    def __init__(self, name, shape, circuit, parameters, compiled):
+        self.name = name
+        self.shape = shape
+        self.circuit = circuit
+        self.parameters = parameters
+        self.compiled = compiled
+        self._present = set(compiled.parameters)
+
+    def bind(self, values=()):
+        """Transpiled circuit with ``values`` assigned (the shared instance if there is nothing to bind)."""
+        if len(values) != len(self.parameters):
+            raise ValueError(f"模板 {self.name} 需要 {len(self.parameters)} 个参数值，实际为 {len(values)} 个。")
+        bindings = {parameter: value for parameter, value in zip(self.parameters, values) if parameter in self._present}
+        if not bindings:
+            return self.compiled
+        return self.compiled.assign_parameters(bindings, inplace=False)
+
+    def binds(self, value_lists):
+        """``parameter_binds`` entry for running many bindings of this template in one Aer job."""
+        return {parameter: [float(value) for value in values]
+                for parameter, values in zip(self.parameters, value_lists) if parameter in self._present}
+
+
+class TemplateRegistry:
+    """Builds and transpiles each (template name, shape) once; bounded LRU of CircuitTemplate.
+
+    ``transpile_func(circuit, backend, **options)`` does the transpiling (QuantumGames
+    passes its cached, profiled _transpile). Templates are registered with a builder
+    ``builder(*shape) -> (circuit, parameters)`` and an optional zero-argument
+    ``target`` returning the backend to compile for.
+    """
+
+    def __init__(self, transpile_func, maxsize=32):
+        self.transpile_func = transpile_func
+        self._builders = {}
+        self._templates = LRUCache(maxsize)
+
+    @property
+    def maxsize(self):
+        return self._templates.maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        self._templates.maxsize = value
+
+    def register(self, name, builder, target=None, **transpile_options):
+        self._builders[name] = (builder, target, transpile_options)
+
+    def get(self, name, *shape):
+        """The CircuitTemplate for ``name`` at ``shape``, building and transpiling it on first use."""
+        key = (name, shape)
+        template = self._templates.get(key)
+        if template is not None:
+            return template
+        if name not in self._builders:
+            raise KeyError(f"未注册的电路模板: {name}")
+        builder, target, transpile_options = self._builders[name]
+        circuit, parameters = builder(*shape)
+        compiled = self.transpile_func(circuit, target() if target else None, **transpile_options)
+        template = CircuitTemplate(name, shape, circuit, parameters, compiled)
+        self._templates.put(key, template)
+        return template
+
+    def bind(self, name, shape, values=()):
+        """Bound, already-transpiled instance of template ``name`` at ``shape``."""
+        return self.get(name, *shape).bind(values)
+
+    def clear(self):
+        self._templates.clear()
+
+    def stats(self):
+        return self._templates.stats()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRU 缓存与带种子模拟结果备忘录 (result_memo) 的检查
+
+运行: python -m pytest -q
+"""
+
+from qiskit import QuantumCircuit
+
+from quantum_logic.caching import LRUCache
+from quantum_logic.games import QuantumGames
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now the oldest
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats() == {'hits': 3, 'misses': 1, 'size': 2, 'maxsize': 2, 'hit_rate': 0.75}
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == cache.misses == 0
+
+
+def test_lru_bounded_by_weight():
+    cache = LRUCache(maxsize=None, max_weight=10, weigh=len)
+    cache.put('a', b'x' * 6)
+    cache.put('b', b'y' * 4)
+    assert len(cache) == 2 and cache.weight == 10
+    cache.put('c', b'z')
+    assert cache.get('a') is None and cache.weight == 5
+    # The newest entry stays even when it alone is over the limit
+    cache.put('d', b'w' * 20)
+    assert len(cache) == 1 and cache.get('d') == b'w' * 20
+
+
+def bell_with_t():
+    qc = QuantumCircuit(2, 2)
+    qc.h(0)
+    qc.cx(0, 1)
+    qc.t(1)  # not Clifford: with the fast path off this is a real Aer statevector run
+    qc.measure([0, 1], [0, 1])
+    return qc
+
+
+def make_games(seed=2025):
+    games = QuantumGames()
+    games.sampling_seed = seed
+    games.fast_path_max_qubits = 0
+    return games
+
+
+def test_seeded_repeat_comes_from_memo():
+    games = make_games()
+    first = games.run_batch([bell_with_t()], 512)[0]
+    assert (games.result_memo.hits, games.result_memo.misses) == (0, 1)
+    second = games.run_batch([bell_with_t()], 512)[0]
+    assert games.result_memo.hits == 1
+    assert second == first
+    # Callers get copies: changing one must not change the memo
+    second['00'] = -1
+    assert games.run_batch([bell_with_t()], 512)[0] == first
+
+
+def test_memo_misses_on_new_seed_or_shots_and_can_be_bypassed():
+    games = make_games()
+    games.run_batch([bell_with_t()], 512)
+    games.run_batch([bell_with_t()], 512, seed=7)
+    games.run_batch([bell_with_t()], 256)
+    assert games.result_memo.hits == 0 and games.result_memo.misses == 3
+    games.run_batch([bell_with_t()], 512, memoize=False)
+    assert games.result_memo.hits == 0 and games.result_memo.misses == 3
+    # Unseeded runs are never memoized
+    games.sampling_seed = None
+    games.run_batch([bell_with_t()], 512)
+    assert len(games.result_memo) == 3
+
+
+def test_same_seed_reproduces_across_sessions():
+    counts = [make_games(11).run_batch([bell_with_t()], 1024)[0] for _ in range(2)]
+    assert counts[0] == counts[1]
+    assert make_games(12).run_batch([bell_with_t()], 1024)[0] != counts[0]
+
+
+def test_single_shot_helpers_draw_fresh_seeds():
+    games = make_games()
+    flips = [games.flip_quantum_coin() for _ in range(40)]
+    assert set(flips) == {'0', '1'}
+    assert len(games.result_memo) == 0
+    # ...yet a new session with the same sampling_seed flips the same sequence
+    again = make_games()
+    assert [again.flip_quantum_coin() for _ in range(40)] == flips
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+"""
+命令行入口 (quantum_logic.cli) 的检查
+
+运行: python -m pytest -q
+"""
+
+import json
+
+from quantum_logic import cli
+
+
+def run_json(capsys, *argv):
+    assert cli.main(['run', *argv, '--json']) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+def test_json_report_is_reproducible(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('QUANTUM_GAMES_CACHE_DIR', str(tmp_path))
+    first = run_json(capsys, 'entanglement', '--qubits', '3', '--shots', '200', '--seed', '5')
+    assert first['seed'] == 5 and first['parameters']['shots'] == 200
+    counts = first['results']['counts']
+    assert sum(counts.values()) == 200 and set(counts) <= {'000', '111'}
+    assert run_json(capsys, 'entanglement', '--qubits', '3', '--shots', '200', '--seed', '5')['results']['counts'] == counts
+
+
+def test_saved_run_is_listed(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('QUANTUM_GAMES_CACHE_DIR', str(tmp_path))
+    report = run_json(capsys, 'coin', '--shots', '64', '--save', '--results-dir', str(tmp_path / 'results'))
+    assert report['run_id']
+    assert cli.main(['results', '--results-dir', str(tmp_path / 'results')]) == 0
+    assert report['run_id'] in capsys.readouterr().out
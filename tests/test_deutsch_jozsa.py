@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+"""
+Deutsch-Jozsa 预言机与结果分类的检查
+
+运行: python -m pytest -q
+"""
+
+import pytest
+
+from quantum_logic import deutsch_jozsa, fast_sim
+
+
+def test_classify_counts():
+    assert deutsch_jozsa.classify_counts({'000': 1024}, 3) == 'constant'
+    assert deutsch_jozsa.classify_counts({'000': 1000, '010': 24}, 3) == 'balanced'
+    assert deutsch_jozsa.classify_counts({'101': 1024}, 3) == 'balanced'
+
+
+@pytest.mark.parametrize('n', [1, 3, 5])
+def test_oracles_are_classified_correctly(n):
+    oracles = [deutsch_jozsa.constant_oracle(n, 0), deutsch_jozsa.constant_oracle(n, 1),
+               deutsch_jozsa.balanced_oracle(n, 1), deutsch_jozsa.balanced_oracle(n, 2 ** n - 1, 1, True)]
+    oracles += deutsch_jozsa.random_oracles(n, 4, rng=7)
+    for oracle in oracles:
+        counts = fast_sim.run_counts(deutsch_jozsa.build_dj_circuit(n, oracle), 256, seed=1)
+        assert deutsch_jozsa.classify_counts(counts, n) == oracle.metadata['kind'], oracle.name
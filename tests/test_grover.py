@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""
+Grover 搜索的检查
+最优迭代次数、NumPy 振幅模拟与电路 / 理论成功概率的一致性，以及演示流程。
+
+运行: python -m pytest -q
+"""
+
+import numpy as np
+import pytest
+from qiskit.quantum_info import Statevector
+
+from quantum_logic import grover
+from quantum_logic.games import QuantumGames
+
+
+def make_games():
+    output = []
+    games = QuantumGames(gui_output_func=output.append, end_game_func=lambda *args: None)
+    return games, output
+
+
+def test_single_qubit_demo_uses_numpy_path():
+    # The circuit template needs 2 qubits; 'auto' must not pick it for n = 1
+    games, output = make_games()
+    games.run_demo('run_grover_search_demo', n=1, shots=256)
+    assert 'error' not in games.last_run, ''.join(output)
+    assert games.last_run['method'] == 'fast'
+    assert games.last_run['marked'] == ['1']
+    assert sum(games.last_run['counts'].values()) == 256
+
+
+def test_optimal_iterations():
+    assert grover.optimal_iterations(2, 1) == 0
+    assert grover.optimal_iterations(4, 1) == 1
+    assert grover.optimal_iterations(8, 1) == 2
+    assert grover.optimal_iterations(1024, 1) == 25
+    # More marked items need fewer rounds
+    assert grover.optimal_iterations(1024, 16) == 6
+
+
+@pytest.mark.parametrize('n, marked', [(2, [3]), (5, [0, 9]), (10, [1, 500, 1023])])
+def test_statevector_reaches_the_theoretical_success_probability(n, marked):
+    num_states = 2 ** n
+    for iterations in range(grover.optimal_iterations(num_states, len(marked)) + 2):
+        state = grover.grover_statevector(n, marked, iterations)
+        assert np.isclose(np.sum(state ** 2), 1.0)
+        assert np.isclose(np.sum(state[marked] ** 2),
+                          grover.success_probability(num_states, len(marked), iterations))
+    optimal = grover.optimal_iterations(num_states, len(marked))
+    assert np.sum(grover.grover_statevector(n, marked, optimal)[marked] ** 2) > 0.9
+
+
+@pytest.mark.parametrize('n, marked, iterations', [(2, [2], 1), (3, [5], 2), (4, [1, 12], 2)])
+def test_statevector_matches_circuit(n, marked, iterations):
+    expected = Statevector(grover.build_grover_circuit(n, marked, iterations, measure=False)).probabilities()
+    np.testing.assert_allclose(grover.grover_statevector(n, marked, iterations) ** 2, expected, atol=1e-12)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""
+直方图聚合 (quantum_logic.histograms) 的检查，包括超过 62 位的寄存器
+
+运行: python -m pytest -q
+"""
+
+import pytest
+
+from quantum_logic import histograms
+
+WIDTH = 100
+
+
+def wide_counts():
+    # Clbit i is character -(i + 1): the rightmost character is clbit 0
+    return {
+        '0' * WIDTH: 50,
+        '1' * WIDTH: 30,
+        '0' * (WIDTH - 1) + '1': 15,
+        '1' + '0' * (WIDTH - 1): 5,
+    }
+
+
+def test_top_k_counts_on_wide_register():
+    counts = wide_counts()
+    top = histograms.top_k_counts(counts, k=2)
+    assert top == {'0' * WIDTH: 50, '1' * WIDTH: 30, "其他 (2 种)": 20}
+    assert histograms.top_k_counts(counts, k=4) == counts
+
+
+def test_marginal_counts_on_wide_register():
+    counts = wide_counts()
+    # Highest listed bit leftmost, as in Qiskit
+    assert histograms.marginal_counts(counts, [0, WIDTH - 1]) == {'00': 50, '11': 30, '01': 15, '10': 5}
+    assert histograms.marginal_counts(counts, [70]) == {'0': 70, '1': 30}
+    with pytest.raises(ValueError):
+        histograms.marginal_counts(counts, [WIDTH])
+
+
+def test_outcome_arrays_reject_wide_register():
+    with pytest.raises(ValueError):
+        histograms.outcome_arrays(wide_counts())
+    values, frequencies, num_bits = histograms.outcome_arrays({'0 11': 2, '1 01': 3})
+    assert num_bits == 3
+    assert dict(zip(values.tolist(), frequencies.tolist())) == {3: 2, 5: 3}
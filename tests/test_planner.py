@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""
+模拟方法规划 (quantum_logic.planner) 的检查
+
+运行: python -m pytest -q
+"""
+
+import pytest
+from qiskit import QuantumCircuit
+
+from quantum_logic import planner
+
+GIB = 2 ** 30
+
+
+def ghz(num_qubits):
+    qc = QuantumCircuit(num_qubits)
+    qc.h(0)
+    for qubit in range(num_qubits - 1):
+        qc.cx(qubit, qubit + 1)
+    qc.measure_all()
+    return qc
+
+
+def entangled_non_clifford(num_qubits):
+    """T gates and controlled phases between every pair: neither Clifford nor low-entanglement."""
+    qc = QuantumCircuit(num_qubits)
+    qc.h(range(num_qubits))
+    qc.t(range(num_qubits))
+    for control in range(num_qubits):
+        for target in range(control + 1, num_qubits):
+            qc.cp(0.3, control, target)
+    qc.measure_all()
+    return qc
+
+
+def test_small_circuit_uses_numpy():
+    assert planner.plan_simulation(ghz(3), GIB).method == 'numpy'
+
+
+def test_large_clifford_circuit_uses_stabilizer():
+    assert planner.is_clifford(ghz(200))
+    assert planner.plan_simulation(ghz(200), GIB).method == 'stabilizer'
+    # Above the fast-path limit even a small Clifford circuit goes to stabilizer
+    assert planner.plan_simulation(ghz(3), GIB, fast_path_max_qubits=0).method == 'stabilizer'
+
+
+def test_non_clifford_circuit_uses_statevector():
+    qc = entangled_non_clifford(16)
+    assert not planner.is_clifford(qc)
+    assert planner.plan_simulation(qc, GIB).method == 'statevector'
+
+
+def test_quarter_turn_phases_are_clifford():
+    qc = QuantumCircuit(1)
+    qc.p(3.141592653589793 / 2, 0)
+    qc.rz(-3.141592653589793, 0)
+    assert planner.is_clifford(qc)
+    qc.p(0.1, 0)
+    assert not planner.is_clifford(qc)
+
+
+def test_too_large_circuit_raises():
+    with pytest.raises(planner.SimulationTooLarge):
+        planner.plan_simulation(entangled_non_clifford(40), GIB)
+    # The statevector alone would fit; the time budget rules it out
+    with pytest.raises(planner.SimulationTooLarge):
+        planner.plan_simulation(entangled_non_clifford(24), GIB, time_budget_seconds=1e-6)
+
+
+def test_statevector_memory_check():
+    planner.check_statevector_memory(20, GIB)
+    with pytest.raises(planner.SimulationTooLarge):
+        planner.check_statevector_memory(40, GIB)
+    assert planner.max_statevector_qubits(GIB) == 26
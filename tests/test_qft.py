@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+"""
+QFT 电路与 numpy.fft 参考结果的一致性检查
+
+运行: python -m pytest -q
+"""
+
+import numpy as np
+import pytest
+from qiskit.quantum_info import Statevector
+
+from quantum_logic import qft
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 5])
+def test_basis_state_qft_matches_reference(n):
+    for input_state in {0, 1, 2 ** n - 1}:
+        circuit = qft.build_qft_demo_circuit(n, input_state)
+        expected = qft.reference_qft(qft.input_vector(n, input_state))
+        np.testing.assert_allclose(Statevector(circuit).data, expected, atol=1e-12)
+
+
+def test_amplitude_input_qft_matches_reference():
+    rng = np.random.default_rng(3)
+    amplitudes = rng.normal(size=8) + 1j * rng.normal(size=8)
+    circuit = qft.build_qft_demo_circuit(3, amplitudes)
+    expected = qft.reference_qft(qft.input_vector(3, amplitudes))
+    np.testing.assert_allclose(Statevector(circuit).data, expected, atol=1e-12)
+
+
+def test_input_vector_rejects_bad_input():
+    with pytest.raises(ValueError):
+        qft.input_vector(2, 4)
+    with pytest.raises(ValueError):
+        qft.input_vector(2, [1, 0])
+    with pytest.raises(ValueError):
+        qft.input_vector(1, [0, 0])
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""
+结果目录 (quantum_logic.result_store) 的检查
+计数编码往返、同步 / 后台写入后的读取往返、状态向量大小上限与 PPM→PNG 转换。
+
+运行: python -m pytest -q
+"""
+
+import numpy as np
+import pytest
+
+from quantum_logic.result_store import ResultStore, decode_counts, encode_counts
+
+SEED = 2025
+
+
+@pytest.mark.parametrize('counts', [
+    {'00': 3, '11': 5},
+    {'01 101': 2, '10 000': 7, '11 111': 1},
+    {'0' * 1000: 500, '1' * 1000: 524},
+    {},
+], ids=['narrow', 'registers', 'wide', 'empty'])
+def test_counts_encoding_round_trip(counts):
+    assert decode_counts(encode_counts(counts)) == counts
+
+
+def test_result_store_round_trip(tmp_path):
+    store = ResultStore(str(tmp_path))
+    statevector = np.full(8, 1 / np.sqrt(8), dtype=complex)
+    results = {
+        'counts': {'000': 510, '111': 514},
+        'comparison': {'H': {'0': 10, '1': 6}, 'HZH': {'1': 16}},
+        'fringe': np.linspace(0.0, 1.0, 5),
+        'statevector': statevector,
+        'num_qubits': 3,
+    }
+    png = b'\x89PNG\r\n\x1a\n' + b'\0' * 16
+    run_id = store.save_run('ghz', parameters={'num_qubits': 3}, results=results, output="hello\n",
+                            figures=[png], circuit_hash='abc', seed=SEED)
+
+    record = store.get_run(run_id)
+    assert record['demo'] == 'ghz' and record['seed'] == SEED
+    assert [run['id'] for run in store.runs()] == [run_id]
+    assert store.load_counts(run_id) == {'counts': results['counts'],
+                                         'comparison.H': results['comparison']['H'],
+                                         'comparison.HZH': results['comparison']['HZH']}
+    np.testing.assert_allclose(store.load_arrays(run_id)['fringe'], results['fringe'])
+    np.testing.assert_allclose(store.load_statevector(run_id), statevector)
+    assert store.load_output(run_id) == "hello\n"
+    assert store.load_figures(run_id) == [png]
+
+    store.delete_run(run_id)
+    assert store.runs() == []
+
+
+def test_result_store_async_save_caps_statevector_and_converts_ppm(tmp_path):
+    store = ResultStore(str(tmp_path), max_statevector_bytes=1024)
+    ppm = b'P6 2 1 255\n' + bytes([255, 0, 0, 0, 0, 255])
+    results = {'counts': {'0': 1}, 'statevector': np.zeros(2 ** 7, dtype=complex)}
+    run_id = store.save_run_async('superposition', results=results, figures=[ppm])
+    store.flush()
+
+    assert store.last_error is None
+    record = store.get_run(run_id)
+    assert record['statevector'] is None and record['statevector_skipped_bytes'] == 2 ** 7 * 16
+    assert store.load_statevector(run_id) is None
+    png, = store.load_figures(run_id)
+    assert png.startswith(b'\x89PNG\r\n\x1a\n')
+    assert store.load_counts(run_id) == {'counts': {'0': 1}}
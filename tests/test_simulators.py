@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""
+模拟捷径与 Aer 的一致性检查
+stabilizer 仿射子空间采样、NumPy 快速路径的计数分布与 AerSimulator 对比。
+
+运行: python -m pytest -q
+"""
+
+import pytest
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister, transpile
+from qiskit.quantum_info import random_clifford
+from qiskit_aer import AerSimulator
+
+from quantum_logic import fast_sim, stabilizer
+
+SHOTS = 8192
+SEED = 2025
+
+
+def total_variation(counts_a, counts_b):
+    """Total variation distance between two counts dicts (normalized by their shot totals)."""
+    total_a, total_b = sum(counts_a.values()), sum(counts_b.values())
+    keys = set(counts_a) | set(counts_b)
+    return 0.5 * sum(abs(counts_a.get(key, 0) / total_a - counts_b.get(key, 0) / total_b) for key in keys)
+
+
+def aer_counts(qc, method, shots=SHOTS):
+    backend = AerSimulator(method=method)
+    compiled = transpile(qc, backend, optimization_level=0)
+    return backend.run(compiled, shots=shots, seed_simulator=SEED).result().get_counts()
+
+
+def ghz_circuit(num_qubits=5):
+    qc = QuantumCircuit(num_qubits)
+    qc.h(0)
+    for qubit in range(num_qubits - 1):
+        qc.cx(qubit, qubit + 1)
+    qc.measure_all()
+    return qc
+
+
+def random_clifford_circuit(num_qubits=4, seed=7):
+    qc = random_clifford(num_qubits, seed=seed).to_circuit()
+    qc.measure_all()
+    return qc
+
+
+def partial_measurement_circuit():
+    """Two classical registers, one clbit never written, measurements out of qubit order."""
+    qr = QuantumRegister(4, 'q')
+    low, high = ClassicalRegister(2, 'low'), ClassicalRegister(3, 'high')
+    qc = QuantumCircuit(qr, low, high)
+    qc.h([0, 2])
+    qc.s(2)
+    qc.cx(0, 1)
+    qc.cz(1, 3)
+    qc.h(3)
+    qc.sdg(2)
+    qc.h(2)
+    qc.measure(qr[2], low[0])
+    qc.measure(qr[0], high[2])
+    qc.measure(qr[3], low[1])
+    qc.measure(qr[1], high[0])
+    return qc
+
+
+CLIFFORD_CIRCUITS = {
+    'ghz': ghz_circuit,
+    'random_clifford': random_clifford_circuit,
+    'partial_measurement': partial_measurement_circuit,
+}
+
+
+@pytest.mark.parametrize('name', sorted(CLIFFORD_CIRCUITS))
+def test_stabilizer_sampling_matches_aer(name):
+    qc = CLIFFORD_CIRCUITS[name]()
+    expected = aer_counts(qc, 'stabilizer')
+    # One Aer shot gives the reference outcome, the rest are sampled from the affine space
+    reference = next(iter(aer_counts(qc, 'stabilizer', shots=1)))
+    sampled = stabilizer.sample_counts(qc, reference, SHOTS, seed=SEED)
+    assert sum(sampled.values()) == SHOTS
+    assert set(sampled) == set(expected)
+    assert total_variation(sampled, expected) < 0.05
+
+
+def rotation_circuit():
+    qc = QuantumCircuit(3)
+    qc.rx(0.7, 0)
+    qc.ry(1.9, 1)
+    qc.h(2)
+    qc.t(2)
+    qc.cx(0, 1)
+    qc.crz(0.4, 1, 2)
+    qc.u(0.3, 1.1, -0.6, 0)
+    qc.ccx(0, 1, 2)
+    qc.swap(0, 2)
+    qc.measure_all()
+    return qc
+
+
+@pytest.mark.parametrize('build', [ghz_circuit, partial_measurement_circuit, rotation_circuit],
+                         ids=['ghz', 'partial_measurement', 'rotations'])
+def test_fast_path_matches_aer(build):
+    qc = build()
+    assert fast_sim.is_supported(qc)
+    expected = aer_counts(qc, 'statevector')
+    counts = fast_sim.run_counts(qc, SHOTS, seed=SEED)
+    assert sum(counts.values()) == SHOTS
+    assert total_variation(counts, expected) < 0.05
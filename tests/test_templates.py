@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+参数化电路模板 (quantum_logic.templates) 的绑定检查
+
+运行: python -m pytest -q
+"""
+
+from qiskit import transpile
+from qiskit_aer import AerSimulator
+
+from quantum_logic import templates
+from quantum_logic.caching import TranspileCache
+
+
+def make_registry(maxsize=32):
+    backend = AerSimulator()
+    registry = templates.TemplateRegistry(lambda qc, target, **options: transpile(qc, backend, **options),
+                                          maxsize=maxsize)
+    registry.register('grover', templates.build_grover_template, optimization_level=1)
+    registry.register('qft', templates.build_qft_template, optimization_level=1)
+    return registry
+
+
+def test_grover_template_without_iterations_binds():
+    registry = make_registry()
+    bound = registry.bind('grover', (3, 0, 4), templates.grover_values(3, [0, 1, 2, 3]))
+    assert not bound.parameters
+    counts = AerSimulator().run(bound, shots=256, seed_simulator=1).result().get_counts()
+    assert sum(counts.values()) == 256 and len(counts) == 8
+
+
+def test_rebuilt_template_is_not_served_stale_parameters():
+    # maxsize=1 evicts QFT(3) when QFT(4) is built; rebuilding it creates new Parameter objects
+    # with the same names, which must not hit the old transpiled circuit in a cache
+    backend = AerSimulator()
+    cache = TranspileCache()
+    registry = templates.TemplateRegistry(lambda qc, target, **options: cache.get_or_transpile(qc, backend, **options),
+                                          maxsize=1)
+    registry.register('qft', templates.build_qft_template, optimization_level=1)
+    for n in (3, 4, 3):
+        bound = registry.bind('qft', (n,), templates.flip_angles(1, range(n)))
+        assert not bound.parameters
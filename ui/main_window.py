@@ -1,21 +1,25 @@
 import tkinter as tk
-from tkinter import messagebox, scrolledtext
+from tkinter import filedialog, messagebox, scrolledtext, ttk
+import base64
 import sys
 import os
-import matplotlib.pyplot as plt
+import threading
+# Figures are created on the demo worker thread; keep pyplot on a non-GUI backend
+# and rasterize them off the main thread (ui.rendering) before showing them as images.
+# Set via the environment so matplotlib itself is only imported during warm-up.
+os.environ['MPLBACKEND'] = 'Agg'
 from quantum_descriptions import QUANTUM_GAME_DESCRIPTIONS
 import tkinter.messagebox
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 # 将项目根目录添加到 Python 路径
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 
-try:
-    from quantum_logic.games import QuantumGames
-except ImportError as e:
-    messagebox.showerror("导入错误", f"无法导入 QuantumGames 类: {e}\n请确保 quantum_logic 模块在 Python 路径中。")
-    sys.exit(1)
+from quantum_logic.profiling import Profiler
+from ui.output_channel import OutputChannel
+from ui.worker import DemoWorker
+# NOTE: quantum_logic.games (qiskit, qiskit_aer, matplotlib) is imported by the
+# background warm-up thread in QuantumGameApp so the window paints immediately.
 
 def clear_frame(frame):
     """Removes all widgets from a Tkinter frame."""
@@ -35,14 +39,19 @@ class QuantumGameApp:
         # 主frame下移，避免与标题重叠
         # self.root.geometry("800x700") # Optional: Increase height for multiple plots
 
+        # --- Background execution layer ---
+        # Demos run on a worker thread; their callbacks are marshalled back here.
+        self.worker = DemoWorker(self.root)
+        # Text output from any thread is buffered and inserted once per tick
+        self.output = OutputChannel(self.root, self._write_output_text)
+        # Per-stage timing spans of every run (shown in the timing panel, exportable to CSV)
+        self.profiler = Profiler(enabled=True)
+
         # --- Game Logic Instance ---
-        # Pass the new display_plots_list method during initialization
-        self.game_logic = QuantumGames(
-            gui_output_func=self.display_output,
-            request_input_func=None,  # 不再需要输入
-            end_game_func=self.end_game_ui,
-            gui_display_plots_func=self.display_plots_list
-        )
+        # Created by the warm-up thread (heavy imports + backend construction)
+        self.game_logic = None
+        self.game_logic_ready = threading.Event()
+        self.game_buttons = [] # Buttons disabled while a demo is running
         # self.plot_canvas_widget = None # OLD: single plot
         self.plot_canvas_widgets = [] # NEW: List to hold multiple plot canvases
 
@@ -68,17 +77,19 @@ class QuantumGameApp:
 
         # Demo Buttons (Using standardized names)
         demo_buttons = {
-            "量子叠加态演示": ("superposition", self.game_logic.run_superposition_demo),
-            "量子纠缠态演示 (Bell 态)": ("bell", self.game_logic.run_entanglement_game),
-            "量子隐形传态演示": ("teleportation", self.game_logic.run_teleportation_game),
-            "量子干涉实验 (HZH)": ("interference", self.game_logic.run_interference_game),
-            "Deutsch-Jozsa 演示": ("deutsch_jozsa", self.game_logic.run_deutsch_jozsa_demo),
-            "Grover 搜索演示": ("grover", self.game_logic.run_grover_search_demo),
-            "QFT 演示": ("qft", self.game_logic.run_qft_demo),
+            "量子叠加态演示": ("superposition", "run_superposition_demo"),
+            "量子纠缠态演示 (Bell 态)": ("bell", "run_entanglement_game"),
+            "GHZ 态演示 (1000 比特)": ("ghz", "run_entanglement_game", {'num_qubits': 1000, 'shots': 1000}),
+            "量子隐形传态演示": ("teleportation", "run_teleportation_game"),
+            "量子干涉实验 (HZH)": ("interference", "run_interference_game"),
+            "干涉条纹 (相位扫描)": ("phase_sweep", "run_phase_sweep_demo"),
+            "Deutsch-Jozsa 演示": ("deutsch_jozsa", "run_deutsch_jozsa_demo"),
+            "Grover 搜索演示": ("grover", "run_grover_search_demo"),
+            "QFT 演示": ("qft", "run_qft_demo"),
         }
-        for text, (desc_key, command) in demo_buttons.items():
+        for text, (desc_key, method_name, *demo_kwargs) in demo_buttons.items():
             # 点击按钮时，右侧说明框自动更新
-            def make_callback(cmd=command, key=desc_key):
+            def make_callback(cmd=self.demo_runner(method_name, label=text, **(demo_kwargs[0] if demo_kwargs else {})), key=desc_key):
                 def callback():
                     desc = QUANTUM_GAME_DESCRIPTIONS.get(key)
                     if desc:
@@ -89,15 +100,16 @@ class QuantumGameApp:
             button = tk.Button(control_frame, text=text, command=make_callback(), width=25,
                               bg="#4f8cff", fg="white", activebackground="#2d3a4b", activeforeground="white", relief=tk.FLAT, bd=2, highlightthickness=0)
             button.pack(pady=6, fill=tk.X, ipadx=2, ipady=2)
+            self.game_buttons.append(button)
 
         # Game Buttons (Using standardized names)
         game_buttons = {
-            "量子猜硬币游戏": self.game_logic.run_coin_game # Corrected name
+            "量子猜硬币游戏": "run_coin_game" # Corrected name
         }
         tk.Label(control_frame, text="---").pack(pady=5) # Separator
-        for text, command in game_buttons.items():
+        for text, method_name in game_buttons.items():
             # 猜硬币按钮集成说明
-            def make_coin_callback(cmd=command):
+            def make_coin_callback(cmd=self.demo_runner(method_name, label=text)):
                 def callback():
                     from quantum_descriptions import QUANTUM_GAME_DESCRIPTIONS
                     desc = QUANTUM_GAME_DESCRIPTIONS.get("coin")
@@ -109,6 +121,44 @@ class QuantumGameApp:
             button = tk.Button(control_frame, text=text, command=make_coin_callback(), width=25,
                               bg="#00bfae", fg="white", activebackground="#2d3a4b", activeforeground="white", relief=tk.FLAT, bd=2, highlightthickness=0)
             button.pack(pady=8, fill=tk.X, ipadx=2, ipady=2)
+            self.game_buttons.append(button)
+
+        # --- Busy state: status, progress bar and cancel button ---
+        tk.Label(control_frame, text="---").pack(pady=5) # Separator
+        self.status_var = tk.StringVar(value="就绪")
+        tk.Label(control_frame, textvariable=self.status_var, fg="#2d3a4b").pack(fill=tk.X)
+        self.progress_bar = ttk.Progressbar(control_frame, mode='indeterminate')
+        self.progress_bar.pack(pady=4, fill=tk.X)
+        self.cancel_button = tk.Button(control_frame, text="取消运行", command=self.cancel_game, state='disabled',
+                                       bg="#f39c12", fg="white", activebackground="#2d3a4b", activeforeground="white", relief=tk.FLAT, bd=2, highlightthickness=0)
+        self.cancel_button.pack(pady=6, fill=tk.X, ipadx=2, ipady=2)
+        # Stored runs (quantum_logic.result_store) can be shown again without simulating
+        history_button = tk.Button(control_frame, text="历史结果回放", command=self.show_history,
+                                   bg="#7f8c9d", fg="white", activebackground="#2d3a4b", activeforeground="white", relief=tk.FLAT, bd=2, highlightthickness=0)
+        history_button.pack(pady=6, fill=tk.X, ipadx=2, ipady=2)
+        self.game_buttons.append(history_button)
+        self.result_store = None # Created on first use (imports numpy)
+        self._result_store_lock = threading.Lock() # Warm-up thread and Tk thread may both create it
+        # Page through the statevector of the last (or replayed) superposition run
+        page_frame = tk.Frame(control_frame)
+        page_frame.pack(pady=(0, 6), fill=tk.X)
+        for text, delta in (("◀ 振幅上一页", -1), ("振幅下一页 ▶", 1)):
+            page_button = tk.Button(page_frame, text=text, command=lambda delta=delta: self.step_amplitude_page(delta),
+                                    bg="#dfe6f0", relief=tk.FLAT, bd=2, highlightthickness=0)
+            page_button.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(0, 2) if delta < 0 else (2, 0))
+            self.game_buttons.append(page_button)
+
+        # --- Timing panel: per-stage breakdown of the last run ---
+        timing_frame = tk.LabelFrame(control_frame, text="耗时分析", padx=6, pady=4)
+        timing_frame.pack(pady=(6, 0), fill=tk.X)
+        self.timing_var = tk.StringVar(value="(运行演示后显示各阶段耗时)")
+        tk.Label(timing_frame, textvariable=self.timing_var, justify="left", anchor="w",
+                 font=("Consolas", 9), fg="#2d3a4b").pack(fill=tk.X)
+        self.profiling_enabled = tk.BooleanVar(value=self.profiler.enabled)
+        tk.Checkbutton(timing_frame, text="记录耗时", variable=self.profiling_enabled,
+                       command=self.toggle_profiling).pack(side=tk.LEFT)
+        tk.Button(timing_frame, text="导出 CSV", command=self.export_timings, relief=tk.FLAT,
+                  bg="#dfe6f0").pack(side=tk.RIGHT)
 
         # --- Output Area (Right-Top - Column 1, Row 0) ---
         output_frame = tk.LabelFrame(right_frame, text="输出信息", padx=8, pady=8, bg="#f9fafc", fg="#2d3a4b", font=("微软雅黑", 11, "bold"), bd=2, relief=tk.GROOVE)
@@ -170,6 +220,125 @@ class QuantumGameApp:
         # Note: QuantumGames __init__ already sets callbacks if passed
         self.display_output("欢迎来到量子游戏应用程序! 请选择一个演示或游戏。\n")
 
+        # --- Background warm-up: import qiskit/Aer and build backends off the UI thread ---
+        self.status_var.set("正在加载量子计算库...")
+        threading.Thread(target=self._warm_up_game_logic, name="quantum-warm-up", daemon=True).start()
+
+    def _warm_up_game_logic(self):
+        """Runs on a background thread: heavy imports, QuantumGames and simulator backends."""
+        try:
+            from quantum_logic.games import QuantumGames
+            game_logic = QuantumGames(
+                gui_output_func=self._threadsafe_output,
+                request_input_func=None,  # 不再需要输入
+                end_game_func=self._threadsafe_end_game,
+                gui_display_plots_func=self._threadsafe_display_plots,
+                cancel_check_func=self.worker.check_cancelled,
+                profiler=self.profiler,
+                result_store=self.get_result_store()
+            )
+            game_logic.warm_up()
+        except ImportError as e:
+            self.worker.post(messagebox.showerror, "导入错误", f"无法导入 QuantumGames 类: {e}\n请确保 quantum_logic 模块在 Python 路径中。")
+            self.worker.post(self.status_var.set, "加载失败")
+            self.game_logic_ready.set() # Unblock waiting demos; they will report the failure
+            return
+        except Exception as e:
+            self.display_output(f"\n初始化量子模拟器时出错: {e}\n")
+            self.worker.post(self.status_var.set, "加载失败")
+            self.game_logic_ready.set()
+            return
+        self.game_logic = game_logic
+        self.game_logic_ready.set()
+        self.worker.post(self._on_warm_up_done)
+
+    def _on_warm_up_done(self):
+        if not self.worker.is_running:
+            self.status_var.set("就绪")
+
+    def demo_runner(self, method_name, label=None, **kwargs):
+        """Returns a callable for the worker that waits for warm-up, then runs QuantumGames.<method_name>(**kwargs).
+
+        The run is saved in the result store under ``label`` (see QuantumGames.run_demo).
+        """
+        def run():
+            while not self.game_logic_ready.wait(0.1):
+                self.worker.check_cancelled()
+            if self.game_logic is None:
+                raise RuntimeError("量子计算库加载失败，无法运行演示。")
+            self.profiler.begin_run(method_name)
+            self.game_logic.run_demo(method_name, demo=label, **kwargs)
+        return run
+
+    # --- Result history: replay stored runs without simulating ---
+    def get_result_store(self):
+        """The shared ResultStore (safe to call from the warm-up thread and the Tk thread)."""
+        with self._result_store_lock:
+            if self.result_store is None:
+                from quantum_logic.result_store import ResultStore
+                self.result_store = ResultStore()
+            return self.result_store
+
+    def show_history(self):
+        """List the stored runs in a dialog; the selected one is replayed in the main window."""
+        try:
+            records = self.get_result_store().runs()
+        except Exception as e:
+            messagebox.showerror("历史结果", f"无法读取结果目录: {e}")
+            return
+        if not records:
+            self.display_output("\n还没有保存的运行结果。\n")
+            return
+        dialog = tk.Toplevel(self.root)
+        dialog.title("历史结果")
+        listbox = tk.Listbox(dialog, width=70, height=min(20, len(records)), font=("Consolas", 10))
+        for record in records:
+            details = "  ".join(f"{name}={record[key]}" for key, name in (('num_qubits', 'n'), ('shots', 'shots'))
+                                if record.get(key) is not None)
+            listbox.insert(tk.END, f"{record['created']}  {record['demo']}  {details}" + ("  (出错)" if record.get('error') else ""))
+        listbox.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+        listbox.selection_set(0)
+
+        def replay(event=None):
+            selection = listbox.curselection()
+            if selection:
+                dialog.destroy()
+                self.replay_run(records[selection[0]])
+
+        listbox.bind('<Double-Button-1>', replay)
+        tk.Button(dialog, text="回放", command=replay, relief=tk.FLAT, bg="#4f8cff", fg="white").pack(pady=(0, 8))
+
+    def replay_run(self, record):
+        """Show a stored run's text output and figures again (nothing is simulated)."""
+        if self.worker.is_running:
+            self.display_output("\n已有演示正在运行，请等待完成或先取消。\n")
+            return
+        store = self.get_result_store()
+        try:
+            output = store.load_output(record['id'])
+            figures = store.load_figures(record['id'])
+            statevector = store.load_statevector(record['id'])
+        except OSError as e:
+            messagebox.showerror("历史结果", f"无法读取运行 {record['id']}: {e}")
+            return
+        self.clear_plot_area()
+        self.display_output(f"[回放 {record['created']} 的运行结果: {record['demo']}，未重新模拟]\n\n", clear=True)
+        self.display_output(output)
+        if statevector is not None and self.game_logic is not None:
+            # Memory-mapped: amplitude pages read from disk instead of copying the vector
+            self.game_logic.set_amplitude_statevector(statevector)
+            self.display_output("\n(可用“振幅上一页 / 下一页”浏览该运行的状态向量)\n")
+        if figures:
+            self.display_plots_list(figures)
+        self.status_var.set("回放")
+
+    def step_amplitude_page(self, delta):
+        """Show the previous (-1) / next (+1) page of the current statevector in the output area."""
+        if self.game_logic is None or self.worker.is_running:
+            self.display_output("\n请先运行叠加态演示 (或回放一次保存的运行)。\n")
+            return
+        self.game_logic.step_amplitude_page(delta)
+
     def on_inner_frame_configure(self, event):
         """Update scroll region when inner frame size changes."""
         self.plot_canvas.configure(scrollregion=self.plot_canvas.bbox("all"))
@@ -180,20 +349,112 @@ class QuantumGameApp:
         self.plot_canvas.itemconfig(self.canvas_window, width=canvas_width)
 
     def run_game(self, game_function):
-        """Wrapper to clear output and run selected game/demo."""
+        """Wrapper to clear output and run selected game/demo on the worker thread."""
+        if self.worker.is_running:
+            self.display_output("\n已有演示正在运行，请等待完成或先取消。\n")
+            return
         # Clear previous plots
         self.clear_plot_area() 
         # Clear output text
         self.display_output("", clear=True)
         # 已无输入区，无需禁用输入控件
-        # Run the game function
+        self.set_busy(True)
+        self.worker.submit(game_function,
+                           on_done=self._on_demo_finished,
+                           on_error=self._on_demo_error,
+                           on_cancel=self._on_demo_cancelled)
+
+    def cancel_game(self):
+        """Ask the running demo to stop at its next output call."""
+        if self.worker.is_running:
+            self.worker.cancel()
+            self.status_var.set("正在取消...")
+            self.cancel_button.configure(state='disabled')
+
+    def set_busy(self, busy):
+        """Toggle the busy indicator and the enabled state of the demo buttons."""
+        button_state = 'disabled' if busy else 'normal'
+        for button in self.game_buttons:
+            button.configure(state=button_state)
+        self.cancel_button.configure(state='normal' if busy else 'disabled')
+        if busy:
+            self.status_var.set("运行中...")
+            self.progress_bar.start(10)
+        else:
+            self.progress_bar.stop()
+
+    def _on_demo_finished(self):
+        self.output.flush()
+        self.show_timings(self.profiler.end_run())
+        self.set_busy(False)
+        self.status_var.set("就绪")
+
+    def _on_demo_error(self, formatted_traceback):
+        self.display_output("\n运行游戏时发生错误:\n")
+        self.display_output(formatted_traceback + "\n") # Show full traceback
+        self.output.flush()
+        self.show_timings(self.profiler.end_run())
+        self.set_busy(False)
+        self.status_var.set("运行出错")
+        self.end_game_ui() # Ensure UI is reset even on error
+
+    def _on_demo_cancelled(self):
+        self.display_output("\n演示已取消。\n")
+        self.output.flush()
+        self.show_timings(self.profiler.end_run())
+        self.set_busy(False)
+        self.status_var.set("已取消")
+        self.end_game_ui()
+
+    # --- Callbacks handed to QuantumGames (called from the worker thread) ---
+    def _threadsafe_output(self, message, clear=False):
+        self.worker.check_cancelled()
+        self.output.write(message, clear)
+
+    def _threadsafe_display_plots(self, figures):
+        # Rasterize on the demo worker thread; Tk only receives finished images
+        from ui.rendering import rasterize_all
+        self.worker.check_cancelled()
+        with self.profiler.span('rasterize'):
+            images = rasterize_all(figures)
+        self.worker.check_cancelled()
+        self.worker.post(self.display_plots_list, images)
+        # QuantumGames.run_demo stores these images instead of rendering the figures again
+        return images
+
+    # --- Timing panel ---
+    def show_timings(self, run, max_stages=6):
+        """Show the per-stage breakdown of ``run`` (a Profiler run record) in the timing panel."""
+        if run is None:
+            return
+        lines = []
+        for stage, total, count in Profiler.breakdown(run)[:max_stages]:
+            lines.append(f"{stage:<15}{total * 1000:>8.1f} ms" + (f" ×{count}" if count > 1 else ""))
+        lines.append(f"{'总计':<13}{run['total'] * 1000:>8.1f} ms")
+        self.timing_var.set("\n".join(lines))
+
+    def toggle_profiling(self):
+        self.profiler.enabled = self.profiling_enabled.get()
+        if not self.profiler.enabled:
+            self.timing_var.set("(耗时记录已关闭)")
+
+    def export_timings(self):
+        """Save the rolling timing history as CSV."""
+        if not self.profiler.history():
+            self.display_output("\n还没有耗时记录可以导出。\n")
+            return
+        path = filedialog.asksaveasfilename(title="导出耗时记录", defaultextension=".csv",
+                                            filetypes=[("CSV 文件", "*.csv")])
+        if not path:
+            return
         try:
-            game_function() 
-        except Exception as e:
-            self.display_output(f"\n运行游戏时发生错误: {e}\n")
-            import traceback
-            self.display_output(traceback.format_exc() + "\n") # Show full traceback
-            self.end_game_ui() # Ensure UI is reset even on error
+            rows = self.profiler.export_csv(path)
+            self.display_output(f"\n已导出 {rows} 条耗时记录到 {path}\n")
+        except OSError as e:
+            messagebox.showerror("导出失败", f"无法写入 {path}: {e}")
+
+    def _threadsafe_end_game(self):
+        self.worker.post(self.end_game_ui)
 
     def end_game_ui(self):
         """Resets UI elements after a game ends (e.g., disable input)."""
@@ -201,16 +462,30 @@ class QuantumGameApp:
         # DO NOT clear the plot here
 
     def display_output(self, message, clear=False):
+        """Append ``message`` to the output area (buffered, safe from any thread)."""
+        self.output.write(message, clear)
+
+    def _write_output_text(self, text, clear=False):
+        """Single Text update for everything the OutputChannel collected this tick."""
         self.output_text.configure(state='normal')
         if clear:
             self.output_text.delete('1.0', tk.END)
-        self.output_text.insert(tk.END, str(message))
+        self.output_text.insert(tk.END, text)
         self.output_text.see(tk.END) # Scroll to end
         self.output_text.configure(state='disabled')
 
 
     def display_plots_list(self, figures):
-        """Displays a LIST of matplotlib figures vertically in the **scrollable** plot area."""
+        """Displays a LIST of plots vertically in the **scrollable** plot area.
+
+        Items are image bytes (PNG / PPM, see ui.rendering) or matplotlib figures,
+        which are rasterized here as a fallback; each is shown as a PhotoImage.
+        """
+        with self.profiler.span('display'):
+            self._display_plots_list(figures)
+
+    def _display_plots_list(self, figures):
+        from ui.rendering import is_image_bytes, rasterize_figure
         self.clear_plot_area() # Clear previous plots first
         if not figures:
             self.display_output("没有可显示的绘图。")
@@ -223,13 +498,8 @@ class QuantumGameApp:
                     self.display_output(f"警告：图表 {i+1} 为空，跳过。")
                     continue
                 
-                # Embed the plot in the INNER frame
-                canvas = FigureCanvasTkAgg(fig, master=self.inner_plot_frame)
-                canvas_widget = canvas.get_tk_widget()
-                canvas_widget.pack(side=tk.TOP, fill=tk.X, expand=False, pady=5) # Pack vertically
-                self.plot_canvas_widgets.append(canvas_widget) # Store reference for clearing
-                canvas.draw()
-                plt.close(fig) # Close the mpl figure to save memory
+                image = fig if is_image_bytes(fig) else rasterize_figure(fig)
+                self._add_image(image) # Packed vertically in the INNER frame
                 self.display_output(f"图表 {i+1} 已绘制。")
             
             self.root.update_idletasks() # Ensure layout updates
@@ -242,6 +512,14 @@ class QuantumGameApp:
             self.display_output(f"\n显示绘图列表时出错: {e}\n")
             self.clear_plot_area()
 
+    def _add_image(self, image_bytes):
+        """Show PPM / PNG bytes in a Label (Tk detects the format; PNG needs Tk 8.6+)."""
+        photo = tk.PhotoImage(data=base64.b64encode(image_bytes))
+        label = tk.Label(self.inner_plot_frame, image=photo)
+        label.image = photo # Keep a reference, Tk does not
+        label.pack(side=tk.TOP, anchor='w', pady=5)
+        self.plot_canvas_widgets.append(label)
+
     def clear_plot_area(self):
         """Destroys all plot canvases currently in the **inner** plot frame."""
         for widget in self.plot_canvas_widgets:
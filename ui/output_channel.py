@@ -0,0 +1,47 @@
+"""
+输出通道：缓冲来自任意线程的文本消息，在 Tk 主线程上每个周期合并为一次插入。
+"""
+
+import threading
+
+
+class OutputChannel:
+    """Coalesces text output into one ``write_func(text, clear)`` call per tick.
+
+    ``write`` may be called from any thread and only appends to a buffer, so a
+    demo printing thousands of lines costs one Text insert per ``interval_ms``
+    instead of one per line. Messages keep the order of the ``write`` calls.
+    """
+
+    def __init__(self, root, write_func, interval_ms=50):
+        self.root = root
+        self.write_func = write_func
+        self.interval_ms = interval_ms
+        self._pending = []
+        self._clear = False
+        self._lock = threading.Lock()
+        self._tick()
+
+    def write(self, message, clear=False):
+        """Buffer ``message``; ``clear`` drops anything still pending and clears the widget."""
+        with self._lock:
+            if clear:
+                self._pending = []
+                self._clear = True
+            self._pending.append(str(message))
+
+    def flush(self):
+        """Write everything buffered right now (Tk main thread only, e.g. when a demo ends)."""
+        with self._lock:
+            text = ''.join(self._pending)
+            clear = self._clear
+            self._pending = []
+            self._clear = False
+        if text or clear:
+            self.write_func(text, clear)
+
+    def _tick(self):
+        try:
+            self.flush()
+        finally:
+            self.root.after(self.interval_ms, self._tick)
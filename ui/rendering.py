@@ -0,0 +1,39 @@
+"""
+绘图光栅化：在演示工作线程中把 matplotlib 图表渲染为图像字节 (PPM / PNG)，
+Tk 主线程只需创建 PhotoImage，不再逐个执行 canvas.draw()。
+pyplot 的图表注册表 (Gcf) 不是线程安全的，所以图表在同一个线程上依次绘制并关闭。
+"""
+
+import numpy as np
+
+
+def is_image_bytes(item):
+    return isinstance(item, (bytes, bytearray))
+
+
+def rasterize_figure(fig, dpi=None):
+    """Render ``fig`` with Agg and return binary PPM bytes; the figure is closed afterwards.
+
+    PPM skips PNG compression and is decoded natively by every Tk version.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    try:
+        if dpi is not None:
+            fig.set_dpi(dpi)
+        canvas = FigureCanvasAgg(fig)
+        canvas.draw()
+        rgba = np.asarray(canvas.buffer_rgba())
+        height, width = rgba.shape[:2]
+        header = f"P6 {width} {height} 255\n".encode('ascii')
+        return header + np.ascontiguousarray(rgba[:, :, :3]).tobytes()
+    finally:
+        plt.close(fig)
+
+
+def rasterize_all(items, dpi=None):
+    """Rasterize a list of figures one after another on the calling thread, preserving order.
+
+    Image bytes (e.g. cached PNG circuit diagrams) and ``None`` pass through unchanged.
+    """
+    return [item if item is None or is_image_bytes(item) else rasterize_figure(item, dpi) for item in items]
@@ -0,0 +1,89 @@
+"""
+后台执行层：在工作线程中运行演示，通过线程安全队列把界面更新交回 Tk 主线程。
+"""
+
+import queue
+import threading
+import traceback
+
+
+class DemoCancelled(BaseException):
+    """Raised inside the worker thread when the running demo has been cancelled.
+
+    Derives from BaseException so the broad ``except Exception`` blocks in the
+    demo flows do not swallow it.
+    """
+
+
+class DemoWorker:
+    """Runs one demo at a time on a daemon thread.
+
+    Everything that must touch Tk is posted with ``post`` and executed by
+    ``_poll`` on the main loop via ``root.after``.
+    """
+
+    def __init__(self, root, poll_interval_ms=50):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self._queue = queue.Queue()
+        self._thread = None
+        self._cancel_event = threading.Event()
+        self._poll()
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_worker_thread(self):
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, func, on_done=None, on_error=None, on_cancel=None):
+        """Start ``func`` on the worker thread. Returns False if a demo is already running."""
+        if self.is_running:
+            return False
+        self._cancel_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(func, on_done, on_error, on_cancel),
+            name="quantum-demo-worker", daemon=True)
+        self._thread.start()
+        return True
+
+    def cancel(self):
+        """Request cooperative cancellation of the running demo."""
+        if self.is_running:
+            self._cancel_event.set()
+
+    def check_cancelled(self):
+        """Raise DemoCancelled if called from the worker after cancel() was requested."""
+        if self._cancel_event.is_set() and self.in_worker_thread():
+            raise DemoCancelled()
+
+    def post(self, callback, *args, **kwargs):
+        """Schedule ``callback(*args, **kwargs)`` on the Tk main thread (safe from any thread)."""
+        self._queue.put((callback, args, kwargs))
+
+    def _run(self, func, on_done, on_error, on_cancel):
+        try:
+            func()
+        except DemoCancelled:
+            if on_cancel:
+                self.post(on_cancel)
+        except Exception:
+            if on_error:
+                self.post(on_error, traceback.format_exc())
+        else:
+            if on_done:
+                self.post(on_done)
+
+    def _poll(self):
+        """Drain pending UI callbacks, then re-arm the timer."""
+        try:
+            while True:
+                callback, args, kwargs = self._queue.get_nowait()
+                try:
+                    callback(*args, **kwargs)
+                except Exception:
+                    traceback.print_exc()
+        except queue.Empty:
+            pass
+        self.root.after(self.poll_interval_ms, self._poll)